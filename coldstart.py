@@ -0,0 +1,209 @@
+"""Cold-start benchmark: time to the first successful response after a reset.
+
+Brings the application back to a cold state, then polls the URL until the
+first 200 response and sends a few more sequential requests, recording the
+latency of the first N requests. Repeated several times per framework.
+
+Reset modes:
+    restart  stop and start the php-fpm container (php-fpm and Octane boot
+             from scratch, empty opcache)
+    reload   graceful php-fpm reload (USR2: new workers, empty opcache), or
+             `php artisan octane:reload` for Octane (new workers)
+
+Both reloads are asynchronous: the clock starts when the reload command has
+returned (so the docker exec and artisan boot time are not counted) and the
+polling starts once none of the old worker processes is left, so the first
+request cannot be served by an old, warm worker.
+
+Usage:
+    python3 coldstart.py http://octane.bench:8080/benchmarking/hello --reset restart -r 5 -n 20
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+# Container running php-fpm and Octane (see docker-compose.yml and entrypoint.sh)
+CONTAINER = "php_fpm_bench"
+OCTANE_DIR = "/var/www/html/octane"
+
+# command line of the worker processes (as listed by docker top)
+FPM_WORKER = "php-fpm: pool"
+OCTANE_WORKERS = ("roadrunner-worker", "swoole_http_server")
+
+
+def request(url, timeout=5.0):
+    """
+    Sends one GET request on a new connection. Returns (status, latency in ms),
+    status is None if the connection or the request failed.
+    """
+    parts = urlsplit(url)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+    start = time.perf_counter()
+    try:
+        conn.request("GET", path, headers={"Connection": "close"})
+        response = conn.getresponse()
+        response.read()
+        status = response.status
+    except (OSError, http.client.HTTPException):
+        status = None
+    finally:
+        conn.close()
+    return status, (time.perf_counter() - start) * 1000
+
+
+def docker(*args):
+    subprocess.run(["docker", *args], check=True, capture_output=True)
+
+
+def worker_pids(octane):
+    """
+    Host PIDs of the php-fpm pool (or Octane) worker processes, None if docker top failed.
+    """
+    top = subprocess.run(
+        ["docker", "top", CONTAINER, "-eo", "pid,args"], capture_output=True, text=True
+    )
+    if top.returncode != 0:
+        return None
+    markers = OCTANE_WORKERS if octane else (FPM_WORKER,)
+    pids = set()
+    for line in top.stdout.splitlines()[1:]:
+        pid, _, args = line.strip().partition(" ")
+        if any(marker in args for marker in markers):
+            pids.add(int(pid))
+    return pids
+
+
+def wait_for_new_workers(old_pids, octane, max_wait):
+    """
+    Waits until none of the old worker processes is running anymore.
+    """
+    deadline = time.perf_counter() + max_wait
+    while time.perf_counter() < deadline:
+        pids = worker_pids(octane)
+        if pids is None or not pids & old_pids:
+            return
+        time.sleep(0.01)
+    raise TimeoutError(f"Old workers still running after {max_wait:g}s")
+
+
+def reset(mode, octane, max_wait=120.0):
+    """
+    Brings the application back to a cold state. Returns the perf_counter time the
+    cold start began: after the container was stopped for the restart mode, when the
+    reload command returned for the reload mode.
+    """
+    if mode == "restart":
+        docker("stop", CONTAINER)
+        started = time.perf_counter()
+        docker("start", CONTAINER)
+        return started
+
+    old_pids = worker_pids(octane)
+    if octane:
+        docker("exec", "-w", OCTANE_DIR, CONTAINER, "php", "artisan", "octane:reload")
+    else:
+        # a graceful reload re-executes the php-fpm master: new workers, empty opcache
+        docker("exec", CONTAINER, "kill", "-USR2", "1")
+    started = time.perf_counter()
+    if old_pids is None:
+        print("Warning: docker top failed, the first request may reach an old worker.")
+    elif old_pids:
+        # an idle ondemand php-fpm pool has no worker (and nothing warm) to wait for
+        wait_for_new_workers(old_pids, octane, max_wait)
+    return started
+
+
+def cold_start(url, mode="reload", requests=20, timeout=5.0, max_wait=120.0, poll_interval=0.01):
+    """
+    Resets the application and measures the time until the first 200 response and
+    the latency of the first requests (the first one being that 200 response).
+    """
+    octane = urlsplit(url).hostname.startswith("octane.")
+    started = reset(mode, octane, max_wait)
+    failed_attempts = 0
+    while True:
+        status, latency = request(url, timeout)
+        if status == 200:
+            break
+        failed_attempts += 1
+        if time.perf_counter() - started > max_wait:
+            raise TimeoutError(f"No 200 response from {url} within {max_wait:g}s")
+        time.sleep(poll_interval)
+    time_to_first_ok = (time.perf_counter() - started) * 1000
+
+    latencies = [latency]
+    errors = 0
+    for _ in range(requests - 1):
+        status, latency = request(url, timeout)
+        latencies.append(latency)
+        if status != 200:
+            errors += 1
+    return {
+        "time_to_first_ok_ms": time_to_first_ok,
+        "failed_attempts": failed_attempts,
+        "latencies_ms": latencies,
+        "errors": errors,
+    }
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("url")
+    arg_parser.add_argument("--reset", choices=("restart", "reload"), default="reload")
+    arg_parser.add_argument("-r", "--repeat", type=int, default=5, help="number of cold starts")
+    arg_parser.add_argument(
+        "-n", "--requests", type=int, default=20, help="requests measured after each cold start"
+    )
+    arg_parser.add_argument("--timeout", type=float, default=5.0, help="request timeout (s)")
+    arg_parser.add_argument(
+        "--max-wait", type=float, default=120.0, help="maximum seconds until the first 200"
+    )
+    arg_parser.add_argument(
+        "--pause", type=float, default=2.0, help="seconds between the cold starts"
+    )
+    arg_parser.add_argument("-o", "--output", help="write the JSON results to this file")
+    args = arg_parser.parse_args(argv)
+
+    runs = []
+    for repetition in range(args.repeat):
+        if repetition:
+            time.sleep(args.pause)
+        run = cold_start(args.url, args.reset, args.requests, args.timeout, args.max_wait)
+        runs.append(run)
+        print(
+            f"Cold start {repetition + 1}/{args.repeat}: first 200 after "
+            f"{run['time_to_first_ok_ms']:.0f} ms ({run['failed_attempts']} failed attempts), "
+            f"first request {run['latencies_ms'][0]:.1f} ms, "
+            f"median of the first {len(run['latencies_ms'])} "
+            f"{statistics.median(run['latencies_ms']):.1f} ms"
+        )
+
+    result = {
+        "tool": "coldstart",
+        "url": args.url,
+        "reset": args.reset,
+        "requests": args.requests,
+        "time_to_first_ok_ms": statistics.median(run["time_to_first_ok_ms"] for run in runs),
+        "runs": runs,
+    }
+    # Same convention as the other tools: the options, without the URL and output file
+    argv = list(argv if argv is not None else sys.argv[1:])
+    for option in ("-o", "--output"):
+        if option in argv:
+            del argv[argv.index(option) : argv.index(option) + 2]
+    result["command_args"] = " ".join(arg for arg in argv if arg != args.url)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,7 +10,8 @@ fi
 if [ -d "octane" ]; then
     echo "Starting Octane..."
     # Navigate to the octane directory and start Octane in the background
-    cd octane && php artisan octane:start --host 0.0.0.0 &
+    # OCTANE_WORKERS is set by the php-fpm workers/cores matrix of runner.py (default: one per CPU)
+    cd octane && php artisan octane:start --host 0.0.0.0 ${OCTANE_WORKERS:+--workers=$OCTANE_WORKERS} &
 else
     echo "Octane directory not found. Skipping Octane start this time."
 fi
@@ -0,0 +1,264 @@
+"""Compact, mergeable latency histogram (HdrHistogram layout).
+
+Values are integers (loadgen.py and plot.py record microseconds) stored in
+log-bucketed counters: every power-of-two bucket is split into linear
+sub-buckets, so the relative error of any recorded value is bounded by the
+configured number of significant digits. The counts live in a fixed-size
+array, so memory does not grow with the number of recorded requests, and two
+histograms with the same layout merge by adding their counts, which gives
+exact combined percentiles for repeated runs or several load generator
+processes.
+"""
+
+import base64
+import math
+import sys
+import zlib
+from array import array
+
+
+class LatencyHistogram:
+    def __init__(self, lowest=1, highest=3_600_000_000, significant_digits=3):
+        if lowest < 1 or highest < 2 * lowest:
+            raise ValueError("highest must be at least twice the lowest value (lowest >= 1)")
+        if not 1 <= significant_digits <= 5:
+            raise ValueError("significant_digits must be between 1 and 5")
+        self.lowest = lowest
+        self.highest = highest
+        self.significant_digits = significant_digits
+
+        largest_single_unit = 2 * 10**significant_digits
+        self.unit_magnitude = int(math.floor(math.log2(lowest)))
+        self.sub_bucket_count_magnitude = int(math.ceil(math.log2(largest_single_unit)))
+        self.sub_bucket_half_count_magnitude = self.sub_bucket_count_magnitude - 1
+        self.sub_bucket_count = 1 << self.sub_bucket_count_magnitude
+        self.sub_bucket_half_count = self.sub_bucket_count // 2
+        self.sub_bucket_mask = (self.sub_bucket_count - 1) << self.unit_magnitude
+
+        # number of power-of-two buckets needed to cover the highest value
+        smallest_untrackable = self.sub_bucket_count << self.unit_magnitude
+        self.bucket_count = 1
+        while smallest_untrackable <= highest:
+            smallest_untrackable <<= 1
+            self.bucket_count += 1
+
+        self.counts = array("q", [0]) * ((self.bucket_count + 1) * self.sub_bucket_half_count)
+        self.total_count = 0
+        self.min_value = None
+        self.max_value = 0
+
+    # index arithmetic
+
+    def _bucket_index(self, value):
+        return (
+            (value | self.sub_bucket_mask).bit_length()
+            - self.unit_magnitude
+            - (self.sub_bucket_half_count_magnitude + 1)
+        )
+
+    def _counts_index(self, value):
+        bucket_index = self._bucket_index(value)
+        sub_bucket_index = value >> (bucket_index + self.unit_magnitude)
+        bucket_base_index = (bucket_index + 1) << self.sub_bucket_half_count_magnitude
+        return bucket_base_index + sub_bucket_index - self.sub_bucket_half_count
+
+    def _value_from_index(self, index):
+        bucket_index = (index >> self.sub_bucket_half_count_magnitude) - 1
+        sub_bucket_index = (index & (self.sub_bucket_half_count - 1)) + self.sub_bucket_half_count
+        if bucket_index < 0:
+            sub_bucket_index -= self.sub_bucket_half_count
+            bucket_index = 0
+        return sub_bucket_index << (bucket_index + self.unit_magnitude)
+
+    def _equivalent_range(self, value):
+        bucket_index = self._bucket_index(value)
+        sub_bucket_index = value >> (bucket_index + self.unit_magnitude)
+        if sub_bucket_index >= self.sub_bucket_count:
+            bucket_index += 1
+        return 1 << (self.unit_magnitude + bucket_index)
+
+    def lowest_equivalent(self, value):
+        return self._value_from_index(self._counts_index(value))
+
+    def highest_equivalent(self, value):
+        return self.lowest_equivalent(value) + self._equivalent_range(value) - 1
+
+    def median_equivalent(self, value):
+        return self.lowest_equivalent(value) + (self._equivalent_range(value) >> 1)
+
+    def same_layout(self, other):
+        return (
+            self.lowest == other.lowest
+            and self.highest == other.highest
+            and self.significant_digits == other.significant_digits
+        )
+
+    # recording
+
+    def record(self, value, count=1):
+        """
+        Records a value (count times). Values above the highest trackable value are clamped.
+        """
+        value = min(max(int(value), 0), self.highest)
+        self.counts[self._counts_index(value)] += count
+        self.total_count += count
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if value > self.max_value:
+            self.max_value = value
+
+    def merge(self, other):
+        """
+        Adds the counts of another histogram to this one.
+        """
+        if self.same_layout(other):
+            counts = self.counts
+            for index, count in other.nonzero():
+                counts[index] += count
+            self.total_count += other.total_count
+            if other.total_count:
+                if self.min_value is None or other.min_value < self.min_value:
+                    self.min_value = other.min_value
+                self.max_value = max(self.max_value, other.max_value)
+        else:
+            # different layouts: re-record every bucket at its median equivalent value
+            for index, count in other.nonzero():
+                self.record(other.median_equivalent(other._value_from_index(index)), count)
+        return self
+
+    # queries
+
+    def nonzero(self):
+        """
+        Yields (counts index, count) for every non-empty bucket.
+        """
+        for index, count in enumerate(self.counts):
+            if count:
+                yield index, count
+
+    def value_at_percentile(self, percentile):
+        """
+        Returns the highest equivalent value at or below which the given percentile (0-100) falls.
+        """
+        if self.total_count == 0:
+            return 0
+        percentile = min(max(percentile, 0.0), 100.0)
+        count_at_percentile = max(1, int(percentile / 100 * self.total_count + 0.5))
+        seen = 0
+        for index, count in self.nonzero():
+            seen += count
+            if seen >= count_at_percentile:
+                value = self._value_from_index(index)
+                if percentile == 0:
+                    return self.lowest_equivalent(value)
+                return min(self.highest_equivalent(value), self.max_value)
+        return self.max_value
+
+    def percentiles(self, percentiles=(50, 90, 99, 99.9)):
+        """
+        Returns {"p50": value, ...} for the given percentiles in a single pass over the counts.
+        """
+        result = {}
+        if self.total_count == 0:
+            return {f"p{p:g}": 0 for p in percentiles}
+        targets = sorted(percentiles)
+        seen = 0
+        position = 0
+        for index, count in self.nonzero():
+            seen += count
+            while position < len(targets) and seen >= max(
+                1, int(targets[position] / 100 * self.total_count + 0.5)
+            ):
+                value = self._value_from_index(index)
+                result[f"p{targets[position]:g}"] = min(
+                    self.highest_equivalent(value), self.max_value
+                )
+                position += 1
+            if position == len(targets):
+                break
+        for p in targets[position:]:
+            result[f"p{p:g}"] = self.max_value
+        return result
+
+    def mean(self):
+        if self.total_count == 0:
+            return 0.0
+        total = 0
+        for index, count in self.nonzero():
+            total += self.median_equivalent(self._value_from_index(index)) * count
+        return total / self.total_count
+
+    def stdev(self):
+        if self.total_count == 0:
+            return 0.0
+        mean = self.mean()
+        total = 0.0
+        for index, count in self.nonzero():
+            deviation = self.median_equivalent(self._value_from_index(index)) - mean
+            total += deviation * deviation * count
+        return math.sqrt(total / self.total_count)
+
+    def summary(self, scale=1.0):
+        """
+        Returns mean, stdev, min, max and p50/p90/p99/p99.9 divided by scale
+        (e.g. scale=1000 turns microseconds into milliseconds).
+        """
+        values = {
+            "mean": self.mean(),
+            "stdev": self.stdev(),
+            "min": self.min_value or 0,
+            "max": self.max_value,
+        }
+        values.update(self.percentiles())
+        values = {key: value / scale for key, value in values.items()}
+        values["count"] = self.total_count
+        return values
+
+    # serialization
+
+    def to_dict(self):
+        """
+        Serializes the histogram into a JSON friendly dict (zlib compressed, base64 encoded counts).
+        """
+        counts = array("q", self.counts)
+        if sys.byteorder == "big":
+            counts.byteswap()
+        return {
+            "lowest": self.lowest,
+            "highest": self.highest,
+            "significant_digits": self.significant_digits,
+            "total_count": self.total_count,
+            "min": self.min_value,
+            "max": self.max_value,
+            "counts": base64.b64encode(zlib.compress(counts.tobytes())).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data["lowest"], data["highest"], data["significant_digits"])
+        counts = array("q")
+        counts.frombytes(zlib.decompress(base64.b64decode(data["counts"])))
+        if sys.byteorder == "big":
+            counts.byteswap()
+        if len(counts) != len(histogram.counts):
+            raise ValueError("Serialized histogram does not match its layout")
+        histogram.counts = counts
+        histogram.total_count = data["total_count"]
+        histogram.min_value = data["min"]
+        histogram.max_value = data["max"]
+        return histogram
+
+    @classmethod
+    def from_wrk2_spectrum(cls, latencies, total_counts, scale=1000, **kwargs):
+        """
+        Rebuilds a histogram from wrk2's "Detailed Percentile spectrum" (latency in ms and the
+        cumulative TotalCount column). Values are recorded in ms * scale (microseconds by default).
+        """
+        histogram = cls(**kwargs)
+        previous = 0
+        for latency, total_count in zip(latencies, total_counts):
+            count = int(total_count) - previous
+            if count > 0:
+                histogram.record(round(float(latency) * scale), count)
+                previous = int(total_count)
+        return histogram
@@ -0,0 +1,376 @@
+"""Run history of the benchmark: normalized results of every run and regression checks.
+
+Every run of runner.py overwrites the logs in the results directory, so plot.py
+adds the parsed results of the run described by results/manifest.json to a
+SQLite store (results/history.sqlite3), keyed by the run id of the manifest and
+kept together with its git commit, PHP and framework package versions and host.
+
+The compare command checks a run against a baseline run and exits with status 1
+if the goodput (requests/sec for tools without one) of a framework dropped, or
+its p99 latency rose, by more than the noise of the measurements allows: the
+threshold is the larger of --threshold percent and --sigmas times the relative
+noise, estimated from the spread of the trials (runner.py -n) and the
+run-to-run spread of the previous runs.
+
+Usage:
+    python3 history.py list
+    python3 history.py compare                  # latest run against the run before it
+    python3 history.py compare --baseline 20240301T120000Z --threshold 5 --sigmas 3
+"""
+
+import argparse
+import json
+import math
+import os
+import sqlite3
+import statistics
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# compared metrics: (name, label, higher is better)
+METRICS = (("throughput", "goodput", True), ("p99_ms", "p99 latency", False))
+
+
+def normalize(record):
+    """
+    Normalized metrics of a plot.py record (one log file), None if the log has none.
+    """
+    matrix = record.get("matrix")
+    row = {
+        "framework": record["framework"],
+        "benchmark": record["benchmark"],
+        "tool": record["tool"],
+        # h2load protocol (h1, h2c) and runner.py --matrix point (w<workers>c<cores>)
+        "variant": record["metrics"].get("protocol") or "",
+        "matrix": f"w{matrix['workers']}c{matrix['cores']}" if matrix else "",
+        "trial": record["trial"],
+        "goodput": record["goodput"],
+        "rps": record["rps"],
+        "p99_ms": record["latency_percentiles"].get("p99"),
+        "error_rate": record["error_rate"],
+    }
+    if row["goodput"] is None and row["rps"] is None and row["p99_ms"] is None:
+        return None
+    return row
+
+
+def throughput(row):
+    return row["goodput"] if row["goodput"] is not None else row["rps"]
+
+
+class RunHistory:
+    """
+    SQLite store of the benchmark runs (manifest without the per test entries) and of the
+    normalized metrics of their logs.
+    """
+
+    COLUMNS = (
+        "framework",
+        "benchmark",
+        "tool",
+        "variant",
+        "matrix",
+        "trial",
+        "goodput",
+        "rps",
+        "p99_ms",
+        "error_rate",
+    )
+
+    def __init__(self, path):
+        self.path = path
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs (run_id TEXT PRIMARY KEY, started TEXT, manifest TEXT)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS metrics (run_id TEXT, framework TEXT, benchmark TEXT, "
+            "tool TEXT, variant TEXT, matrix TEXT, trial INTEGER, goodput REAL, rps REAL, "
+            "p99_ms REAL, error_rate REAL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS metrics_run ON metrics (run_id)")
+        return conn
+
+    def add_run(self, manifest, records):
+        """
+        Stores (or replaces) the run of a manifest with the metrics of the records of its logs,
+        i.e. the logs the run wrote or, with --resume, kept. Returns the number of stored logs.
+        """
+        logs = {
+            entry["log"] for entry in manifest["runs"] if entry.get("status") in ("ok", "skipped")
+        }
+        rows = [
+            row
+            for row in (normalize(r) for r in records if os.path.basename(r["path"]) in logs)
+            if row is not None
+        ]
+        run = {key: value for key, value in manifest.items() if key != "runs"}
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO runs VALUES (?, ?, ?)",
+                    (manifest["run_id"], manifest["started"], json.dumps(run)),
+                )
+                conn.execute("DELETE FROM metrics WHERE run_id = ?", (manifest["run_id"],))
+                conn.executemany(
+                    f"INSERT INTO metrics VALUES (?{', ?' * len(self.COLUMNS)})",
+                    [(manifest["run_id"], *(row[c] for c in self.COLUMNS)) for row in rows],
+                )
+        finally:
+            conn.close()
+        return len(rows)
+
+    def add_manifest(self, manifest_file, records):
+        """
+        Adds the run of a runner.py manifest file, if it exists and has a run id.
+        Returns the run id, None if there is nothing to add.
+        """
+        if not os.path.exists(manifest_file):
+            return None
+        with open(manifest_file) as f:
+            manifest = json.load(f)
+        # manifests of older runner.py versions have no run id
+        if "run_id" not in manifest:
+            return None
+        count = self.add_run(manifest, records)
+        print(f"Run history: run {manifest['run_id']} stored with {count} results")
+        return manifest["run_id"]
+
+    def runs(self):
+        """
+        Returns the runs (run id, start time and manifest) from the oldest to the newest.
+        """
+        if not os.path.exists(self.path):
+            return []
+        conn = self._connect()
+        try:
+            return [
+                {"run_id": row["run_id"], "started": row["started"], **json.loads(row["manifest"])}
+                for row in conn.execute("SELECT * FROM runs ORDER BY started")
+            ]
+        finally:
+            conn.close()
+
+    def metrics(self, run_id=None):
+        """
+        Returns the normalized metrics of one run (of all runs if run_id is None).
+        """
+        conn = self._connect()
+        try:
+            if run_id is None:
+                rows = conn.execute("SELECT * FROM metrics")
+            else:
+                rows = conn.execute("SELECT * FROM metrics WHERE run_id = ?", (run_id,))
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+
+def group_metrics(rows):
+    """
+    Groups metrics rows by (framework, benchmark, tool, variant, matrix): the trials of a test.
+    """
+    groups = {}
+    for row in rows:
+        key = (row["framework"], row["benchmark"], row["tool"], row["variant"], row["matrix"])
+        groups.setdefault(key, []).append(row)
+    return groups
+
+
+def metric_values(rows, metric):
+    values = [throughput(row) if metric == "throughput" else row[metric] for row in rows]
+    return [value for value in values if value is not None and value > 0]
+
+
+def relative_noise(values):
+    """
+    Coefficient of variation of a list of values, 0 for fewer than two values.
+    """
+    if len(values) < 2:
+        return 0.0
+    return statistics.stdev(values) / statistics.mean(values)
+
+
+class RegressionChecker:
+    """
+    Compares the metrics of a run with those of a baseline run of the same history.
+    """
+
+    def __init__(self, history, threshold=5.0, sigmas=3.0, window=10):
+        self.history = history
+        self.threshold = threshold
+        self.sigmas = sigmas
+        self.window = window
+
+    def run_to_run_noise(self, previous, key, metric):
+        """
+        Relative spread of the medians of a test over the previous runs (at least three).
+        """
+        medians = []
+        for groups in previous:
+            values = metric_values(groups.get(key, []), metric)
+            if values:
+                medians.append(statistics.median(values))
+        return relative_noise(medians) if len(medians) >= 3 else 0.0
+
+    def compare(self, run_id, baseline_id):
+        """
+        Returns one comparison per test and metric present in both runs, with the relative
+        change and the noise-aware limit (%) and a status: regression, improvement or ok.
+        """
+        run_ids = [run["run_id"] for run in self.history.runs()]
+        position = run_ids.index(run_id)
+        previous = [
+            group_metrics(self.history.metrics(previous_id))
+            for previous_id in run_ids[max(0, position - self.window) : position]
+        ]
+        current = group_metrics(self.history.metrics(run_id))
+        baseline = group_metrics(self.history.metrics(baseline_id))
+
+        comparisons = []
+        for key in sorted(current.keys() & baseline.keys()):
+            for metric, label, higher_is_better in METRICS:
+                values = metric_values(current[key], metric)
+                baseline_values = metric_values(baseline[key], metric)
+                if not values or not baseline_values:
+                    continue
+                value = statistics.median(values)
+                baseline_value = statistics.median(baseline_values)
+                # standard error of the relative difference of the trial means, or that of
+                # two runs with the run-to-run spread of the previous runs, whichever is larger
+                trial_noise = math.sqrt(
+                    relative_noise(values) ** 2 / len(values)
+                    + relative_noise(baseline_values) ** 2 / len(baseline_values)
+                )
+                run_noise = math.sqrt(2) * self.run_to_run_noise(previous, key, metric)
+                noise = max(trial_noise, run_noise)
+                limit = max(self.threshold, self.sigmas * noise * 100)
+                change = 100 * (value - baseline_value) / baseline_value
+                worse = -change if higher_is_better else change
+                if worse > limit:
+                    status = "regression"
+                elif -worse > limit:
+                    status = "improvement"
+                else:
+                    status = "ok"
+                framework, benchmark, tool, variant, matrix = key
+                comparisons.append(
+                    {
+                        "framework": framework,
+                        "benchmark": benchmark,
+                        "tool": tool,
+                        "variant": ".".join(part for part in (variant, matrix) if part),
+                        "metric": label,
+                        "baseline": baseline_value,
+                        "value": value,
+                        "change": change,
+                        "limit": limit,
+                        "status": status,
+                    }
+                )
+        return comparisons
+
+
+def describe_run(run):
+    git = (run.get("versions") or {}).get("git") or {}
+    php = (run.get("versions") or {}).get("php")
+    return f"{run['run_id']} (git {git.get('describe') or '?'}, PHP {php or '?'})"
+
+
+def list_runs(history):
+    runs = history.runs()
+    if not runs:
+        print(f"No runs in {history.path}")
+        return 0
+    for run in runs:
+        host = run.get("host") or {}
+        print(
+            f"{describe_run(run)}  started {run['started']}  {host.get('hostname', '?')}: "
+            f"{host.get('cpus', '?')} CPUs {host.get('cpu_model') or ''}"
+        )
+    return 0
+
+
+def compare_runs(history, run_id=None, baseline_id=None, threshold=5.0, sigmas=3.0, window=10):
+    """
+    Prints the comparison of a run (default: the latest) with a baseline run (default: the run
+    before it). Returns 1 if a metric regressed, 0 otherwise.
+    """
+    runs = {run["run_id"]: run for run in history.runs()}
+    run_ids = list(runs)
+    for name, value in (("run", run_id), ("baseline", baseline_id)):
+        if value is not None and value not in runs:
+            print(f"Error: unknown {name} {value} (see python3 history.py list)")
+            return 2
+    run_id = run_id or (run_ids[-1] if run_ids else None)
+    if baseline_id is None:
+        position = run_ids.index(run_id) if run_id else 0
+        baseline_id = run_ids[position - 1] if position > 0 else None
+    if baseline_id is None:
+        print("Nothing to compare: the history has no run before this one.")
+        return 0
+
+    comparisons = RegressionChecker(history, threshold, sigmas, window).compare(
+        run_id, baseline_id
+    )
+    print(f"Run:      {describe_run(runs[run_id])}")
+    print(f"Baseline: {describe_run(runs[baseline_id])}")
+    print("")
+    for c in comparisons:
+        test = f"{c['framework']} {c['benchmark']} {c['tool']}"
+        if c["variant"]:
+            test += f" ({c['variant']})"
+        marker = {"regression": "REGRESSION", "improvement": "improved", "ok": ""}[c["status"]]
+        print(
+            f"{test:<45} {c['metric']:<12} {c['baseline']:>10.2f} -> {c['value']:>10.2f} "
+            f"{c['change']:>+7.1f}% (limit {c['limit']:.1f}%) {marker}"
+        )
+    regressions = [c for c in comparisons if c["status"] == "regression"]
+    print("")
+    print(
+        f"{len(comparisons)} comparisons, {len(regressions)} regressions, "
+        f"{sum(c['status'] == 'improvement' for c in comparisons)} improvements"
+    )
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument(
+        "--history",
+        default=os.path.join(BASE_DIR, "results", "history.sqlite3"),
+        help="run history file written by plot.py",
+    )
+    subparsers = arg_parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="list the stored runs")
+    compare_parser = subparsers.add_parser("compare", help="compare a run with a baseline run")
+    compare_parser.add_argument("--run", help="run id to check (default: the latest run)")
+    compare_parser.add_argument(
+        "--baseline", help="run id to compare with (default: the run before --run)"
+    )
+    compare_parser.add_argument(
+        "--threshold", type=float, default=5.0, help="minimum relative change (%%) to report"
+    )
+    compare_parser.add_argument(
+        "--sigmas", type=float, default=3.0, help="noise multiples a change must exceed"
+    )
+    compare_parser.add_argument(
+        "--window", type=int, default=10, help="previous runs used for the run-to-run noise"
+    )
+    args = arg_parser.parse_args(argv)
+
+    history = RunHistory(args.history)
+    if args.command == "list":
+        return list_runs(history)
+    return compare_runs(
+        history, args.run, args.baseline, args.threshold, args.sigmas, args.window
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
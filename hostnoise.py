@@ -0,0 +1,206 @@
+"""Host noise detection and run quality scoring.
+
+HostSampler records the state of the host (the "cpu" and "ctxt" lines of
+/proc/stat, the load average and the current CPU frequencies of
+/sys/devices/system/cpu/cpu*/cpufreq) to a side file of the log
+(<domain>.<test>.<tool>.host.jsonl): a short window of samples before the
+tool starts, while the benchmarked stack is idle, then one sample per
+interval while it runs. summarize_host() turns such a file into the noise
+metrics of both phases and a quality score from 0 to 100 with the flags of
+the limits that were exceeded:
+
+- steal: CPU time taken by the hypervisor for other guests during the run
+- iowait: CPU time spent waiting for I/O during the run
+- busy: CPU usage of the host before the run (other processes on the host)
+- cpufreq: drop of the CPU frequency during the run (throttling, governor)
+
+The load average and the context switch rate are recorded as well, but are
+not scored: the load average lags behind by minutes and both are dominated
+by the benchmark itself during the run.
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+
+# flag limits: percent of the CPU time (busy: of the host CPUs before the run),
+# cpufreq: percent drop from the highest to the lowest sampled frequency
+NOISE_LIMITS = {"steal": 1.0, "iowait": 5.0, "busy": 10.0, "cpufreq": 10.0}
+
+# quality points lost per percent of each metric
+NOISE_WEIGHTS = {"steal": 10.0, "iowait": 2.0, "busy": 1.0, "cpufreq": 1.0}
+
+# fields of the "cpu" line of /proc/stat (guest time is included in user/nice)
+CPU_FIELDS = ("user", "nice", "system", "idle", "iowait", "irq", "softirq", "steal")
+
+
+def host_path(log_path):
+    """
+    Side file of a log file: laravel.bench.api.wrk.log -> laravel.bench.api.wrk.host.jsonl
+    """
+    return log_path[: -len(".log")] + ".host.jsonl"
+
+
+def read_cpu_freq():
+    """
+    Mean current frequency (MHz) of the online CPUs, None if cpufreq is not available
+    (e.g. in most virtual machines).
+    """
+    frequencies = []
+    for path in glob.glob("/sys/devices/system/cpu/cpu[0-9]*/cpufreq/scaling_cur_freq"):
+        try:
+            with open(path) as f:
+                frequencies.append(int(f.read()) / 1000)
+        except (OSError, ValueError):
+            continue
+    return sum(frequencies) / len(frequencies) if frequencies else None
+
+
+def read_host_state():
+    """
+    Current host state: cumulative CPU time per state (clock ticks) and context switches
+    of /proc/stat, the load averages and the mean CPU frequency.
+    """
+    state = {"t": time.time(), "cpu": {}, "ctxt": None, "load": None}
+    with open("/proc/stat") as f:
+        for line in f:
+            key, *values = line.split()
+            if key == "cpu":
+                state["cpu"] = dict(zip(CPU_FIELDS, map(int, values)))
+            elif key == "ctxt":
+                state["ctxt"] = int(values[0])
+    try:
+        with open("/proc/loadavg") as f:
+            state["load"] = [float(value) for value in f.read().split()[:3]]
+    except (OSError, ValueError):
+        pass
+    state["freq_mhz"] = read_cpu_freq()
+    return state
+
+
+class HostSampler:
+    def __init__(self, path, interval=0.5):
+        self.path = path
+        self.interval = interval
+        self._file = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def write(self, phase):
+        self._file.write(json.dumps(dict(read_host_state(), phase=phase)) + "\n")
+        self._file.flush()
+
+    def _run(self):
+        while True:
+            self.write("run")
+            if self._stop.wait(self.interval):
+                break
+
+    def start(self, before=1.0):
+        """
+        Samples the host for before seconds, then in a background thread until stop().
+        Returns False if /proc/stat is not readable (not a Linux host).
+        """
+        if not os.path.isfile("/proc/stat"):
+            return False
+        self._file = open(self.path, "w")
+        self.write("before")
+        time.sleep(before)
+        self.write("before")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            # last sample at the end of the run
+            self.write("run")
+            self._file.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def window_stats(first, last):
+    """
+    Noise metrics between two host states: percent of the CPU time that was busy (not idle,
+    iowait or steal), stolen and waiting for I/O, context switches per second and the load
+    average at the start.
+    """
+    elapsed = last["t"] - first["t"]
+    ticks = {field: last["cpu"].get(field, 0) - first["cpu"].get(field, 0) for field in CPU_FIELDS}
+    total = sum(ticks.values())
+    if elapsed <= 0 or total <= 0:
+        raise ValueError("Empty host sample window")
+    idle = ticks["idle"] + ticks["iowait"] + ticks["steal"]
+    return {
+        "seconds": elapsed,
+        "busy_pct": (total - idle) / total * 100,
+        "steal_pct": ticks["steal"] / total * 100,
+        "iowait_pct": ticks["iowait"] / total * 100,
+        "ctxt_per_s": (
+            (last["ctxt"] - first["ctxt"]) / elapsed
+            if last["ctxt"] is not None and first["ctxt"] is not None
+            else None
+        ),
+        "load": first["load"][0] if first["load"] else None,
+    }
+
+
+def quality(before, run, freq_drop_pct):
+    """
+    Quality score (0-100) and flags of a run: the score loses NOISE_WEIGHTS points per
+    percent of each noise metric, a metric above its NOISE_LIMITS value is flagged.
+    """
+    noise = {
+        "steal": run["steal_pct"],
+        "iowait": run["iowait_pct"],
+        "busy": before["busy_pct"] if before else 0.0,
+        "cpufreq": freq_drop_pct or 0.0,
+    }
+    score = 100 - sum(NOISE_WEIGHTS[name] * value for name, value in noise.items())
+    return {
+        "score": round(min(100.0, max(0.0, score))),
+        "flags": [name for name, value in noise.items() if value > NOISE_LIMITS[name]],
+    }
+
+
+def summarize_host(path):
+    """
+    Summarizes a host file into the noise metrics before and during the run, the CPU frequency
+    range (MHz, None without cpufreq) and the quality score and flags of the run.
+    """
+    with open(path) as f:
+        samples = [json.loads(line) for line in f if line.strip()]
+    before = [sample for sample in samples if sample["phase"] == "before"]
+    run = [sample for sample in samples if sample["phase"] == "run"]
+    if len(run) < 2:
+        raise ValueError(f"Not enough host samples in {path}")
+
+    frequencies = [sample["freq_mhz"] for sample in samples if sample.get("freq_mhz")]
+    freq_drop_pct = (1 - min(frequencies) / max(frequencies)) * 100 if frequencies else None
+    summary = {
+        "before": window_stats(before[0], before[-1]) if len(before) >= 2 else None,
+        "run": window_stats(run[0], run[-1]),
+        "freq_mhz": [min(frequencies), max(frequencies)] if frequencies else None,
+        "freq_drop_pct": freq_drop_pct,
+    }
+    summary.update(quality(summary["before"], summary["run"], freq_drop_pct))
+    return summary
+
+
+def quality_text(summary):
+    """
+    One line description of a run quality: "quality 72/100 (steal, busy)".
+    """
+    flags = f" ({', '.join(summary['flags'])})" if summary["flags"] else ""
+    return f"quality {summary['score']}/100{flags}"
@@ -2,26 +2,54 @@ import http from 'k6/http';
 import { check } from 'k6';
 import { sleep } from 'k6';
 
+// rendered by runner.py: [{name, url, weight}], ramp stages and think time (s)
+const endpoints = {{ ENDPOINTS }};
+const stages = {{ STAGES }};
+const thinkTime = {{ THINK_TIME }};
+
+const totalWeight = endpoints.reduce((sum, endpoint) => sum + endpoint.weight, 0);
+
+// always passing thresholds on the per endpoint sub-metrics, so that the summary
+// export contains them and plot.py can break a mixed scenario down per endpoint
+const thresholds = {};
+for (const endpoint of endpoints) {
+    thresholds[`http_req_duration{endpoint:${endpoint.name}}`] = ["max>=0"];
+    thresholds[`http_reqs{endpoint:${endpoint.name}}`] = ["count>=0"];
+    thresholds[`http_req_failed{endpoint:${endpoint.name}}`] = ["rate>=0"];
+}
+
 export const options = {
+    // also export p(99) and p(99.9) in the summary so plot.py can report them
+    summaryTrendStats: ["avg", "min", "med", "max", "p(90)", "p(95)", "p(99)", "p(99.9)"],
+    thresholds: thresholds,
     scenarios: {
         breaking: {
             executor: "ramping-vus",
             gracefulRampDown: "2s",
             gracefulStop: '3s',
-            stages: [
-                { duration: "10s", target: 100 },
-                { duration: "10s", target: 200 },
-                { duration: "10s", target: 400 },
-            ],
+            stages: stages,
         },
     },
 };
 
+// picks an endpoint with a probability proportional to its weight
+function pickEndpoint() {
+    let r = Math.random() * totalWeight;
+    for (const endpoint of endpoints) {
+        r -= endpoint.weight;
+        if (r < 0) {
+            return endpoint;
+        }
+    }
+    return endpoints[endpoints.length - 1];
+}
+
 export default function () {
-    const res = http.get('{{ URI }}');
+    const endpoint = pickEndpoint();
+    const tags = { endpoint: endpoint.name };
+    const res = http.get(endpoint.url, { tags: tags });
     check(res, {
         'is status 200': (r) => r.status === 200,
-    });
-    sleep(1);
+    }, tags);
+    sleep(thinkTime);
 }
-
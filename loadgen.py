@@ -0,0 +1,886 @@
+"""Native HTTP load generator for the PHP frameworks benchmark.
+
+Runs a closed-loop (fixed number of keep-alive connections) or an open-loop
+(constant request rate) test against a URL and writes a JSON results file
+that plot.py reads directly. The open-loop mode corrects for coordinated
+omission like wrk2: latency is measured from the time a request was
+scheduled to be sent, not from the time it actually went out.
+
+With -p N the load is split across N worker processes (one event loop each),
+optionally pinned to their own CPUs (--cpus). The workers start together at a
+barrier and their latency histograms and counters are merged into one result.
+Each worker measures its own CPU time: a worker that was busy for more than
+90% of the run saturated its core, and the result is flagged client-bound,
+since the load generator rather than the server limited the throughput.
+
+Usage:
+    python loadgen.py run http://laravel.bench:8080/benchmarking/hello -c 100 -d 10
+    python loadgen.py run http://laravel.bench:8080/benchmarking/api -c 100 -d 30 -R 500
+    python loadgen.py saturate http://laravel.bench:8080/benchmarking/api --slo-p99 50
+    python loadgen.py sweep http://laravel.bench:8080/benchmarking/hello -l 1,2,4,8,16,32
+    python loadgen.py payload http://laravel.bench:8080/benchmarking/api -l 1,10,100,all
+    python loadgen.py run http://octane.bench:8080/benchmarking/hello -c 400 -p 4 --cpus 0-3
+    python loadgen.py serve --port 8090   # local stand-in server
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from histogram import LatencyHistogram
+
+# Share of a core above which a worker process is considered CPU bound (client saturation)
+CLIENT_SATURATION = 0.9
+
+
+def parse_server_timing(value):
+    """
+    Parses a Server-Timing header ("db;dur=1.2, serialize;dur=0.3, total;dur=2.1") into a
+    dict of phase durations in ms. Metrics without a duration are left out.
+    """
+    timing = {}
+    for metric in value.split(","):
+        name, *params = (part.strip() for part in metric.split(";"))
+        for param in params:
+            key, _, duration = param.partition("=")
+            if key.lower() == "dur":
+                try:
+                    timing[name] = float(duration.strip('"'))
+                except ValueError:
+                    pass
+    return timing
+
+
+class HttpConnection:
+    """
+    A single keep-alive HTTP/1.1 connection.
+    """
+
+    def __init__(self, host, port, path, host_header):
+        self.host = host
+        self.port = port
+        self.request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host_header}\r\n"
+            "User-Agent: loadgen\r\n"
+            "Accept: */*\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode()
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def get(self):
+        """
+        Sends the request and reads the full response. Returns the status code, the number
+        of bytes read and the Server-Timing phases (ms) of the response, if any.
+        """
+        if self.writer is None:
+            await self.connect()
+        self.writer.write(self.request)
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split()[1])
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        size = len(head)
+        if "content-length" in headers:
+            size += len(await self.reader.readexactly(int(headers["content-length"])))
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                chunk_head = await self.reader.readuntil(b"\r\n")
+                chunk_size = int(chunk_head.split(b";")[0], 16)
+                size += len(chunk_head) + len(await self.reader.readexactly(chunk_size + 2))
+                if chunk_size == 0:
+                    break
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        timing = headers.get("server-timing")
+        return status, size, parse_server_timing(timing) if timing else None
+
+
+class LoadGenerator:
+    """
+    Drives a number of keep-alive connections against one URL.
+    With rate=None it runs closed-loop (each connection sends the next request as soon as
+    the previous response arrives), otherwise it runs open-loop at a constant total rate.
+    """
+
+    def __init__(self, url, connections=10, duration=10.0, rate=None, timeout=5.0):
+        parts = urlsplit(url)
+        self.url = url
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.host_header = parts.netloc
+        self.connections = connections
+        self.duration = duration
+        self.rate = rate
+        self.timeout = timeout
+        self.histogram = LatencyHistogram()
+        self.requests = 0
+        self.bytes = 0
+        # open-loop: scheduled requests left unsent at the end because the server fell behind
+        self.unsent = 0
+        self.errors = {"connect": 0, "read": 0, "timeout": 0, "status": 0}
+        # per second requests, errors and latency sum (us), for the warm-up detection in plot.py
+        seconds = max(1, math.ceil(duration))
+        self.series = {
+            "requests": [0] * seconds,
+            "errors": [0] * seconds,
+            "latency": [0.0] * seconds,
+        }
+        # Server-Timing phases: [sum of the durations (ms), number of responses] per phase
+        self.server_timing = {}
+        self.start = None
+
+    def _tick(self, now, key, value=1):
+        # responses arriving after the end are counted in the last second
+        second = min(int(now - self.start), len(self.series[key]) - 1)
+        self.series[key][second] += value
+
+    async def _worker(self, index, start, end):
+        loop = asyncio.get_running_loop()
+        conn = HttpConnection(self.host, self.port, self.path, self.host_header)
+        if self.rate:
+            # Each connection sends at rate/connections, staggered to spread the load
+            interval = self.connections / self.rate
+            intended = start + interval * index / self.connections
+        try:
+            while True:
+                if self.rate:
+                    # stop at the duration like wrk2, even if the server fell behind schedule
+                    if intended >= end or loop.time() >= end:
+                        break
+                    delay = intended - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    sent = intended
+                    intended += interval
+                else:
+                    sent = loop.time()
+                    if sent >= end:
+                        break
+
+                try:
+                    if conn.writer is None:
+                        try:
+                            await asyncio.wait_for(conn.connect(), self.timeout)
+                        except (OSError, asyncio.TimeoutError):
+                            self.errors["connect"] += 1
+                            self._tick(loop.time(), "errors")
+                            conn.close()
+                            await asyncio.sleep(0.01)
+                            continue
+                    status, size, timing = await asyncio.wait_for(conn.get(), self.timeout)
+                except asyncio.TimeoutError:
+                    self.errors["timeout"] += 1
+                    self._tick(loop.time(), "errors")
+                    conn.close()
+                    continue
+                except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+                    self.errors["read"] += 1
+                    self._tick(loop.time(), "errors")
+                    conn.close()
+                    continue
+
+                # latency from the scheduled send time (coordinated omission correction)
+                now = loop.time()
+                latency = (now - sent) * 1e6
+                self.histogram.record(latency)
+                self.requests += 1
+                self.bytes += size
+                self._tick(now, "requests")
+                self._tick(now, "latency", latency)
+                if status >= 400:
+                    self.errors["status"] += 1
+                    self._tick(now, "errors")
+                elif timing:
+                    for phase, duration in timing.items():
+                        totals = self.server_timing.setdefault(phase, [0.0, 0])
+                        totals[0] += duration
+                        totals[1] += 1
+        finally:
+            conn.close()
+        if self.rate and intended < end:
+            # requests scheduled before the end that could not be sent in time
+            self.unsent += math.ceil((end - intended) / interval)
+
+    async def run(self, start_at=None):
+        """
+        Runs the test, optionally waiting until the wall clock time start_at before starting.
+        """
+        if start_at is not None:
+            await asyncio.sleep(max(0.0, start_at - time.time()))
+        loop = asyncio.get_running_loop()
+        start = self.start = loop.time()
+        cpu_start = time.process_time()
+        end = start + self.duration
+        await asyncio.gather(
+            *(self._worker(i, start, end) for i in range(self.connections))
+        )
+        return self.result(loop.time() - start, time.process_time() - cpu_start)
+
+    def result(self, elapsed, cpu_seconds=0.0):
+        return {
+            "cpu_seconds": cpu_seconds,
+            "requests": self.requests,
+            "unsent": self.unsent,
+            "bytes": self.bytes,
+            "elapsed": elapsed,
+            "errors": dict(self.errors),
+            "histogram": self.histogram.to_dict(),
+            "series": self.series,
+            "server_timing": self.server_timing,
+        }
+
+
+def parse_cpus(value):
+    """
+    Parses a CPU list like taskset/cpuset ("0-3,6") into a list of CPU numbers.
+    """
+    cpus = []
+    for part in value.split(","):
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def _run_process(url, connections, duration, rate, timeout, start_at, cpus=None, barrier=None):
+    if cpus:
+        os.sched_setaffinity(0, cpus)
+    generator = LoadGenerator(url, connections, duration, rate, timeout)
+    if barrier is not None:
+        # every worker is up (and pinned) before any of them sends a request
+        barrier.wait(timeout=60)
+        start_at = time.time()
+    result = asyncio.run(generator.run(start_at))
+    result["cpus"] = cpus
+    return result
+
+
+def run_load(url, connections=10, duration=10.0, rate=None, timeout=5.0, processes=1, cpus=None):
+    """
+    Runs the load test, optionally split across several processes (one event loop each, pinned
+    to their share of cpus if given), and returns the merged results.
+    """
+    processes = max(1, min(processes, connections))
+    if processes == 1 and not cpus:
+        parts = [_run_process(url, connections, duration, rate, timeout, None)]
+    else:
+        # connections and rate are divided evenly between the processes, and so are the CPUs
+        # (workers share a CPU round-robin if there are fewer CPUs than processes)
+        shares = [connections // processes + (i < connections % processes) for i in range(processes)]
+        if cpus:
+            pinned = [cpus[i::processes] or [cpus[i % len(cpus)]] for i in range(processes)]
+        else:
+            pinned = [None] * processes
+        with multiprocessing.Manager() as manager, ProcessPoolExecutor(
+            max_workers=processes
+        ) as executor:
+            barrier = manager.Barrier(processes)
+            futures = [
+                executor.submit(
+                    _run_process,
+                    url,
+                    share,
+                    duration,
+                    rate * share / connections if rate else None,
+                    timeout,
+                    None,
+                    worker_cpus,
+                    barrier,
+                )
+                for share, worker_cpus in zip(shares, pinned)
+            ]
+            parts = [future.result() for future in futures]
+
+    histogram = LatencyHistogram()
+    errors = {"connect": 0, "read": 0, "timeout": 0, "status": 0}
+    for part in parts:
+        histogram.merge(LatencyHistogram.from_dict(part["histogram"]))
+        for key, value in part["errors"].items():
+            errors[key] += value
+    requests = sum(part["requests"] for part in parts)
+    elapsed = max(part["elapsed"] for part in parts)
+    server_timing = {}
+    for part in parts:
+        for phase, (duration, count) in part["server_timing"].items():
+            totals = server_timing.setdefault(phase, [0.0, 0])
+            totals[0] += duration
+            totals[1] += count
+
+    # the processes start together (barrier), so their seconds line up
+    series = []
+    for second in range(len(parts[0]["series"]["requests"])):
+        second_requests = sum(part["series"]["requests"][second] for part in parts)
+        second_errors = sum(part["series"]["errors"][second] for part in parts)
+        latency = sum(part["series"]["latency"][second] for part in parts)
+        attempts = second_requests + second_errors
+        series.append(
+            {
+                "t": second,
+                "rps": second_requests,
+                "mean": latency / second_requests / 1000 if second_requests else 0.0,
+                "error_rate": 100 * second_errors / attempts if attempts else 0.0,
+            }
+        )
+
+    return {
+        "tool": "loadgen",
+        "url": url,
+        "mode": "open" if rate else "closed",
+        "connections": connections,
+        "rate": rate,
+        "processes": processes,
+        "duration": duration,
+        "elapsed": elapsed,
+        "requests": requests,
+        "unsent": sum(part["unsent"] for part in parts),
+        "bytes": sum(part["bytes"] for part in parts),
+        "rps": requests / elapsed if elapsed else 0.0,
+        "errors": errors,
+        # the histogram records microseconds
+        "latency_ms": histogram.summary(scale=1000),
+        "histogram": histogram.to_dict(),
+        "series": series,
+        # mean duration (ms) of each Server-Timing phase over the successful responses
+        "server_timing": {
+            phase: duration / count for phase, (duration, count) in server_timing.items()
+        },
+        "client": client_usage(parts),
+    }
+
+
+def client_usage(parts):
+    """
+    CPU usage of the load generator workers: the share of a core each worker process used
+    during its run, and whether the client was CPU bound (client saturation): a worker used
+    a whole core, or the workers pinned to the same CPUs used all of them.
+    """
+    workers = [
+        {
+            "cpus": part["cpus"],
+            "cpu": part["cpu_seconds"] / part["elapsed"] if part["elapsed"] else 0.0,
+            "requests": part["requests"],
+        }
+        for part in parts
+    ]
+    max_cpu = max(worker["cpu"] for worker in workers)
+    pinned = {}
+    for worker in workers:
+        if worker["cpus"]:
+            pinned.setdefault(tuple(worker["cpus"]), []).append(worker["cpu"])
+    busiest_cpus = max((sum(usage) / len(cpus) for cpus, usage in pinned.items()), default=0.0)
+    return {
+        "workers": workers,
+        "max_cpu": max_cpu,
+        "saturated": max(max_cpu, busiest_cpus) >= CLIENT_SATURATION,
+    }
+
+
+def error_rate(result):
+    """
+    Share of failed requests (connection/read errors, timeouts and non-2xx/3xx responses).
+    """
+    errors = result["errors"]
+    attempts = result["requests"] + errors["connect"] + errors["read"] + errors["timeout"]
+    return sum(errors.values()) / attempts if attempts else 1.0
+
+
+def client_bound(result):
+    """
+    Marker for the progress lines of a run whose load generator was CPU bound.
+    """
+    return " (client-bound)" if result["client"]["saturated"] else ""
+
+
+def find_max_sustainable_rate(
+    url,
+    slo_p99=50.0,
+    slo_errors=0.1,
+    connections=100,
+    duration=10.0,
+    start_rate=100.0,
+    max_rate=100000.0,
+    precision=0.05,
+    max_probes=20,
+    timeout=5.0,
+    processes=1,
+    cooldown=2.0,
+    cpus=None,
+):
+    """
+    Searches the highest constant request rate that still meets the latency SLO
+    (p99 below slo_p99 ms, error rate below slo_errors %): the rate is doubled up to
+    max_rate until the SLO is breached (or the server cannot keep up with the offered
+    rate), then bisected between the last good and the first bad rate. If start_rate
+    already breaches the SLO, it is halved until a rate meets it (down to 1 req/s).
+    """
+    probes = []
+
+    def probe(rate):
+        result = run_load(url, connections, duration, rate, timeout, processes, cpus)
+        errors = 100 * error_rate(result)
+        ok = (
+            result["latency_ms"]["p99"] < slo_p99
+            and errors < slo_errors
+            # the offered rate must actually be served, not just queued up
+            and result["rps"] >= 0.95 * rate
+        )
+        probes.append(
+            {
+                "rate": rate,
+                "rps": result["rps"],
+                "error_rate": errors,
+                "latency_ms": result["latency_ms"],
+                "ok": ok,
+            }
+        )
+        print(
+            f"  probe {len(probes)}: {rate:.0f} req/s -> {result['rps']:.0f} req/s, "
+            f"p99 {result['latency_ms']['p99']:.2f} ms, errors {errors:.2f}% "
+            f"({'ok' if ok else 'SLO breached'}){client_bound(result)}"
+        )
+        time.sleep(cooldown)
+        return ok
+
+    good, bad = None, None
+    rate = min(start_rate, max_rate)
+    # coarse ramp, the last step is clamped so that max_rate itself is probed
+    while len(probes) < max_probes:
+        if not probe(rate):
+            bad = rate
+            break
+        good = rate
+        if rate >= max_rate:
+            break
+        rate = min(rate * 2, max_rate)
+    # the start rate already breached the SLO: halve it until a rate meets the SLO
+    while good is None and bad is not None and len(probes) < max_probes and bad / 2 >= 1:
+        rate = bad / 2
+        if probe(rate):
+            good = rate
+        else:
+            bad = rate
+    # bisection
+    if good is not None and bad is not None:
+        while len(probes) < max_probes and (bad - good) / good > precision:
+            rate = (good + bad) / 2
+            if probe(rate):
+                good = rate
+            else:
+                bad = rate
+
+    best = max((p for p in probes if p["ok"]), key=lambda p: p["rate"], default=None)
+    return {
+        "tool": "saturation",
+        "url": url,
+        "slo": {"p99_ms": slo_p99, "error_rate": slo_errors},
+        "connections": connections,
+        "duration": duration,
+        "max_sustainable_rate": good or 0.0,
+        "max_sustainable_rps": best["rps"] if best else 0.0,
+        "probes": sorted(probes, key=lambda p: p["rate"]),
+    }
+
+
+def sweep_concurrency(
+    url, levels, duration=10.0, timeout=5.0, processes=1, cooldown=2.0, cpus=None
+):
+    """
+    Runs one closed-loop test per concurrency level and records throughput and latency at each.
+    """
+    results = []
+    for concurrency in levels:
+        result = run_load(url, concurrency, duration, None, timeout, processes, cpus)
+        results.append(
+            {
+                "concurrency": concurrency,
+                "rps": result["rps"],
+                "error_rate": 100 * error_rate(result),
+                "latency_ms": result["latency_ms"],
+            }
+        )
+        print(
+            f"  {concurrency} connections: {result['rps']:.0f} req/s, "
+            f"p50 {result['latency_ms']['p50']:.2f} ms, p99 {result['latency_ms']['p99']:.2f} ms"
+            f"{client_bound(result)}"
+        )
+        time.sleep(cooldown)
+    return {
+        "tool": "sweep",
+        "url": url,
+        "duration": duration,
+        "levels": results,
+    }
+
+
+def limit_url(url, limit):
+    """
+    Sets the ?limit=N row limit of the api endpoint (limit None: all rows, no parameter).
+    """
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key != "limit"]
+    if limit is not None:
+        query.append(("limit", str(limit)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def count_rows(url, timeout=5.0):
+    """
+    Number of rows of a JSON array response, None if the response is not a JSON array.
+    """
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        data = json.loads(response.read())
+    return len(data) if isinstance(data, list) else None
+
+
+def sweep_payload(
+    url, limits, connections=10, duration=10.0, timeout=5.0, processes=1, cooldown=2.0, cpus=None
+):
+    """
+    Runs one closed-loop test per row limit of the api endpoint (None: all rows) and records
+    throughput, latency and transferred bytes at each payload size.
+    """
+    results = []
+    for limit in limits:
+        level_url = limit_url(url, limit)
+        # the actual number of rows, which also catches a framework ignoring the limit
+        rows = count_rows(level_url, timeout)
+        if limit is not None and rows != limit:
+            print(f"  warning: {level_url} returned {rows} rows")
+        result = run_load(level_url, connections, duration, None, timeout, processes, cpus)
+        successful = result["requests"] - result["errors"]["status"]
+        results.append(
+            {
+                "limit": limit if limit is not None else "all",
+                "rows": rows,
+                "rps": result["rps"],
+                "goodput": successful / result["elapsed"] if result["elapsed"] else 0.0,
+                "error_rate": 100 * error_rate(result),
+                "bytes_per_sec": result["bytes"] / result["elapsed"] if result["elapsed"] else 0.0,
+                "response_bytes": result["bytes"] / result["requests"] if result["requests"] else 0,
+                "latency_ms": result["latency_ms"],
+            }
+        )
+        print(
+            f"  {rows} rows: {result['rps']:.0f} req/s, "
+            f"{results[-1]['bytes_per_sec'] / 2**20:.1f} MB/s, "
+            f"p50 {result['latency_ms']['p50']:.2f} ms, p99 {result['latency_ms']['p99']:.2f} ms"
+            f"{client_bound(result)}"
+        )
+        time.sleep(cooldown)
+    return {
+        "tool": "payload",
+        "url": url,
+        "connections": connections,
+        "duration": duration,
+        "levels": results,
+    }
+
+
+class StandInServer:
+    """
+    Minimal keep-alive HTTP server mimicking the /benchmarking/hello and /benchmarking/api
+    endpoints, so the load generator can be exercised without the PHP stack. delay (seconds)
+    is added to every response to mimic a slow server.
+    """
+
+    hello_body = (
+        '<!doctype html>\n<html lang="en">\n\n<head>\n\t<meta charset="utf-8">\n'
+        '\t<meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+        "\t<title>Hello</title>\n</head>\n\n<body>\n\t<p>Hello, World!!!</p>\n</body>\n\n</html>"
+    ).encode()
+
+    def __init__(self, host="127.0.0.1", port=8090, rows=1000, delay=0.0):
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self.rows = [
+            {
+                "film_id": i,
+                "title": f"FILM {i}",
+                "description": "A Epic Drama of a Feminist And a Mad Scientist",
+                "release_year": 2006,
+                "rental_duration": 3,
+                "rental_rate": "4.99",
+                "length": 86,
+                "replacement_cost": "20.99",
+                "rating": "PG",
+                "special_features": "Deleted Scenes,Behind the Scenes",
+                "last_update": "2006-02-15 08:03:42",
+            }
+            for i in range(1, rows + 1)
+        ]
+        # response bodies per ?limit=N value
+        self.api_bodies = {}
+        self.server = None
+
+    def _response(self, path):
+        path, _, query = path.partition("?")
+        if path == "/benchmarking/hello":
+            return 200, "text/html; charset=UTF-8", self.hello_body
+        # api, api-persistent and api-cached
+        if path.startswith("/benchmarking/api"):
+            # same semantics as the PHP endpoints: all rows if the limit is not positive
+            limit = dict(parse_qsl(query)).get("limit", "")
+            limit = int(limit) if limit.isdigit() and int(limit) > 0 else None
+            if limit not in self.api_bodies:
+                self.api_bodies[limit] = json.dumps(self.rows[:limit]).encode()
+            return 200, "application/json", self.api_bodies[limit]
+        return 404, "text/plain", b"Not Found"
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                path = head.split(b" ", 2)[1].decode()
+                start = time.perf_counter()
+                status, content_type, body = self._response(path)
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                duration = (time.perf_counter() - start) * 1000
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Not Found'}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Server-Timing: total;dur={duration:.3f}\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, IndexError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"Stand-in server listening on http://{self.host}:{self.port}/benchmarking/")
+        async with self.server:
+            await self.server.serve_forever()
+
+
+def print_summary(result):
+    latency = result["latency_ms"]
+    errors = result["errors"]
+    print(
+        f"{result['requests']} requests in {result['elapsed']:.2f}s "
+        f"({result['mode']}-loop, {result['connections']} connections)"
+    )
+    print(f"Requests/sec: {result['rps']:.2f}")
+    print(
+        f"Latency (ms): mean {latency['mean']:.2f}, p50 {latency['p50']:.2f}, "
+        f"p90 {latency['p90']:.2f}, p99 {latency['p99']:.2f}, p99.9 {latency['p99.9']:.2f}, "
+        f"max {latency['max']:.2f}"
+    )
+    if result["unsent"]:
+        print(
+            f"Unsent: {result['unsent']} scheduled requests (the server could not keep up with "
+            f"{result['rate']:.0f} req/s)"
+        )
+    if any(errors.values()):
+        print(
+            f"Errors: connect {errors['connect']}, read {errors['read']}, "
+            f"timeout {errors['timeout']}, non-2xx/3xx {errors['status']}"
+        )
+    client = result["client"]
+    if client["saturated"]:
+        print(
+            f"Warning: a load generator process used {100 * client['max_cpu']:.0f}% of a core, "
+            "the client may have limited the throughput (use more processes: -p, --cpus)"
+        )
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = arg_parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run a load test against a URL")
+    run_parser.add_argument("url")
+    run_parser.add_argument("-c", "--connections", type=int, default=10)
+    run_parser.add_argument("-d", "--duration", type=float, default=10.0, help="seconds")
+    run_parser.add_argument(
+        "-R", "--rate", type=float, default=None, help="total requests/sec (open-loop mode)"
+    )
+    run_parser.add_argument("-T", "--timeout", type=float, default=5.0, help="seconds")
+    run_parser.add_argument(
+        "-p", "--processes", type=int, default=1, help="number of event loop processes"
+    )
+    run_parser.add_argument(
+        "--cpus", type=parse_cpus, help="CPUs to pin the processes to (e.g. 0-3 or 0,2,4)"
+    )
+    run_parser.add_argument("-o", "--output", help="write the JSON results to this file")
+
+    saturate_parser = subparsers.add_parser(
+        "saturate", help="find the maximum request rate that meets a latency SLO"
+    )
+    saturate_parser.add_argument("url")
+    saturate_parser.add_argument("-c", "--connections", type=int, default=100)
+    saturate_parser.add_argument(
+        "-d", "--duration", type=float, default=10.0, help="seconds per probed rate"
+    )
+    saturate_parser.add_argument("--slo-p99", type=float, default=50.0, help="p99 latency (ms)")
+    saturate_parser.add_argument(
+        "--slo-errors", type=float, default=0.1, help="error rate (percent)"
+    )
+    saturate_parser.add_argument("--start-rate", type=float, default=100.0)
+    saturate_parser.add_argument("--max-rate", type=float, default=100000.0)
+    saturate_parser.add_argument(
+        "--precision", type=float, default=0.05, help="stop bisecting at this relative gap"
+    )
+    saturate_parser.add_argument("--max-probes", type=int, default=20)
+    saturate_parser.add_argument("-T", "--timeout", type=float, default=5.0, help="seconds")
+    saturate_parser.add_argument("-p", "--processes", type=int, default=1)
+    saturate_parser.add_argument(
+        "--cpus", type=parse_cpus, help="CPUs to pin the processes to (e.g. 0-3 or 0,2,4)"
+    )
+    saturate_parser.add_argument("-o", "--output", help="write the JSON results to this file")
+
+    sweep_parser = subparsers.add_parser(
+        "sweep", help="run closed-loop tests at a series of concurrency levels"
+    )
+    sweep_parser.add_argument("url")
+    sweep_parser.add_argument(
+        "-l",
+        "--levels",
+        default="1,2,4,8,16,32,64,128,256",
+        help="comma separated list of concurrency levels (connections)",
+    )
+    sweep_parser.add_argument(
+        "-d", "--duration", type=float, default=10.0, help="seconds per concurrency level"
+    )
+    sweep_parser.add_argument("-T", "--timeout", type=float, default=5.0, help="seconds")
+    sweep_parser.add_argument("-p", "--processes", type=int, default=1)
+    sweep_parser.add_argument(
+        "--cpus", type=parse_cpus, help="CPUs to pin the processes to (e.g. 0-3 or 0,2,4)"
+    )
+    sweep_parser.add_argument("-o", "--output", help="write the JSON results to this file")
+
+    payload_parser = subparsers.add_parser(
+        "payload", help="run closed-loop tests of the api endpoint at a series of row limits"
+    )
+    payload_parser.add_argument("url")
+    payload_parser.add_argument(
+        "-l",
+        "--limits",
+        default="1,10,100,all",
+        help="comma separated list of row limits (?limit=N, all: no limit)",
+    )
+    payload_parser.add_argument("-c", "--connections", type=int, default=10)
+    payload_parser.add_argument(
+        "-d", "--duration", type=float, default=10.0, help="seconds per row limit"
+    )
+    payload_parser.add_argument("-T", "--timeout", type=float, default=5.0, help="seconds")
+    payload_parser.add_argument("-p", "--processes", type=int, default=1)
+    payload_parser.add_argument(
+        "--cpus", type=parse_cpus, help="CPUs to pin the processes to (e.g. 0-3 or 0,2,4)"
+    )
+    payload_parser.add_argument("-o", "--output", help="write the JSON results to this file")
+
+    serve_parser = subparsers.add_parser("serve", help="run the local stand-in server")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument(
+        "--port", type=int, default=8090, help="default 8090 (nginx uses 8080 and 8081)"
+    )
+    serve_parser.add_argument(
+        "--delay", type=float, default=0.0, help="seconds added to every response"
+    )
+
+    args = arg_parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            asyncio.run(StandInServer(args.host, args.port, delay=args.delay).serve_forever())
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.command == "saturate":
+        print(f"Searching the maximum sustainable rate of {args.url}")
+        result = find_max_sustainable_rate(
+            args.url,
+            args.slo_p99,
+            args.slo_errors,
+            args.connections,
+            args.duration,
+            args.start_rate,
+            args.max_rate,
+            args.precision,
+            args.max_probes,
+            args.timeout,
+            args.processes,
+            cpus=args.cpus,
+        )
+        print(
+            f"Maximum sustainable rate: {result['max_sustainable_rate']:.0f} req/s "
+            f"(p99 < {args.slo_p99} ms, errors < {args.slo_errors}%)"
+        )
+    elif args.command == "sweep":
+        print(f"Concurrency sweep of {args.url}")
+        levels = [int(level) for level in args.levels.split(",")]
+        result = sweep_concurrency(
+            args.url, levels, args.duration, args.timeout, args.processes, cpus=args.cpus
+        )
+    elif args.command == "payload":
+        print(f"Payload sweep of {args.url}")
+        limits = [None if limit == "all" else int(limit) for limit in args.limits.split(",")]
+        result = sweep_payload(
+            args.url,
+            limits,
+            args.connections,
+            args.duration,
+            args.timeout,
+            args.processes,
+            cpus=args.cpus,
+        )
+    else:
+        result = run_load(
+            args.url,
+            args.connections,
+            args.duration,
+            args.rate,
+            args.timeout,
+            args.processes,
+            args.cpus,
+        )
+        print_summary(result)
+
+    # Same convention as the other tools: the options, without the URL and output file
+    argv = list(argv if argv is not None else sys.argv[1:])[1:]
+    for option in ("-o", "--output"):
+        if option in argv:
+            del argv[argv.index(option) : argv.index(option) + 2]
+    result["command_args"] = " ".join(arg for arg in argv if arg != args.url)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
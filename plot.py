@@ -4,38 +4,874 @@ Author: Bernhard Enders
 Date: 2024-02-17
 Modified by: bgeneto
 Date: 2024-02-19
+
+Subcommands (plot is the default):
+    parse    parse new or changed logs into the results index (and the run history)
+    summary  print or export the statistics per tool, benchmark and framework (CSV, JSON)
+    plot     parse, then write the HTML charts, the dashboard and statistics.csv
+    compare  compare the latest run of the run history with a baseline (see history.py)
+
+pandas and plotly are only imported by the plot subcommand.
+
+Usage:
+    python plot.py summary --tools wrk,k6 --format json -o summary.json
+    python plot.py plot --results /path/to/results --jobs 4
 """
 
+import argparse
+import calendar
+import contextlib
+import csv
+import gzip
 import json
+import math
 import os
 import re
-
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import sqlite3
+import string
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from histogram import LatencyHistogram
+from history import RunHistory, compare_runs, metric_values
+from hostnoise import host_path, summarize_host
+from resources import resources_path, summarize_resources
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Directory with the log files, where the charts are written (plot.py --results)
+output_dir = os.path.join(BASE_DIR, "results", "")
+
+
+def import_plotting():
+    """
+    Imports pandas and plotly, which take a good part of a second to import, for the plotters.
+    """
+    global pd, px, go, make_subplots
+    import pandas as pd
+    import plotly.express as px
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+
+# Latency percentiles reported for every tool (when the tool provides them)
+LATENCY_PERCENTILES = ("p50", "p90", "p99", "p99.9")
+
+
+def to_milliseconds(value):
+    """
+    Converts a wrk style duration (e.g. 980.00us, 1.23ms, 2.01s, 1.10m) to milliseconds.
+    """
+    units = {"us": 0.001, "ms": 1.0, "s": 1000.0, "m": 60000.0}
+    match = re.fullmatch(r"([\d.]+)(us|ms|s|m)", value.strip())
+    if match is None:
+        raise ValueError(f"Invalid duration: {value}")
+    return float(match.group(1)) * units[match.group(2)]
+
+
+def record_histogram(record):
+    """
+    Returns the LatencyHistogram (microseconds) stored in a record, or None if the tool has none.
+    """
+    data = record["metrics"].get("histogram")
+    return LatencyHistogram.from_dict(data) if data else None
+
+
+def merge_record_histograms(records):
+    """
+    Merges the latency histograms of several records (e.g. repeated runs) into one.
+    Records without a histogram are skipped; returns None if none of them has one.
+    """
+    merged = None
+    for record in records:
+        histogram = record_histogram(record)
+        if histogram is None:
+            continue
+        merged = histogram if merged is None else merged.merge(histogram)
+    return merged
+
+
+def wrk_counts(content):
+    """
+    Request and error counts of a wrk/wrk2 run: the completed requests and duration,
+    the socket errors and the non-2xx/3xx responses ("status").
+    """
+    counts = {"requests": 0, "duration_s": 0.0}
+    match = re.search(r"(\d+) requests in ([\d.]+\w+)", content)
+    if match:
+        counts["requests"] = int(match.group(1))
+        counts["duration_s"] = to_milliseconds(match.group(2)) / 1000
+    match = re.search(
+        r"Socket errors: connect (\d+), read (\d+), write (\d+), timeout (\d+)", content
+    )
+    for key, value in zip(("connect", "read", "write", "timeout"), match.groups() if match else ()):
+        counts[key] = int(value)
+    match = re.search(r"Non-2xx or 3xx responses: (\d+)", content)
+    counts["status"] = int(match.group(1)) if match else 0
+    return counts
+
+
+def goodput_fields(successful, attempts, goodput, errors):
+    """
+    Goodput (successful responses per second), error rate (% of the attempted requests that
+    failed) and error counts of a record.
+    """
+    return {
+        "goodput": goodput,
+        "error_rate": 100 * (attempts - successful) / attempts if attempts else 0.0,
+        "errors": errors,
+    }
+
+
+def wrk_goodput_fields(counts):
+    # socket errors are requests that never completed, non-2xx/3xx responses did complete
+    errors = {key: value for key, value in counts.items() if key not in ("requests", "duration_s")}
+    successful = counts["requests"] - errors["status"]
+    attempts = counts["requests"] + sum(
+        errors.get(key, 0) for key in ("connect", "read", "write", "timeout")
+    )
+    goodput = successful / counts["duration_s"] if counts["duration_s"] else None
+    return goodput_fields(successful, attempts, goodput, errors)
 
 
 class LogParser:
+    """
+    Parses an h2load log: the totals ("finished in", requests, status codes and traffic) and the
+    min/max/mean/sd table of the request, connect and first byte times (converted to ms).
+    """
+
+    # h2load table row -> timings key
+    TIMINGS = {
+        "time for request": "request",
+        "time for connect": "connect",
+        "time to 1st byte": "ttfb",
+        "req/s": "client_rps",
+    }
+
     def __init__(self, filename):
         self.filename = filename
 
+    def parse_timing(self, name, values):
+        fields = values.split()
+        if len(fields) != 5:
+            raise ValueError(f"Invalid h2load {name} line in log file: {self.filename}")
+        convert = float if name == "client_rps" else to_milliseconds
+        return {
+            "min": convert(fields[0]),
+            "max": convert(fields[1]),
+            "mean": convert(fields[2]),
+            "sd": convert(fields[3]),
+            "within_sd": float(fields[4].rstrip("%")),
+        }
+
     def parse_logfile(self):
         """
-        Parses a log file and retrieves the requests per second value.
+        Parses a log file and retrieves the requests per second value and the detailed results.
         """
+        details = {"timings": {}}
+        command_args = None
         with open(self.filename, "r") as f:
-            c = 0
             for line in f:
-                c += 1
-                # check if is the first line of the log file
-                if c == 1:
+                # the first line of the log file stores the command line options/args
+                if command_args is None:
                     command_args = line.strip()
-                if "finished in" in line:
-                    # Extract requests per second value
-                    req_per_sec = float(line.split(", ")[1].split("req/s")[0])
-                    return req_per_sec, command_args
-        raise ValueError(f"Could not find relevant data in log file: {self.filename}")
+                    continue
+                line = line.strip()
+                if line.startswith("finished in"):
+                    # finished in 10.00s, 12345.60 req/s, 1.23MB/s
+                    match = re.match(r"finished in ([\d.]+\w+), ([\d.]+) req/s", line)
+                    details["duration_s"] = to_milliseconds(match.group(1)) / 1000
+                    details["rps"] = float(match.group(2))
+                elif line.startswith("requests:"):
+                    # requests: 100 total, 100 started, 100 done, 99 succeeded, 1 failed, ...
+                    details["requests"] = {
+                        key: int(count) for count, key in re.findall(r"(\d+) (\w+)", line)
+                    }
+                elif line.startswith("status codes:"):
+                    details["status_codes"] = {
+                        key: int(count) for count, key in re.findall(r"(\d+) (\dxx)", line)
+                    }
+                elif line.startswith("traffic:"):
+                    # traffic: 1.23MB (1289472) total, 0.12MB (129472) headers
+                    # (space savings 93.12%), 1.01MB (1060000) data
+                    match = re.search(
+                        r"\((\d+)\) total, .*?\((\d+)\) headers"
+                        r" \(space savings ([\d.]+)%\), .*?\((\d+)\) data",
+                        line,
+                    )
+                    if match:
+                        details["traffic"] = {
+                            "total_bytes": int(match.group(1)),
+                            "header_bytes": int(match.group(2)),
+                            "header_space_savings": float(match.group(3)),
+                            "data_bytes": int(match.group(4)),
+                        }
+                else:
+                    name, separator, values = line.partition(":")
+                    if separator and name.strip() in self.TIMINGS:
+                        key = self.TIMINGS[name.strip()]
+                        details["timings"][key] = self.parse_timing(key, values)
+
+        if "rps" not in details:
+            raise ValueError(f"Could not find relevant data in log file: {self.filename}")
+        return details["rps"], details, command_args
+
+
+class WrkLogParser:
+    def __init__(self, filename):
+        self.filename = filename
+
+    def parse_logfile(self):
+        """
+        Parses a wrk log file and retrieves the average latency (ms), requests per second,
+        the latency distribution percentiles (ms) and the request/error counts.
+        """
+        # Regular expression patterns to extract data
+        latency_pattern = re.compile(r"Latency\s+(\d+\.\d+(?:us|ms|s|m))")
+        req_sec_pattern = re.compile(r"Req/Sec\s+(\d+\.\d+k?)?")
+        # "Latency Distribution" lines, only present when wrk runs with --latency
+        distribution_pattern = re.compile(r"^\s+(50|75|90|99)%\s+(\S+)$", re.MULTILINE)
+
+        with open(self.filename, "r", encoding="utf-8") as file:
+            content = file.read()
+
+        # The first line of the file contains the wrk command used
+        command_args = content.split("\n")[0]
+        # Extract the average latency and requests per second
+        latency_match = latency_pattern.search(content)
+        req_sec_match = req_sec_pattern.search(content)
+        if latency_match is None or req_sec_match is None:
+            raise ValueError(f"Could not find relevant data in log file: {self.filename}")
+        avg_latency = latency_match.group(1)
+        avg_req_sec = req_sec_match.group(1)
+        # Convert avg_req_sec to requests/sec if the value ends with 'k'
+        if "k" in str(avg_req_sec):
+            avg_req_sec = float(avg_req_sec.replace("k", "")) * 1000
+        else:
+            avg_req_sec = float(avg_req_sec)
+        avg_latency = to_milliseconds(avg_latency)
+        percentiles = {
+            f"p{p}": to_milliseconds(value)
+            for p, value in distribution_pattern.findall(content)
+        }
+        return avg_latency, avg_req_sec, percentiles, wrk_counts(content), command_args
+
+
+class Wrk2LogParser:
+    # HdrHistogram summary lines, e.g. "#[Mean    =        1.052, StdDeviation   =        0.380]"
+    summary_pattern = re.compile(r"([A-Za-z][A-Za-z ]*?)\s*=\s*([-+\d.eE]+)")
+    summary_keys = {
+        "Mean": "mean",
+        "StdDeviation": "stdev",
+        "Max": "max",
+        "Total count": "total_count",
+        "Buckets": "buckets",
+        "SubBuckets": "sub_buckets",
+    }
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def parse_logfile(self):
+        """
+        Parses a wrk2 log file in a single streaming pass.
+        Returns the "Detailed Percentile spectrum" as NumPy arrays (latency, percentile, total count),
+        the HdrHistogram summary values, the requests per second, the request/error counts
+        and the command line args.
+        """
+        spectrum_lines = []
+        summary = {}
+        req_per_sec = None
+        counts_lines = []
+        in_spectrum = False
+        with open(self.filename, "r") as f:
+            # The first line of the file contains the wrk2 command used
+            command_args = f.readline().strip()
+            for line in f:
+                if in_spectrum:
+                    if line.startswith("#["):
+                        for key, value in self.summary_pattern.findall(line):
+                            if key in self.summary_keys:
+                                summary[self.summary_keys[key]] = float(value)
+                    elif line.startswith("---"):
+                        in_spectrum = False
+                    elif line[:13].strip()[:1].isdigit():
+                        # Value, Percentile, TotalCount, 1/(1-Percentile)
+                        spectrum_lines.append(line)
+                elif "Detailed Percentile spectrum" in line:
+                    in_spectrum = True
+                elif line.startswith("Requests/sec:"):
+                    req_per_sec = float(line.split()[1])
+                elif "requests in" in line or "Socket errors" in line or "Non-2xx" in line:
+                    counts_lines.append(line)
+
+        if not spectrum_lines:
+            raise ValueError(f"Could not find relevant data in log file: {self.filename}")
+
+        # Convert the whole block at once ("inf" in the last column parses as a float)
+        spectrum = np.array(" ".join(spectrum_lines).split(), dtype=float).reshape(-1, 4)
+        latencies = spectrum[:, 0]
+        percentiles = spectrum[:, 1]
+        total_counts = spectrum[:, 2].astype(np.int64)
+        counts = wrk_counts("".join(counts_lines))
+        return latencies, percentiles, total_counts, summary, req_per_sec, counts, command_args
+
+
+class K6DataExtractor:
+    def __init__(self, filename):
+        self.filename = filename
+
+    def extract_k6_data(self):
+        """Extracts avg, rate, checks, percentiles and failed requests data from a log file"""
+
+        with open(self.filename, "r") as f:
+            log_data = json.load(f)
+
+        try:
+            duration = log_data["metrics"]["http_req_duration{expected_response:true}"]
+            avg_duration = duration["avg"]
+            req_rate = log_data["metrics"]["http_reqs"]["rate"]
+            checks_perc_value = log_data["metrics"]["checks"]["value"]
+            vus_max = log_data["metrics"]["vus_max"]["value"]
+        except KeyError:
+            print(f"Error: Could not find relevant data in log file: {self.filename}")
+            return None, None, None, None, None, None
+
+        # http_req_failed "passes" are the failed requests (network errors, non 2xx/3xx)
+        requests = log_data["metrics"]["http_reqs"].get("count", 0)
+        failed = log_data["metrics"].get("http_req_failed", {}).get("passes", 0)
+        counts = {"requests": requests, "failed": failed}
+
+        # p(99) and p(99.9) are only exported when listed in summaryTrendStats
+        percentiles = {
+            key: duration[stat]
+            for key, stat in zip(LATENCY_PERCENTILES, ("med", "p(90)", "p(99)", "p(99.9)"))
+            if stat in duration
+        }
+        return avg_duration, req_rate, checks_perc_value, vus_max, percentiles, counts
+
+    def extract_endpoints(self):
+        """
+        Extracts the per endpoint sub-metrics of the summary (requests tagged with endpoint:<name>
+        by k6/script.template.js): request share and rate, goodput, error rate and latency.
+        """
+        with open(self.filename, "r") as f:
+            metrics = json.load(f).get("metrics", {})
+
+        endpoints = {}
+        for key, values in metrics.items():
+            if key.startswith("http_reqs{endpoint:"):
+                endpoints[key[len("http_reqs{endpoint:") : -1]] = values
+        total = sum(values.get("count", 0) for values in endpoints.values())
+        result = {}
+        for name, values in endpoints.items():
+            requests = values.get("count", 0)
+            failed = metrics.get(f"http_req_failed{{endpoint:{name}}}", {}).get("passes", 0)
+            duration = metrics.get(f"http_req_duration{{endpoint:{name}}}", {})
+            result[name] = {
+                "requests": requests,
+                "share": 100 * requests / total if total else 0.0,
+                "rps": values.get("rate", 0.0),
+                "goodput": values.get("rate", 0.0) * (requests - failed) / requests
+                if requests
+                else 0.0,
+                "error_rate": 100 * failed / requests if requests else 0.0,
+                "avg": duration.get("avg"),
+                "p95": duration.get("p(95)"),
+                "p99": duration.get("p(99)"),
+            }
+        return result
+
+
+def k6_points_path(log_path):
+    """
+    k6 point output (--out json) of a run: laravel.bench.api.k6.log -> laravel.bench.api.k6.points.jsonl.gz
+    """
+    return log_path[: -len(".log")] + ".points.jsonl.gz"
+
+
+class K6StreamAggregator:
+    """
+    Reads k6's NDJSON point output line by line into one second windows (request rate,
+    p50/p95/p99 latency, error rate and active VUs). k6 flushes its points about once per
+    second and slightly out of order, so only the last few windows are kept open and memory
+    stays constant whatever the size of the file.
+    """
+
+    # only these metrics are decoded, the other lines are skipped before json.loads
+    METRICS = (b'"http_req_duration"', b'"http_req_failed"', b'"vus"')
+
+    NAMES = ("http_req_duration", "http_req_failed", "vus")
+
+    def __init__(self, filename, lag=5):
+        self.filename = filename
+        self.lag = lag
+
+    @staticmethod
+    def new_window():
+        # 2 significant digits and up to 60 s keep each window's histogram small
+        return {
+            "histogram": LatencyHistogram(highest=60_000_000, significant_digits=2),
+            "failed": 0,
+            "checked": 0,
+            "vus": 0,
+        }
+
+    @staticmethod
+    def summarize(t, window):
+        histogram = window["histogram"]
+        percentiles = histogram.percentiles((50, 95, 99))
+        return {
+            "t": t,
+            "rps": histogram.total_count,
+            "p50": percentiles["p50"] / 1000,
+            "p95": percentiles["p95"] / 1000,
+            "p99": percentiles["p99"] / 1000,
+            "mean": histogram.mean() / 1000,
+            "error_rate": 100 * window["failed"] / window["checked"] if window["checked"] else 0.0,
+            "vus": window["vus"],
+        }
+
+    def aggregate(self):
+        """
+        Returns the per second windows [{"t": seconds since the first point, "rps", ...}].
+        """
+        opener = gzip.open if self.filename.endswith(".gz") else open
+        windows = {}
+        series = []
+        start = None
+        closed = None
+        last_prefix = last_second = None
+        with opener(self.filename, "rb") as f:
+            for line in f:
+                if not any(metric in line for metric in self.METRICS):
+                    continue
+                point = json.loads(line)
+                if point.get("type") != "Point" or point["metric"] not in self.NAMES:
+                    continue
+                data = point["data"]
+                # "2024-02-17T10:00:00.123456789-03:00": the second is all we need, and
+                # consecutive points mostly share it
+                prefix = data["time"][:19]
+                if prefix != last_prefix:
+                    last_prefix = prefix
+                    last_second = calendar.timegm(time.strptime(prefix, "%Y-%m-%dT%H:%M:%S"))
+                second = last_second
+                if start is None:
+                    start = second
+                if closed is not None and second <= closed:
+                    # too late for its own window, count it in the oldest open one
+                    second = closed + 1
+                window = windows.get(second)
+                if window is None:
+                    # close the windows that can no longer receive points
+                    for old in sorted(s for s in windows if s < second - self.lag):
+                        series.append(self.summarize(old - start, windows.pop(old)))
+                        closed = old
+                    window = windows[second] = self.new_window()
+
+                metric = point["metric"]
+                if metric == "http_req_duration":
+                    window["histogram"].record(round(data["value"] * 1000))
+                elif metric == "http_req_failed":
+                    window["failed"] += data["value"]
+                    window["checked"] += 1
+                elif metric == "vus":
+                    window["vus"] = max(window["vus"], data["value"])
+
+        for old in sorted(windows):
+            series.append(self.summarize(old - start, windows[old]))
+        return series
+
+
+class LoadgenLogParser:
+    def __init__(self, filename):
+        self.filename = filename
+
+    def parse_logfile(self, tool="loadgen"):
+        """
+        Reads a JSON results file written by loadgen.py or coldstart.py (tool: loadgen,
+        saturation, sweep, payload or coldstart).
+        """
+        with open(self.filename, "r") as f:
+            log_data = json.load(f)
+        if log_data.get("tool") != tool:
+            raise ValueError(f"Could not find relevant data in log file: {self.filename}")
+        return log_data
+
+
+MATRIX_TAG = re.compile(r"w(\d+)c(\d+)")
+
+
+def parse_result_file(path):
+    """
+    Parses a single benchmark log file into a normalized record (a plain dict).
+    The tool is taken from the file name suffix (e.g. laravel.bench.api.wrk.log).
+    """
+    filename = os.path.basename(path)
+    tool = filename.split(".")[-2]
+    framework_name, benchmark_name = FilenameExtractor(
+        filename
+    ).extract_info_from_filename()
+    record = {
+        "path": path,
+        "tool": tool,
+        "framework": framework_name,
+        "benchmark": benchmark_name,
+        "command_args": "",
+        "rps": None,
+        "latency_ms": None,
+        "latency_percentiles": {},
+        "metrics": {},
+        "goodput": None,
+        "error_rate": None,
+        "errors": {},
+        "resources": None,
+        "quality": None,
+        "steady_state": None,
+        "error": None,
+    }
+    tags = FilenameExtractor(filename).extract_tags()
+    trials = [int(tag) for tag in tags if tag.isdigit()]
+    record["trial"] = trials[0] if trials else None
+    # php-fpm workers/cores point of runner.py --matrix (w<workers>c<cores> tag)
+    points = [match for match in map(MATRIX_TAG.fullmatch, tags) if match]
+    record["matrix"] = (
+        {"workers": int(points[0].group(1)), "cores": int(points[0].group(2))} if points else None
+    )
+    try:
+        if tool == "h2load":
+            rps, details, command_args = LogParser(path).parse_logfile()
+            record.update(rps=rps, command_args=command_args)
+            if "request" in details["timings"]:
+                record["latency_ms"] = details["timings"]["request"]["mean"]
+            # h1 or h2c, from the file name tag of the protocol mode or the --h1 option
+            protocols = [tag for tag in tags if tag in ("h1", "h2c")]
+            details["protocol"] = protocols[0] if protocols else (
+                "h1" if "--h1" in command_args.split() else "h2c"
+            )
+            record["metrics"] = details
+            requests = details.get("requests", {})
+            status_codes = details.get("status_codes", {})
+            # h2load counts 2xx and 3xx responses as succeeded, failed includes the rest
+            record.update(
+                goodput_fields(
+                    requests.get("succeeded", 0),
+                    requests.get("done", 0),
+                    rps * requests["succeeded"] / requests["done"] if requests.get("done") else None,
+                    {
+                        "failed": requests.get("failed", 0),
+                        "errored": requests.get("errored", 0),
+                        "timeout": requests.get("timeout", 0),
+                        "status": status_codes.get("4xx", 0) + status_codes.get("5xx", 0),
+                    },
+                )
+            )
+        elif tool == "wrk":
+            latency, rps, percentiles, counts, command_args = WrkLogParser(path).parse_logfile()
+            record.update(rps=rps, latency_ms=latency, command_args=command_args)
+            record.update(wrk_goodput_fields(counts))
+            record["latency_percentiles"] = {
+                p: percentiles[p] for p in LATENCY_PERCENTILES if p in percentiles
+            }
+        elif tool == "wrk2":
+            (
+                latencies,
+                percentiles,
+                total_counts,
+                summary,
+                rps,
+                counts,
+                command_args,
+            ) = Wrk2LogParser(path).parse_logfile()
+            record.update(rps=rps, latency_ms=summary.get("mean"), command_args=command_args)
+            record.update(wrk_goodput_fields(counts))
+            histogram = LatencyHistogram.from_wrk2_spectrum(latencies, total_counts)
+            record["latency_percentiles"] = {
+                p: value / 1000 for p, value in histogram.percentiles().items()
+            }
+            record["metrics"] = {
+                "percentiles": percentiles.tolist(),
+                "latencies": latencies.tolist(),
+                "total_counts": total_counts.tolist(),
+                "summary": summary,
+                "histogram": histogram.to_dict(),
+            }
+        elif tool == "k6":
+            (
+                avg_duration,
+                req_rate,
+                checks_perc_value,
+                vus_max,
+                percentiles,
+                counts,
+            ) = K6DataExtractor(path).extract_k6_data()
+            if avg_duration is None or req_rate is None:
+                raise ValueError(f"Could not find relevant data in log file: {path}")
+            record.update(rps=req_rate, latency_ms=avg_duration)
+            successful = counts["requests"] - counts["failed"]
+            record.update(
+                goodput_fields(
+                    successful,
+                    counts["requests"],
+                    req_rate * successful / counts["requests"] if counts["requests"] else None,
+                    {"failed": counts["failed"]},
+                )
+            )
+            record["latency_percentiles"] = percentiles
+            record["metrics"] = {
+                "checks": checks_perc_value,
+                "vus_max": vus_max,
+                "endpoints": K6DataExtractor(path).extract_endpoints(),
+            }
+            if os.path.exists(k6_points_path(path)):
+                record["metrics"]["series"] = K6StreamAggregator(k6_points_path(path)).aggregate()
+        elif tool == "loadgen":
+            log_data = LoadgenLogParser(path).parse_logfile()
+            record.update(
+                rps=log_data["rps"],
+                latency_ms=log_data["latency_ms"]["mean"],
+                command_args=log_data.get("command_args", ""),
+            )
+            record["latency_percentiles"] = {
+                p: log_data["latency_ms"][p] for p in LATENCY_PERCENTILES
+            }
+            errors = log_data["errors"]
+            successful = log_data["requests"] - errors["status"]
+            record.update(
+                goodput_fields(
+                    successful,
+                    log_data["requests"] + errors["connect"] + errors["read"] + errors["timeout"],
+                    successful / log_data["elapsed"] if log_data["elapsed"] else None,
+                    errors,
+                )
+            )
+            record["metrics"] = {
+                "mode": log_data["mode"],
+                "requests": log_data["requests"],
+                "errors": log_data["errors"],
+                "latency_ms": log_data["latency_ms"],
+                "histogram": log_data["histogram"],
+                "series": log_data.get("series", []),
+                "server_timing": log_data.get("server_timing", {}),
+                "client": log_data.get("client"),
+            }
+        elif tool == "saturation":
+            log_data = LoadgenLogParser(path).parse_logfile(tool)
+            record.update(
+                rps=log_data["max_sustainable_rps"],
+                command_args=log_data.get("command_args", ""),
+            )
+            record["metrics"] = {
+                "max_sustainable_rate": log_data["max_sustainable_rate"],
+                "slo": log_data["slo"],
+                "probes": log_data["probes"],
+            }
+        elif tool == "sweep":
+            log_data = LoadgenLogParser(path).parse_logfile(tool)
+            record.update(
+                rps=max(level["rps"] for level in log_data["levels"]),
+                command_args=log_data.get("command_args", ""),
+            )
+            record["metrics"] = {"levels": log_data["levels"]}
+        elif tool == "payload":
+            log_data = LoadgenLogParser(path).parse_logfile(tool)
+            levels = log_data["levels"]
+            # the full table is the payload of the plain api benchmark
+            full = next((level for level in levels if level["limit"] == "all"), levels[-1])
+            record.update(
+                rps=full["rps"],
+                latency_ms=full["latency_ms"]["mean"],
+                goodput=full["goodput"],
+                error_rate=full["error_rate"],
+                command_args=log_data.get("command_args", ""),
+            )
+            model = PayloadCostModel(
+                [level["rows"] for level in levels], [level["goodput"] for level in levels]
+            ).fit()
+            record["metrics"] = {
+                "connections": log_data["connections"],
+                "levels": levels,
+                "cost": {"fixed_ms": model.fixed_ms, "per_row_us": model.per_row_us},
+            }
+        elif tool == "coldstart":
+            log_data = LoadgenLogParser(path).parse_logfile(tool)
+            record.update(
+                latency_ms=log_data["time_to_first_ok_ms"],
+                command_args=log_data.get("command_args", ""),
+            )
+            record["metrics"] = {"reset": log_data["reset"], "runs": log_data["runs"]}
+        # wrk and h2load only report totals, warm-up is detected on per second series
+        if record["metrics"].get("series"):
+            record["steady_state"] = steady_state(record["metrics"]["series"])
+    except (OSError, ValueError, IndexError) as e:
+        record["error"] = str(e)
+
+    # server side CPU/memory sampled by runner.py while the tool ran
+    if os.path.exists(resources_path(path)):
+        try:
+            record["resources"] = summarize_resources(resources_path(path))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: could not summarize {resources_path(path)}: {e}")
+    # host noise sampled by runner.py before and during the run
+    if os.path.exists(host_path(path)):
+        try:
+            record["quality"] = summarize_host(host_path(path))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: could not summarize {host_path(path)}: {e}")
+    return record
+
+
+class ResultsIndex:
+    """
+    Scans the results directory once and keeps every parsed log as a normalized record.
+    Parsed records are cached in a SQLite file keyed by path, size and mtime,
+    so only new or changed log files are parsed again on the next run.
+    """
+
+    # bump whenever the record layout produced by parse_result_file changes
+    PARSER_VERSION = 16
+    TOOLS = (
+        "h2load",
+        "wrk",
+        "wrk2",
+        "k6",
+        "loadgen",
+        "saturation",
+        "sweep",
+        "payload",
+        "coldstart",
+    )
+
+    def __init__(self, results_dir, cache_file=None, tools=None):
+        self.results_dir = results_dir
+        self.cache_file = cache_file or os.path.join(results_dir, ".results-index.sqlite3")
+        # only the logs of these tools are scanned (plot.py --tools)
+        self.tools = tuple(tools) if tools else self.TOOLS
+        self._records = {}
+
+    def _connect(self):
+        conn = sqlite3.connect(self.cache_file)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime REAL, record TEXT)"
+        )
+        row = conn.execute("SELECT value FROM meta WHERE key = 'parser_version'").fetchone()
+        if row is None or int(row[0]) != self.PARSER_VERSION:
+            # cached records were produced by another parser version, start over
+            conn.execute("DELETE FROM records")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('parser_version', ?)",
+                (str(self.PARSER_VERSION),),
+            )
+        return conn
+
+    def scan(self):
+        """
+        Lists all log files in the results directory with their size and mtime.
+        """
+        files = {}
+        for entry in os.scandir(self.results_dir):
+            if not entry.is_file():
+                continue
+            parts = entry.name.split(".")
+            if len(parts) < 5 or parts[-1] != "log" or parts[-2] not in self.tools:
+                continue
+            stat = entry.stat()
+            mtime = stat.st_mtime
+            # a changed side file (resources, host, k6 points) also invalidates the cached record
+            for side_file in (
+                resources_path(entry.path),
+                host_path(entry.path),
+                k6_points_path(entry.path),
+            ):
+                if os.path.exists(side_file):
+                    mtime = max(mtime, os.stat(side_file).st_mtime)
+            files[entry.path] = (stat.st_size, mtime)
+        return files
+
+    def parse_files(self, paths, jobs=1):
+        """
+        Parses log files into records, fanning them out across a process pool when jobs > 1.
+        Falls back to serial parsing if the pool cannot be used.
+        """
+        if jobs > 1 and len(paths) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as executor:
+                    # hand out files in chunks to keep the IPC overhead low
+                    chunksize = max(1, len(paths) // (jobs * 4))
+                    return list(executor.map(parse_result_file, paths, chunksize=chunksize))
+            except (OSError, BrokenProcessPool) as e:
+                print(f"Warning: parallel parsing failed ({e}), parsing serially.")
+        return [parse_result_file(path) for path in paths]
+
+    def refresh(self, jobs=1):
+        """
+        Synchronizes the in-memory table with the results directory,
+        parsing only the files that are not (or no longer) in the cache.
+        """
+        files = self.scan()
+        conn = self._connect()
+        try:
+            cached = {
+                path: (size, mtime, record)
+                for path, size, mtime, record in conn.execute(
+                    "SELECT path, size, mtime, record FROM records"
+                )
+            }
+            stale = []
+            self._records = {}
+            for path, (size, mtime) in files.items():
+                entry = cached.get(path)
+                if entry is not None and entry[0] == size and entry[1] == mtime:
+                    self._records[path] = json.loads(entry[2])
+                else:
+                    stale.append(path)
+
+            for path, record in zip(stale, self.parse_files(stale, jobs)):
+                if record["error"]:
+                    print(f"Error: {record['error']}")
+                self._records[path] = record
+                size, mtime = files[path]
+                conn.execute(
+                    "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?)",
+                    (path, size, mtime, json.dumps(record)),
+                )
+
+            # forget log files that were removed from the results directory
+            removed = [
+                path
+                for path in cached
+                if path not in files and os.path.basename(path).split(".")[-2] in self.tools
+            ]
+            conn.executemany("DELETE FROM records WHERE path = ?", [(p,) for p in removed])
+            conn.commit()
+        finally:
+            conn.close()
+
+        print(
+            f"Results index: {len(files)} log files, {len(stale)} parsed, "
+            f"{len(files) - len(stale)} from cache"
+        )
+        return self
+
+    def records(self, tool=None, matrix=False):
+        """
+        Returns the successfully parsed records, optionally filtered by tool, in file name order.
+        The runs of the php-fpm workers/cores matrix are only returned with matrix=True.
+        """
+        return [
+            record
+            for path, record in sorted(self._records.items())
+            if record["error"] is None
+            and (tool is None or record["tool"] == tool)
+            and (record["matrix"] is not None) == matrix
+        ]
 
 
 class FilenameExtractor:
@@ -54,6 +890,14 @@ class FilenameExtractor:
 
         return framework_name, benchmark_name
 
+    def extract_tags(self):
+        """
+        Returns the optional tags between the benchmark and the tool name,
+        e.g. ["3"] for laravel.bench.api.3.wrk.log (trial number of a repeated run).
+        """
+        parts = os.path.basename(self.filename).split(".")
+        return parts[3:-2]
+
 
 class FileCounter:
     def __init__(self, directory, skip_dirs=None):
@@ -92,6 +936,630 @@ class PercentageCalculator:
         return percentages
 
 
+class StatisticsCalculator:
+    def __init__(self, values, confidence=0.95, resamples=10000, seed=0):
+        self.values = np.asarray(values, dtype=float)
+        self.confidence = confidence
+        self.resamples = resamples
+        self.seed = seed
+
+    def median(self):
+        return float(np.median(self.values))
+
+    def confidence_interval(self):
+        """
+        Percentile bootstrap confidence interval of the median.
+        """
+        if len(self.values) < 2:
+            return self.median(), self.median()
+        rng = np.random.default_rng(self.seed)
+        samples = rng.choice(self.values, size=(self.resamples, len(self.values)))
+        medians = np.median(samples, axis=1)
+        alpha = (1 - self.confidence) / 2
+        low, high = np.quantile(medians, [alpha, 1 - alpha])
+        return float(low), float(high)
+
+    @staticmethod
+    def mann_whitney(a, b):
+        """
+        Two-sided Mann-Whitney U test. Uses the exact U distribution for small samples without
+        ties and the normal approximation (tie and continuity corrected) otherwise.
+        Returns (U, p-value).
+        """
+        a = np.asarray(a, dtype=float)
+        b = np.asarray(b, dtype=float)
+        n1, n2 = len(a), len(b)
+        if n1 == 0 or n2 == 0:
+            return float("nan"), 1.0
+        combined = np.concatenate([a, b])
+        # average ranks (ties get the mean of their ranks)
+        order = combined.argsort(kind="mergesort")
+        ranks = np.empty(len(combined))
+        sorted_values = combined[order]
+        i = 0
+        while i < len(combined):
+            j = i
+            while j + 1 < len(combined) and sorted_values[j + 1] == sorted_values[i]:
+                j += 1
+            ranks[order[i : j + 1]] = (i + j) / 2 + 1
+            i = j + 1
+        u1 = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+        u = min(u1, n1 * n2 - u1)
+        _, tie_counts = np.unique(combined, return_counts=True)
+        has_ties = bool((tie_counts > 1).any())
+
+        if not has_ties and n1 + n2 <= 30:
+            # exact distribution: number of arrangements with U = k, built up sample by sample
+            counts = np.zeros((n1 + 1, n2 + 1, n1 * n2 + 1))
+            counts[0, :, 0] = 1
+            counts[:, 0, 0] = 1
+            for i in range(1, n1 + 1):
+                for j in range(1, n2 + 1):
+                    counts[i, j, j:] += counts[i - 1, j, : n1 * n2 + 1 - j]
+                    counts[i, j] += counts[i, j - 1]
+            distribution = counts[n1, n2]
+            p = 2 * distribution[: int(u) + 1].sum() / distribution.sum()
+            return float(u), float(min(1.0, p))
+
+        n = n1 + n2
+        mean = n1 * n2 / 2
+        tie_term = ((tie_counts**3 - tie_counts).sum()) / (n * (n - 1))
+        sd = np.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term))
+        if sd == 0:
+            return float(u), 1.0
+        z = (mean - u - 0.5) / sd
+        p = math.erfc(max(z, 0) / math.sqrt(2))
+        return float(u), float(min(1.0, p))
+
+
+class FrameworkComparator:
+    def __init__(self, values_by_framework, higher_is_better=True, alpha=0.05):
+        self.values_by_framework = values_by_framework
+        self.higher_is_better = higher_is_better
+        self.alpha = alpha
+
+    def compare(self):
+        """
+        Returns one row per framework, best first: number of trials, median, bootstrap
+        confidence interval, and the Mann-Whitney p-value against the best framework.
+        A framework whose difference to the best is not significant gets "significant": False.
+        """
+        rows = []
+        for framework, values in self.values_by_framework.items():
+            calculator = StatisticsCalculator(values)
+            low, high = calculator.confidence_interval()
+            rows.append(
+                {
+                    "framework": framework,
+                    "n": len(values),
+                    "median": calculator.median(),
+                    "ci_low": low,
+                    "ci_high": high,
+                }
+            )
+        rows.sort(key=lambda row: row["median"], reverse=self.higher_is_better)
+        if not rows:
+            return rows
+
+        best = rows[0]["framework"]
+        for row in rows:
+            if row["framework"] == best or row["n"] < 2 or len(self.values_by_framework[best]) < 2:
+                row["p_vs_best"] = None
+                row["significant"] = None
+                continue
+            _, p = StatisticsCalculator.mann_whitney(
+                self.values_by_framework[row["framework"]], self.values_by_framework[best]
+            )
+            row["p_vs_best"] = p
+            row["significant"] = p < self.alpha
+        return rows
+
+    def pairwise(self):
+        """
+        Returns the Mann-Whitney p-value for every pair of frameworks.
+        """
+        frameworks = sorted(self.values_by_framework)
+        return {
+            (a, b): StatisticsCalculator.mann_whitney(
+                self.values_by_framework[a], self.values_by_framework[b]
+            )[1]
+            for i, a in enumerate(frameworks)
+            for b in frameworks[i + 1 :]
+        }
+
+
+def record_variant(record):
+    """
+    Variant of a record that must not be mixed with the others of its benchmark: the h2load
+    protocol (h1, h2c) of runner.py --protocols, "" for the other tools (see history.normalize).
+    """
+    return record["metrics"].get("protocol") or ""
+
+
+def benchmark_label(record):
+    """
+    Benchmark name of a record with its variant: "hello (h2c)" for h2load, "hello" otherwise.
+    """
+    variant = record_variant(record)
+    return f"{record['benchmark']} ({variant})" if variant else record["benchmark"]
+
+
+def command_args_text(tool, records):
+    """
+    Command line of a tool's runs for a chart title, one per protocol if there are several
+    ("h1: h2load --h1 -c 100 | h2c: h2load -c 100").
+    """
+    commands = {record_variant(r): f"{tool} {r['command_args']}" for r in records}
+    if len(commands) <= 1:
+        return next(iter(commands.values()), tool)
+    return " | ".join(f"{variant}: {command}" for variant, command in sorted(commands.items()))
+
+
+def group_trials(records, value, key=None):
+    """
+    Groups the records by benchmark and framework: {benchmark: {framework: [values of all trials]}}.
+    value is a function extracting the metric from a record, key the benchmark of a record
+    (default: its benchmark name, e.g. benchmark_label to keep the h2load protocols apart).
+    """
+    grouped = {}
+    for record in records:
+        metric = value(record)
+        if metric is None:
+            continue
+        benchmark = grouped.setdefault(key(record) if key else record["benchmark"], {})
+        benchmark.setdefault(record["framework"], []).append(metric)
+    return grouped
+
+
+def combined_percentiles(records):
+    """
+    Latency percentiles (ms) of repeated runs: exact percentiles of the merged histograms
+    when the tool records one, otherwise the median of each run's percentile.
+    """
+    histogram = merge_record_histograms(records)
+    if histogram is not None:
+        return {p: value / 1000 for p, value in histogram.percentiles().items()}
+    combined = {}
+    for percentile in LATENCY_PERCENTILES:
+        values = [
+            r["latency_percentiles"][percentile]
+            for r in records
+            if percentile in r["latency_percentiles"]
+        ]
+        if values:
+            combined[percentile] = float(np.median(values))
+    return combined
+
+
+def error_bars(rows):
+    """
+    Plotly error_y for FrameworkComparator rows (bootstrap CI around the median).
+    """
+    return dict(
+        type="data",
+        symmetric=False,
+        array=[row["ci_high"] - row["median"] for row in rows],
+        arrayminus=[row["median"] - row["ci_low"] for row in rows],
+        visible=any(row["n"] > 1 for row in rows),
+    )
+
+
+# Color of every framework, assigned on first use, so a framework has the same color in all charts
+FRAMEWORK_COLORS = {}
+
+
+def framework_color(framework):
+    palette = px.colors.qualitative.Plotly
+    key = framework.lower()
+    if key not in FRAMEWORK_COLORS:
+        FRAMEWORK_COLORS[key] = palette[len(FRAMEWORK_COLORS) % len(palette)]
+    return FRAMEWORK_COLORS[key]
+
+
+def comparison_bar(rows, text, **kwargs):
+    """
+    A single bar trace for the FrameworkComparator rows of a chart (medians with confidence
+    intervals, colored per framework); text formats the label of a row.
+    """
+    return go.Bar(
+        x=[row["framework"] for row in rows],
+        y=[row["median"] for row in rows],
+        error_y=error_bars(rows),
+        text=[text(row) for row in rows],
+        marker_color=[framework_color(row["framework"]) for row in rows],
+        showlegend=False,
+        **kwargs,
+    )
+
+
+def significance_marker(row, best):
+    """
+    Text marker for frameworks that are not significantly different from the best one.
+    """
+    if row["significant"] is False:
+        return f" | n.s. vs {best}"
+    return ""
+
+
+def add_steady_state_toggle(fig):
+    """
+    Adds "Whole run" / "Steady state" buttons to a figure whose steady state traces are
+    marked with meta="steady" (and hidden until the button is pressed).
+    """
+    steady = [trace.meta == "steady" for trace in fig.data]
+    if not any(steady):
+        return
+    fig.update_layout(
+        updatemenus=[
+            dict(
+                type="buttons",
+                direction="right",
+                x=1,
+                xanchor="right",
+                y=1.06,
+                yanchor="bottom",
+                buttons=[
+                    dict(
+                        label="Whole run",
+                        method="update",
+                        args=[{"visible": [not s for s in steady]}],
+                    ),
+                    dict(label="Steady state", method="update", args=[{"visible": steady}]),
+                ],
+            )
+        ]
+    )
+
+
+def client_marker(records):
+    """
+    Text marker for frameworks whose runs were limited by the load generator's own CPU.
+    """
+    saturated = [r for r in records if (r["metrics"].get("client") or {}).get("saturated")]
+    if not saturated:
+        return ""
+    return f" | client-bound ({len(saturated)}/{len(records)} runs)"
+
+
+def noise_marker(records):
+    """
+    Text marker for frameworks with runs on a noisy host (see hostnoise.py), with the flags.
+    """
+    noisy = [r for r in records if r["quality"] and r["quality"]["flags"]]
+    if not noisy:
+        return ""
+    flags = sorted({flag for r in noisy for flag in r["quality"]["flags"]})
+    return f" | noisy: {', '.join(flags)} ({len(noisy)}/{len(records)} runs)"
+
+
+def error_marker(error_rates):
+    """
+    Text marker with the (median) error rate of a framework's runs.
+    """
+    if not error_rates:
+        return ""
+    return f" | errors: {float(np.median(error_rates)):.2f}%"
+
+
+class StatisticsReporter:
+    # (metric, value of a record, higher is better)
+    METRICS = (
+        ("rps", lambda r: r["rps"], True),
+        ("latency_ms", lambda r: r["latency_ms"], False),
+        ("goodput", lambda r: r["goodput"], True),
+        ("error_rate", lambda r: r["error_rate"], False),
+        ("steady_rps", lambda r: r["steady_state"] and r["steady_state"]["rps"], True),
+        (
+            "warmup_seconds",
+            lambda r: r["steady_state"] and r["steady_state"]["warmup_seconds"],
+            False,
+        ),
+        ("fixed_ms", lambda r: r["metrics"].get("cost", {}).get("fixed_ms"), False),
+        ("per_row_us", lambda r: r["metrics"].get("cost", {}).get("per_row_us"), False),
+    )
+
+    def __init__(self, index):
+        self.index = index
+
+    COLUMNS = (
+        "tool",
+        "benchmark",
+        "variant",
+        "metric",
+        "framework",
+        "n",
+        "median",
+        "ci_low",
+        "ci_high",
+        "p_vs_best",
+        "significant",
+    )
+
+    def rows(self):
+        """
+        Median, bootstrap confidence interval and significance versus the best framework for the
+        requests per second and average latency of every tool and benchmark (and the steady
+        state RPS and warm-up duration of the tools with per second series, the fixed and per
+        row request cost of the payload sweep).
+        """
+        rows = []
+        for tool in self.index.tools:
+            records = self.index.records(tool)
+            for metric, value, higher_is_better in self.METRICS:
+                # runs of different h2load protocols are separate samples
+                grouped = group_trials(
+                    records, value, key=lambda r: (r["benchmark"], record_variant(r))
+                )
+                for (benchmark_name, variant), values in sorted(grouped.items()):
+                    compared = FrameworkComparator(values, higher_is_better).compare()
+                    for row in compared:
+                        rows.append(
+                            dict(
+                                tool=tool,
+                                benchmark=benchmark_name,
+                                variant=variant,
+                                metric=metric,
+                                **row,
+                            )
+                        )
+        return rows
+
+    def write(self, f, rows, output_format="csv"):
+        if output_format == "json":
+            json.dump(rows, f, indent=2)
+            f.write("\n")
+        else:
+            writer = csv.DictWriter(f, self.COLUMNS, lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def report(self, export_file=None, output_format="csv"):
+        """
+        Writes the statistics as CSV or JSON to export_file (default: statistics.csv in the
+        results directory, "-" for the standard output).
+        """
+        rows = self.rows()
+        if len(rows) == 0:
+            print("No results for the statistics report.")
+            return
+        export_file = export_file or output_dir + "statistics.csv"
+        if export_file == "-":
+            self.write(sys.stdout, rows, output_format)
+            return
+        with open(export_file, "w", newline="") as f:
+            self.write(f, rows, output_format)
+        print(f"Statistics report exported to {export_file}")
+
+
+class UslModel:
+    """
+    Universal Scalability Law: X(N) = lambda * N / (1 + sigma * (N - 1) + kappa * N * (N - 1)),
+    with sigma the contention and kappa the coherency (crosstalk) coefficient.
+    """
+
+    def __init__(self, concurrency, throughput):
+        self.concurrency = np.asarray(concurrency, dtype=float)
+        self.throughput = np.asarray(throughput, dtype=float)
+        self.lam = self.sigma = self.kappa = None
+
+    def fit(self):
+        """
+        Least squares fit of sigma and kappa on the linearized model
+        N / C(N) - 1 = sigma * (N - 1) + kappa * N * (N - 1), where C(N) = X(N) / lambda
+        and lambda is the throughput per client at the lowest measured concurrency.
+        """
+        order = np.argsort(self.concurrency)
+        n = self.concurrency[order]
+        x = self.throughput[order]
+        self.lam = x[0] / n[0]
+        y = n / (x / self.lam) - 1
+        design = np.column_stack([n - 1, n * (n - 1)])
+        (sigma, kappa), *_ = np.linalg.lstsq(design, y, rcond=None)
+        # the coefficients are non-negative; refit the other one if a coefficient went below 0
+        if sigma < 0:
+            sigma = 0.0
+            kappa = max(0.0, float(np.linalg.lstsq(design[:, 1:], y, rcond=None)[0][0]))
+        elif kappa < 0:
+            kappa = 0.0
+            sigma = max(0.0, float(np.linalg.lstsq(design[:, :1], y, rcond=None)[0][0]))
+        self.sigma, self.kappa = float(sigma), float(kappa)
+        return self
+
+    def predict(self, concurrency):
+        n = np.asarray(concurrency, dtype=float)
+        return self.lam * n / (1 + self.sigma * (n - 1) + self.kappa * n * (n - 1))
+
+    def peak_concurrency(self):
+        """
+        Concurrency with the highest predicted throughput (infinite without coherency cost).
+        """
+        if self.kappa <= 0:
+            return math.inf
+        return math.sqrt((1 - self.sigma) / self.kappa) if self.sigma < 1 else 1.0
+
+
+class PayloadCostModel:
+    """
+    Linear cost model of the payload sweep: time per request = fixed + per_row * rows, where the
+    time per request is the server capacity used by one request at the tested concurrency
+    (1000 / goodput, in ms). The intercept is the fixed framework overhead (boot, routing, query
+    round trip), the slope the ORM/serialization cost of one row.
+    """
+
+    def __init__(self, rows, goodput):
+        rows = np.asarray(rows, dtype=float)
+        goodput = np.asarray(goodput, dtype=float)
+        valid = goodput > 0
+        self.rows = rows[valid]
+        self.cost_ms = 1000 / goodput[valid]
+        self.fixed_ms = self.per_row_us = None
+
+    def fit(self):
+        """
+        Least squares fit of the fixed and the per row cost (both non-negative).
+        """
+        if len(np.unique(self.rows)) < 2:
+            raise ValueError("The payload sweep needs at least two different row counts")
+        design = np.column_stack([np.ones_like(self.rows), self.rows])
+        (fixed, per_row), *_ = np.linalg.lstsq(design, self.cost_ms, rcond=None)
+        if per_row < 0:
+            fixed, per_row = float(self.cost_ms.mean()), 0.0
+        elif fixed < 0:
+            fixed, per_row = 0.0, float(self.rows @ self.cost_ms / (self.rows @ self.rows))
+        self.fixed_ms, self.per_row_us = float(fixed), float(per_row) * 1000
+        return self
+
+    def predict(self, rows):
+        return self.fixed_ms + self.per_row_us / 1000 * np.asarray(rows, dtype=float)
+
+
+class SteadyStateDetector:
+    """
+    Finds the end of the warm-up phase of a time series with the MSER-5 rule (marginal standard
+    error rule on batch means): the truncation point minimizes the standard error of the mean of
+    the remaining batches, var(x[d:]) / (n - d), and is searched in the first half of the run.
+    """
+
+    def __init__(self, values, batch=5):
+        self.values = np.asarray(values, dtype=float)
+        # short runs (wrk-like 10 s tests) are truncated per sample instead of per 5 s batch
+        self.batch = max(1, min(batch, len(self.values) // 20))
+
+    def truncation(self):
+        """
+        Returns the number of leading samples that belong to the warm-up phase.
+        """
+        batches = len(self.values) // self.batch
+        if batches < 4:
+            return 0
+        # the batches are aligned to the end of the series, the first samples are dropped
+        means = self.values[len(self.values) - batches * self.batch :]
+        means = means.reshape(batches, self.batch).mean(axis=1)
+        tail_sizes = np.arange(batches, batches - batches // 2 - 1, -1)
+        statistic = [means[d:].var() / size for d, size in enumerate(tail_sizes)]
+        d = int(np.argmin(statistic))
+        return len(self.values) - (batches - d) * self.batch
+
+
+def steady_state(series):
+    """
+    Splits a per second series (loadgen, k6 point output) into warm-up and steady state.
+    The warm-up ends when both the throughput (per VU for ramping k6 runs) and the mean latency
+    have settled. Returns the warm-up seconds and the request rate, mean latency and error rate
+    of the steady part, None for series too short to tell.
+    """
+    # the last window is partial (responses after the end of the test)
+    windows = series[:-1]
+    if len(windows) < 4:
+        return None
+    rps = np.array([w["rps"] for w in windows], dtype=float)
+    latency = np.array([w["mean"] for w in windows], dtype=float)
+    vus = np.array([w.get("vus") or 0 for w in windows], dtype=float)
+    throughput = rps / vus if vus.all() else rps
+    start = max(
+        SteadyStateDetector(throughput).truncation(), SteadyStateDetector(latency).truncation()
+    )
+
+    requests = rps[start:].sum()
+    errors = np.array([w["error_rate"] for w in windows[start:]])
+    return {
+        "warmup_seconds": windows[start]["t"] - windows[0]["t"],
+        "rps": float(rps[start:].mean()),
+        "latency_ms": float((latency[start:] * rps[start:]).sum() / requests) if requests else 0.0,
+        "error_rate": float(errors.mean()),
+    }
+
+
+class Dashboard:
+    """
+    Collects the charts of every plotter and writes them to a single HTML page. plotly.js is
+    loaded once and every chart is only drawn when it is scrolled into view, so the page opens
+    instantly even with many charts.
+    """
+
+    TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>PHP frameworks benchmark</title>
+<script src="plotly.min.js"></script>
+<style>
+body { font-family: sans-serif; margin: 0 2em; }
+nav a { margin-right: 1em; }
+.chart { width: 100%; }
+</style>
+</head>
+<body>
+<h1>PHP frameworks benchmark</h1>
+<nav>$nav</nav>
+$sections
+<script>
+const templates = $templates;
+const figures = $figures;
+const observer = new IntersectionObserver((entries) => {
+  for (const entry of entries) {
+    if (!entry.isIntersecting) continue;
+    observer.unobserve(entry.target);
+    const figure = figures[entry.target.dataset.figure];
+    figure.layout.template = templates[figure.template];
+    Plotly.newPlot(entry.target, figure.data, figure.layout, {responsive: true});
+  }
+}, {rootMargin: "400px"});
+document.querySelectorAll(".chart").forEach((chart) => observer.observe(chart));
+</script>
+</body>
+</html>
+"""
+
+    def __init__(self):
+        self.charts = []
+
+    def add(self, fig, export_file):
+        self.charts.append((os.path.basename(export_file)[: -len(".html")], fig))
+
+    def write(self, export_file):
+        if not self.charts:
+            return
+        nav, sections, figures = [], [], []
+        # the layout template (several KB) is shared by the charts instead of repeated in each
+        templates = {}
+        for i, (name, fig) in enumerate(self.charts):
+            nav.append(f'<a href="#{name}">{name}</a>')
+            height = fig.layout.height or 450
+            sections.append(
+                f'<section id="{name}"><div class="chart" data-figure="{i}" '
+                f'style="height: {height}px"></div></section>'
+            )
+            figure = json.loads(fig.to_json())
+            template = json.dumps(figure["layout"].pop("template", {}))
+            figure["template"] = templates.setdefault(template, len(templates))
+            figures.append(json.dumps(figure))
+        html = string.Template(self.TEMPLATE).substitute(
+            nav="\n".join(nav),
+            sections="\n".join(sections),
+            templates="[" + ",".join(templates) + "]",
+            # "</" would end the script element
+            figures="[" + ",".join(figures).replace("</", "<\\/") + "]",
+        )
+        with open(export_file, "w") as f:
+            f.write(html)
+        print(f"Dashboard with {len(self.charts)} charts exported to {export_file}")
+
+
+# Every chart written by write_figure, for the single page dashboard
+dashboard = Dashboard()
+
+
+def write_figure(fig, export_file):
+    """
+    Writes a chart to its own HTML file and adds it to the dashboard. The files load the
+    plotly.js bundle shared by all charts (plotly.min.js, written once next to them) instead
+    of embedding a copy each.
+    """
+    fig.write_html(export_file, include_plotlyjs="directory")
+    dashboard.add(fig, export_file)
+
+
 class FilePlotter:
     def __init__(self, total_files):
         self.total_files = total_files
@@ -116,20 +1584,15 @@ class FilePlotter:
             for value in total_files.values()
         ]
 
-        fig = go.Figure()
-
-        for x_value, y_value, percentage in zip(
-            list(total_files.keys()), list(total_files.values()), percentages
-        ):
-            fig.add_trace(
-                go.Bar(
-                    x=[x_value],
-                    y=[y_value],
-                    text=[percentage],
-                    textposition="auto",
-                    name=x_value,  # Set the legend text to the x-value
-                )
+        fig = go.Figure(
+            go.Bar(
+                x=list(total_files),
+                y=list(total_files.values()),
+                text=percentages,
+                textposition="auto",
+                marker_color=[framework_color(framework) for framework in total_files],
             )
+        )
 
         fig.update_layout(
             title_text="framework size comparison (excluding folders: cache, logs, storage, var, writable...)",
@@ -140,197 +1603,223 @@ class FilePlotter:
 
         # Export to a single HTML file
         export_file = output_dir + "framework-size-chart.html"
-        fig.write_html(export_file)
+        write_figure(fig, export_file)
         print(f"Framework size bar charts exported to {export_file}")
 
 
 class H2LoadPlotter:
-    def __init__(self, results_dir):
-        self.results_dir = results_dir
+    def __init__(self, index):
+        self.index = index
 
-    def plot_h2load(self):
+    @staticmethod
+    def median_timing(records, key):
         """
-        Creates a bar chart of requests per second for all log files in the specified directory.
+        Median of every field (min, max, mean, sd) of an h2load timing over repeated runs.
         """
-        filenames = [
-            os.path.join(self.results_dir, f)
-            for f in os.listdir(self.results_dir)
-            if f.endswith(".h2load.log")
-        ]
-
-        frameworks = []
-        benchmark_names = []
-        for filename in filenames:
-            extractor = FilenameExtractor(filename)
-            framework_name, benchmark_name = extractor.extract_info_from_filename()
-            frameworks.append(framework_name)
-            benchmark_names.append(benchmark_name)
-
-        req_per_sec_values = []
-        for i, filename in enumerate(filenames):
-            try:
-                parser = LogParser(filename)
-                rps, command_args = parser.parse_logfile()
-            except ValueError as e:
-                print(f"Error: {e}")
-                continue
-            req_per_sec_values.append(rps)
-
-        # Initialize dictionaries to hold requests per second values and labels for each benchmark type
-        req_per_sec_by_bench = {bench: [] for bench in benchmark_names}
-        labels_by_bench = {bench: [] for bench in benchmark_names}
-
-        # Populate the dictionaries
-        for i, bench_type in enumerate(benchmark_names):
-            label = frameworks[i]
-            req_per_sec = req_per_sec_values[i]
-            if bench_type in req_per_sec_by_bench:
-                req_per_sec_by_bench[bench_type].append(req_per_sec)
-                labels_by_bench[bench_type].append(label)
-
-        # Sort the data by requests per second in descending order
-        for bench_type in benchmark_names:
-            if bench_type in req_per_sec_by_bench:
-                sorted_pairs = sorted(
-                    zip(req_per_sec_by_bench[bench_type], labels_by_bench[bench_type]),
-                    reverse=True,
-                )
-                req_per_sec_by_bench[bench_type], labels_by_bench[bench_type] = (
-                    zip(*sorted_pairs) if sorted_pairs else ([], [])
-                )
+        timings = [r["metrics"]["timings"][key] for r in records if key in r["metrics"]["timings"]]
+        if not timings:
+            return dict.fromkeys(("min", "max", "mean", "sd"), 0.0)
+        return {field: float(np.median([t[field] for t in timings])) for field in timings[0]}
 
-        # Remove duplicates from the benchmark names list
-        benchmark_names = list(set(benchmark_names))
+    def plot_h2load(self):
+        """
+        Creates charts of the h2load results per framework and protocol (HTTP/1.1, h2c):
+        goodput (median with bootstrap confidence interval for repeated runs, error rates),
+        time to first byte (min, mean +/- sd and max) and header bytes per request.
+        """
+        records = self.index.records("h2load")
 
         # Create subplots dynamically based on the number of benchmarks
+        benchmark_names = sorted({r["benchmark"] for r in records})
         cols = len(benchmark_names)
         if cols == 0:
             print("No h2load log files found.")
             return
+        protocols = sorted({r["metrics"]["protocol"] for r in records})
+        colors = dict(zip(protocols, px.colors.qualitative.Plotly))
         fig = make_subplots(
-            rows=1,
+            rows=3,
             cols=cols,
             subplot_titles=[f"Benchmark: {bench}" for bench in benchmark_names],
+            vertical_spacing=0.08,
         )
 
-        # Add traces for each benchmark
-        for i, benchmark_type in enumerate(benchmark_names, start=1):
-            if (
-                benchmark_type in req_per_sec_by_bench
-                and req_per_sec_by_bench[benchmark_type]
-            ):
+        for col, benchmark_name in enumerate(benchmark_names, start=1):
+            # frameworks sorted by goodput (of the first protocol) in descending order
+            order = []
+            for protocol in protocols:
+                runs = group_trials(
+                    [
+                        r
+                        for r in records
+                        if r["benchmark"] == benchmark_name and r["metrics"]["protocol"] == protocol
+                    ],
+                    lambda r: r,
+                ).get(benchmark_name)
+                if not runs:
+                    continue
+                goodputs = {
+                    framework: [r["goodput"] for r in rs if r["goodput"] is not None]
+                    for framework, rs in runs.items()
+                }
+                rows = FrameworkComparator(
+                    {framework: values for framework, values in goodputs.items() if values}
+                ).compare()
+                if not rows:
+                    continue
                 percentages = PercentageCalculator(
-                    req_per_sec_by_bench[benchmark_type]
+                    [row["median"] for row in rows]
                 ).calculate_percentages()
-                text_values = [
-                    f"{y_value} | {percentage:.1f}%"
-                    for y_value, percentage in zip(
-                        req_per_sec_by_bench[benchmark_type], percentages
-                    )
-                ]
+                best = rows[0]["framework"]
+                texts = {
+                    row["framework"]: f"{row['median']:.0f} | {percentage:.1f}%"
+                    + error_marker([r["error_rate"] for r in runs[row["framework"]]])
+                    + significance_marker(row, best)
+                    + noise_marker(runs[row["framework"]])
+                    for row, percentage in zip(rows, percentages)
+                }
+                order += [row["framework"] for row in rows if row["framework"] not in order]
+                rows = sorted(rows, key=lambda row: order.index(row["framework"]))
+                frameworks = [row["framework"] for row in rows]
 
-                for label, y_value, text_value in zip(
-                    labels_by_bench[benchmark_type],
-                    req_per_sec_by_bench[benchmark_type],
-                    text_values,
-                ):
-                    fig.add_trace(
-                        go.Bar(
-                            x=[label],
-                            y=[y_value],
-                            name=label,  # Set the legend text to the label
-                            text=[text_value],
-                            textposition="auto",
-                        ),
-                        row=1,
-                        col=i,
+                fig.add_trace(
+                    go.Bar(
+                        x=frameworks,
+                        y=[row["median"] for row in rows],
+                        name=protocol,
+                        legendgroup=protocol,
+                        showlegend=col == 1,
+                        marker_color=colors[protocol],
+                        error_y=error_bars(rows),
+                        text=[texts[framework] for framework in frameworks],
+                        textposition="auto",
+                    ),
+                    row=1,
+                    col=col,
+                )
+
+                # h2load only reports min/max/mean/sd: the box spans mean +/- sd
+                ttfb = [self.median_timing(runs[framework], "ttfb") for framework in frameworks]
+                fig.add_trace(
+                    go.Box(
+                        x=frameworks,
+                        lowerfence=[t["min"] for t in ttfb],
+                        q1=[max(t["min"], t["mean"] - t["sd"]) for t in ttfb],
+                        median=[t["mean"] for t in ttfb],
+                        q3=[min(t["max"], t["mean"] + t["sd"]) for t in ttfb],
+                        upperfence=[t["max"] for t in ttfb],
+                        name=protocol,
+                        legendgroup=protocol,
+                        showlegend=False,
+                        marker_color=colors[protocol],
+                        offsetgroup=protocol,
+                    ),
+                    row=2,
+                    col=col,
+                )
+
+                # protocol overhead: response header bytes per request (HPACK savings for h2c)
+                header_bytes, savings = [], []
+                for framework in frameworks:
+                    traffic = [r for r in runs[framework] if "traffic" in r["metrics"]]
+                    header_bytes.append(
+                        float(
+                            np.median(
+                                [
+                                    r["metrics"]["traffic"]["header_bytes"]
+                                    / max(1, r["metrics"]["requests"]["done"])
+                                    for r in traffic
+                                ]
+                            )
+                        )
+                        if traffic
+                        else 0.0
                     )
+                    savings.append(
+                        float(
+                            np.median(
+                                [r["metrics"]["traffic"]["header_space_savings"] for r in traffic]
+                            )
+                        )
+                        if traffic
+                        else 0.0
+                    )
+                fig.add_trace(
+                    go.Bar(
+                        x=frameworks,
+                        y=header_bytes,
+                        name=protocol,
+                        legendgroup=protocol,
+                        showlegend=False,
+                        marker_color=colors[protocol],
+                        text=[
+                            f"{value:.0f} B | saved {saving:.1f}%"
+                            for value, saving in zip(header_bytes, savings)
+                        ],
+                        textposition="auto",
+                    ),
+                    row=3,
+                    col=col,
+                )
+
+            fig.update_yaxes(title_text="Goodput (successful req/s)", row=1, col=col)
+            fig.update_yaxes(title_text="Time to 1st byte (ms)", row=2, col=col)
+            fig.update_yaxes(title_text="Header bytes per request", row=3, col=col)
+            fig.update_xaxes(title_text="Framework", row=3, col=col)
 
         # Update layout to adjust titles and axis labels
         fig.update_layout(
-            title_text=f"h2load requests per second charts<br>(h2load {command_args})",
+            height=1100,
+            title_text=f"h2load results per protocol<br>({command_args_text('h2load', records)})",
             title_font=dict(size=20),
-            xaxis_title="Framework",
-            yaxis_title="Requests per Second (RPS)",
+            barmode="group",
+            boxmode="group",
         )
 
         # Export to a single HTML file
         export_file = output_dir + "h2load-charts.html"
-        fig.write_html(export_file)
-        print(f"h2load bar charts exported to {export_file}")
+        write_figure(fig, export_file)
+        print(f"h2load charts exported to {export_file}")
 
 
 class Wrk2Plotter:
-    def __init__(self, results_dir):
-        self.results_dir = results_dir
+    def __init__(self, index):
+        self.index = index
 
     def plot_wrk2(self):
-        # Prepare an empty DataFrame to store all latency data
-        latency_data = pd.DataFrame()
-        command_args = ""
-
-        # Loop through each file in the logs directory
-        for filename in os.listdir(self.results_dir):
-            if filename.endswith(".wrk2.log"):
-                extractor = FilenameExtractor(filename)
-                framework_name, benchmark_name = extractor.extract_info_from_filename()
-                # Construct the full file path
-                file_path = os.path.join(self.results_dir, filename)
-
-                # Initialize lists to store the extracted data
-                percentiles = []
-                latencies = []
-
-                # Open and read the file
-                with open(file_path, "r") as f:
-                    lines = f.readlines()
-                    c = 0
-                    for line in lines:
-                        c += 1
-                        if c == 1:
-                            command_args = line.strip()
-                        if line.strip() and "Value" not in line and "inf" not in line:
-                            # Extract latency and percentile values
-                            parts = line.split()
-                            if len(parts) >= 2:
-                                try:
-                                    latency = float(parts[0])
-                                    percentile = float(parts[1])
-                                    percentiles.append(percentile)
-                                    latencies.append(latency)
-                                except ValueError:
-                                    # Handle the case where conversion to float fails
-                                    continue
-
-                # Create a DataFrame from the extracted data
-                df = pd.DataFrame(
-                    {
-                        "Percentile": percentiles,
-                        "Latency": latencies,
-                        "File": filename.replace(
-                            ".latency.log", ""
-                        ),  # Use file name as identifier
-                    }
-                )
-
-                # Remove the last 20 percentiles to avoid skewing the chart
-                df = df[df["Percentile"] <= 0.992]
-
-                # Append the data to the main DataFrame
-                latency_data = pd.concat([latency_data, df], ignore_index=True)
-
-        if len(latency_data) == 0:
+        records = self.index.records("wrk2")
+        if len(records) == 0:
             print("No wrk2 log files found.")
             return
-
-        # Add two new columns to the DataFrame for bench_name and framework_name
-        latency_data["BenchName"] = latency_data["File"].apply(
-            lambda x: x.split(".")[2].capitalize()
-        )
-        latency_data["FrameworkName"] = latency_data["File"].apply(
-            lambda x: x.split(".")[0]
+        command_args = records[-1]["command_args"]
+
+        # Build the combined DataFrame once from the per-file arrays
+        percentiles = [np.asarray(r["metrics"]["percentiles"]) for r in records]
+        lengths = [len(p) for p in percentiles]
+
+        def repeat(values):
+            return np.repeat(np.asarray(values, dtype=object), lengths)
+
+        latency_data = pd.DataFrame(
+            {
+                "Percentile": np.concatenate(percentiles),
+                "Latency": np.concatenate(
+                    [np.asarray(r["metrics"]["latencies"]) for r in records]
+                ),
+                "BenchName": repeat([r["benchmark"] for r in records]),
+                "FrameworkName": repeat([r["framework"] for r in records]),
+                "Mean": repeat([r["metrics"]["summary"].get("mean") for r in records]),
+                "Max": repeat([r["metrics"]["summary"].get("max") for r in records]),
+                "TotalCount": repeat(
+                    [r["metrics"]["summary"].get("total_count") for r in records]
+                ),
+                "ErrorRate": repeat([r["error_rate"] for r in records]),
+            }
         )
 
+        # Remove the last 20 percentiles to avoid skewing the chart
+        latency_data = latency_data[latency_data["Percentile"] <= 0.992]
+
         # Group the DataFrame by bench_name
         grouped = latency_data.groupby("BenchName")
 
@@ -342,6 +1831,10 @@ class Wrk2Plotter:
                 y="Latency",
                 color="FrameworkName",  # Use framework_name as legend
                 markers=True,
+                hover_data=["Mean", "Max", "TotalCount", "ErrorRate"],
+                # one point per recorded percentile: WebGL keeps the chart fast
+                render_mode="webgl",
+                color_discrete_map={f: framework_color(f) for f in group["FrameworkName"].unique()},
                 labels={"Latency": "Latency (ms)", "Percentile": "Percentile"},
                 title=f"wrk2 latency by percentile | Benchmark: {benchmark_name}<br>(wrk2 {command_args})",
             )
@@ -350,13 +1843,13 @@ class Wrk2Plotter:
 
             # Export the plot to a separate HTML file for each bench_name
             export_file = output_dir + f"wrk2-{benchmark_name}-charts.html"
-            fig.write_html(export_file)
+            write_figure(fig, export_file)
             print(f"wrk2 charts for {benchmark_name} exported to {export_file}")
 
 
 class WrkPlotter:
-    def __init__(self, results_dir):
-        self.results_dir = results_dir
+    def __init__(self, index):
+        self.index = index
 
     def convert_to_number(self, value):
         if "k" in value:
@@ -365,99 +1858,52 @@ class WrkPlotter:
             return float(value)
 
     def plot_wrk(self):
-        # Regular expression patterns to extract data
-        latency_pattern = re.compile(r"Latency\s+(\d+\.\d+m?s)")
-        req_sec_pattern = re.compile(r"Req/Sec\s+(\d+\.\d+k?)?")
+        records = self.index.records("wrk")
+        command_args = records[-1]["command_args"] if records else ""
 
-        # Data structure to hold the parsed results
-        results = {}
-
-        # Iterate over each file in the results directory
-        for filename in os.listdir(self.results_dir):
-            if filename.endswith(".wrk.log"):
-                extractor = FilenameExtractor(filename)
-                framework_name, benchmark_name = extractor.extract_info_from_filename()
-                with open(
-                    os.path.join(self.results_dir, filename), "r", encoding="utf-8"
-                ) as file:
-                    content = file.read()
-                    # The first line of the file contains the wrk command used
-                    command_args = content.split("\n")[0]
-                    # Extract the average latency and requests per second
-                    avg_latency = latency_pattern.search(content).group(1)
-                    avg_req_sec = req_sec_pattern.search(content).group(1)
-                    # Convert avg_req_sec to requests/sec if the value ends with 'k'
-                    if "k" in str(avg_req_sec):
-                        avg_req_sec = float(avg_req_sec.replace("k", "")) * 1000
-                    else:
-                        avg_req_sec = float(avg_req_sec)
-                    if "ms" in str(avg_latency):
-                        avg_latency = float(avg_latency.replace("ms", ""))
-                    else:
-                        avg_latency = float(avg_latency.replace("s", "")) * 1000
-                    if benchmark_name not in results:
-                        results[benchmark_name] = {
-                            "frameworks": [],
-                            "latencies": [],
-                            "req_secs": [],
-                        }
-                    results[benchmark_name]["frameworks"].append(framework_name)
-                    results[benchmark_name]["latencies"].append(avg_latency)
-                    results[benchmark_name]["req_secs"].append(avg_req_sec)
+        # Data structure to hold the parsed results: {benchmark: {framework: [trials]}}
+        latencies = group_trials(records, lambda r: r["latency_ms"])
+        goodputs = group_trials(records, lambda r: r["goodput"])
+        error_rates = group_trials(records, lambda r: r["error_rate"])
+        runs = group_trials(records, lambda r: r)
 
-        if len(results) == 0:
+        if len(latencies) == 0:
             print("No wrk log files found.")
             return
 
+        benchmark_names = sorted(latencies)
+
         # Create subplots
         fig = make_subplots(
             rows=2,
-            cols=len(results),
+            cols=len(benchmark_names),
             subplot_titles=[
-                f"Benchmark: {bench_name}" for bench_name in results.keys()
+                f"Benchmark: {bench_name}" for bench_name in benchmark_names
             ],
         )
 
-        # order latencies in ascending and req_secs descending order
-        for benchmark_name, data in results.items():
-            # Create a temporary DataFrame for sorting within each benchmark
-            df = pd.DataFrame(data)
-
-            # Sort by 'latencies' (ascending), then 'req_secs' (descending)
-            df = df.sort_values(by=['latencies', 'req_secs'], ascending=[True, False])
-
-            # Update results dictionary with sorted data
-            results[benchmark_name] = {
-                'frameworks': df['frameworks'].to_list(),
-                'latencies': df['latencies'].to_list(),
-                'req_secs': df['req_secs'].to_list()
-            }
-
         col = 1
-        for benchmark_name, data in results.items():
-            # Add the latency bar chart
-            for framework, latency in zip(data["frameworks"], data["latencies"]):
+        for benchmark_name in benchmark_names:
+            # order latencies in ascending and goodput in descending order
+            for row_index, (rows, decimals) in enumerate(
+                (
+                    (FrameworkComparator(latencies[benchmark_name], False).compare(), 1),
+                    (FrameworkComparator(goodputs.get(benchmark_name, {})).compare(), 1),
+                ),
+                start=1,
+            ):
+                if not rows:
+                    continue
+                best = rows[0]["framework"]
                 fig.add_trace(
-                    go.Bar(
-                        x=[framework],
-                        y=[latency],
-                        name=framework,
-                        text=f"{latency:.1f}",
+                    comparison_bar(
+                        rows,
+                        lambda row: f"{row['median']:.{decimals}f}"
+                        + error_marker(error_rates[benchmark_name].get(row["framework"]))
+                        + significance_marker(row, best)
+                        + noise_marker(runs[benchmark_name][row["framework"]]),
                     ),
-                    row=1,
-                    col=col,
-                )
-
-            # Add the requests per second bar chart
-            for framework, req_sec in zip(data["frameworks"], data["req_secs"]):
-                fig.add_trace(
-                    go.Bar(
-                        x=[framework],
-                        y=[req_sec],
-                        name=framework,
-                        text=f"{req_sec:.1f}",
-                    ),
-                    row=2,
+                    row=row_index,
                     col=col,
                 )
 
@@ -467,100 +1913,1243 @@ class WrkPlotter:
                 title_text="Avg Latency (ms), lower is better", row=1, col=col
             )
             fig.update_xaxes(title_text="Framework", row=2, col=col)
-            fig.update_yaxes(title_text="Avg Req/Sec", row=2, col=col)
+            fig.update_yaxes(title_text="Goodput (successful req/s)", row=2, col=col)
             col += 1
 
         # Update layout
         fig.update_layout(
-            height=400 * len(results),
+            height=400 * len(benchmark_names),
             title_text=f"Benchmark Results<br>(wrk {command_args}) ",
             barmode="group",
         )
 
         # Export to HTML
         export_file = output_dir + f"wrk-charts.html"
-        fig.write_html(export_file)
+        write_figure(fig, export_file)
         print(f"wrk charts exported to {export_file}")
 
 
-class K6DataExtractor:
-    def __init__(self, framework_name, benchmark_name):
-        self.framework_name = framework_name
-        self.benchmark_name = benchmark_name
+class LoadgenPlotter:
+    def __init__(self, index):
+        self.index = index
 
-    def extract_k6_data(self):
-        """Extracts avg and rate data from a log file"""
+    def plot_loadgen(self):
+        """
+        Creates bar charts of goodput (with error rates) and latency percentiles for the loadgen
+        results. Repeated runs are combined: median goodput with confidence interval, merged
+        latency histograms.
+        """
+        records = self.index.records("loadgen")
+        command_args = records[-1]["command_args"] if records else ""
+        req_secs = group_trials(records, lambda r: r["goodput"])
+        error_rates = group_trials(records, lambda r: r["error_rate"])
+        runs = group_trials(records, lambda r: r)
+        steady = [r for r in records if r["steady_state"]]
+        steady_req_secs = group_trials(steady, lambda r: r["steady_state"]["rps"])
+        steady_latencies = group_trials(steady, lambda r: r["steady_state"]["latency_ms"])
+
+        if len(req_secs) == 0:
+            print("No loadgen log files found.")
+            return
+
+        benchmark_names = sorted(req_secs)
+        fig = make_subplots(
+            rows=2,
+            cols=len(benchmark_names),
+            subplot_titles=[f"Benchmark: {bench_name}" for bench_name in benchmark_names],
+        )
+
+        col = 1
+        for benchmark_name in benchmark_names:
+            # Order by goodput in descending order
+            rows = FrameworkComparator(req_secs[benchmark_name]).compare()
+            best = rows[0]["framework"]
+            fig.add_trace(
+                comparison_bar(
+                    rows,
+                    lambda row: f"{row['median']:.1f}"
+                    + error_marker(error_rates[benchmark_name][row["framework"]])
+                    + significance_marker(row, best)
+                    + client_marker(runs[benchmark_name][row["framework"]])
+                    + noise_marker(runs[benchmark_name][row["framework"]]),
+                ),
+                row=1,
+                col=col,
+            )
+
+            # p50/p90/p99 latency, one group of bars per framework
+            frameworks = [row["framework"] for row in rows]
+            percentiles = [
+                combined_percentiles(runs[benchmark_name][framework]) for framework in frameworks
+            ]
+            for percentile in ("p50", "p90", "p99"):
+                fig.add_trace(
+                    go.Bar(
+                        x=frameworks,
+                        y=[values[percentile] for values in percentiles],
+                        name=percentile,
+                        text=[f"{values[percentile]:.1f}" for values in percentiles],
+                    ),
+                    row=2,
+                    col=col,
+                )
 
-        # convert framework_name and benchmark_name to lowercase
-        framework_name = self.framework_name.lower()
-        benchmark_name = self.benchmark_name.lower()
+            # the same without the warm-up phase: median RPS and mean latency
+            if benchmark_name in steady_req_secs:
+                steady_rows = FrameworkComparator(steady_req_secs[benchmark_name]).compare()
+                best = steady_rows[0]["framework"]
+                fig.add_trace(
+                    comparison_bar(
+                        steady_rows,
+                        lambda row: f"{row['median']:.1f}" + significance_marker(row, best),
+                        meta="steady",
+                        visible=False,
+                    ),
+                    row=1,
+                    col=col,
+                )
+                frameworks = [row["framework"] for row in steady_rows]
+                means = [
+                    float(np.median(steady_latencies[benchmark_name][framework]))
+                    for framework in frameworks
+                ]
+                fig.add_trace(
+                    go.Bar(
+                        x=frameworks,
+                        y=means,
+                        name="mean (steady state)",
+                        text=[f"{value:.1f}" for value in means],
+                        meta="steady",
+                        visible=False,
+                    ),
+                    row=2,
+                    col=col,
+                )
 
-        file_path = os.path.join(
-            output_dir, f"{framework_name}.bench.{benchmark_name}.k6.log"
+            fig.update_xaxes(title_text="Framework", row=1, col=col)
+            fig.update_yaxes(title_text="Goodput (successful req/s)", row=1, col=col)
+            fig.update_xaxes(title_text="Framework", row=2, col=col)
+            fig.update_yaxes(title_text="Latency (ms), lower is better", row=2, col=col)
+            col += 1
+
+        fig.update_layout(
+            height=800,
+            title_text=f"loadgen benchmark results<br>(loadgen {command_args})",
+            barmode="group",
         )
+        add_steady_state_toggle(fig)
 
-        with open(file_path, "r") as f:
-            log_data = json.load(f)
+        # Export to HTML
+        export_file = output_dir + "loadgen-charts.html"
+        write_figure(fig, export_file)
+        print(f"loadgen charts exported to {export_file}")
+
+
+class SaturationPlotter:
+    def __init__(self, index):
+        self.index = index
+
+    def plot_saturation(self):
+        """
+        Plots the maximum sustainable requests per second under the latency SLO per framework,
+        and the p99 latency measured at every probed request rate.
+        """
+        records = self.index.records("saturation")
+        if len(records) == 0:
+            print("No saturation log files found.")
+            return
+        max_rps = group_trials(records, lambda r: r["rps"])
+        runs = group_trials(records, lambda r: r)
+        slo = records[-1]["metrics"]["slo"]
+        benchmark_names = sorted(max_rps)
+
+        fig = make_subplots(
+            rows=2,
+            cols=len(benchmark_names),
+            subplot_titles=[f"Benchmark: {bench}" for bench in benchmark_names]
+            + [f"p99 latency by offered rate: {bench}" for bench in benchmark_names],
+        )
+
+        for col, benchmark_name in enumerate(benchmark_names, start=1):
+            rows = FrameworkComparator(max_rps[benchmark_name]).compare()
+            best = rows[0]["framework"]
+            fig.add_trace(
+                comparison_bar(
+                    rows, lambda row: f"{row['median']:.0f}" + significance_marker(row, best)
+                ),
+                row=1,
+                col=col,
+            )
+            for row in rows:
+                color = framework_color(row["framework"])
+                # latency curve of every probe (all trials)
+                probes = sorted(
+                    (
+                        p
+                        for r in runs[benchmark_name][row["framework"]]
+                        for p in r["metrics"]["probes"]
+                    ),
+                    key=lambda p: p["rate"],
+                )
+                fig.add_trace(
+                    go.Scatter(
+                        x=[p["rate"] for p in probes],
+                        y=[p["latency_ms"]["p99"] for p in probes],
+                        mode="lines+markers",
+                        name=row["framework"],
+                        legendgroup=row["framework"],
+                        showlegend=False,
+                        marker=dict(
+                            color=color,
+                            symbol=["circle" if p["ok"] else "x" for p in probes],
+                        ),
+                        line=dict(color=color),
+                    ),
+                    row=2,
+                    col=col,
+                )
+            fig.add_hline(
+                y=slo["p99_ms"], line_dash="dash", annotation_text="SLO", row=2, col=col
+            )
+            fig.update_yaxes(title_text="Max sustainable Req/Sec", row=1, col=col)
+            fig.update_xaxes(title_text="Offered rate (req/s)", row=2, col=col)
+            fig.update_yaxes(title_text="p99 latency (ms)", type="log", row=2, col=col)
+
+        fig.update_layout(
+            height=900,
+            title_text=(
+                f"Maximum sustainable throughput (p99 < {slo['p99_ms']} ms, "
+                f"errors < {slo['error_rate']}%)<br>(loadgen saturate {records[-1]['command_args']})"
+            ),
+        )
+
+        export_file = output_dir + "saturation-charts.html"
+        write_figure(fig, export_file)
+        print(f"Saturation charts exported to {export_file}")
+
+
+class SweepPlotter:
+    def __init__(self, index):
+        self.index = index
+
+    def plot_sweep(self):
+        """
+        Plots throughput and p99 latency versus concurrency per framework, together with the
+        fitted Universal Scalability Law curve and its predicted peak concurrency.
+        """
+        records = self.index.records("sweep")
+        if len(records) == 0:
+            print("No sweep log files found.")
+            return
+        runs = group_trials(records, lambda r: r)
+        benchmark_names = sorted(runs)
+
+        fig = make_subplots(
+            rows=2,
+            cols=len(benchmark_names),
+            subplot_titles=[f"Benchmark: {bench}" for bench in benchmark_names]
+            + [f"p99 latency: {bench}" for bench in benchmark_names],
+        )
+
+        for col, benchmark_name in enumerate(benchmark_names, start=1):
+            for framework, framework_runs in sorted(runs[benchmark_name].items()):
+                color = framework_color(framework)
+                levels = [level for r in framework_runs for level in r["metrics"]["levels"]]
+                concurrency = np.array([level["concurrency"] for level in levels])
+                throughput = np.array([level["rps"] for level in levels])
+                model = UslModel(concurrency, throughput).fit()
+                peak = model.peak_concurrency()
+                label = (
+                    f"{framework} (sigma={model.sigma:.3f}, kappa={model.kappa:.5f}, "
+                    f"N*={peak:.0f})"
+                )
+
+                fig.add_trace(
+                    go.Scatter(
+                        x=concurrency,
+                        y=throughput,
+                        mode="markers",
+                        name=label,
+                        legendgroup=framework,
+                        marker=dict(color=color),
+                    ),
+                    row=1,
+                    col=col,
+                )
+                curve = np.geomspace(1, concurrency.max() * 2, 200)
+                fig.add_trace(
+                    go.Scatter(
+                        x=curve,
+                        y=model.predict(curve),
+                        mode="lines",
+                        name=f"{framework} USL fit",
+                        legendgroup=framework,
+                        showlegend=False,
+                        line=dict(color=color, dash="dot"),
+                    ),
+                    row=1,
+                    col=col,
+                )
+                if math.isfinite(peak):
+                    fig.add_trace(
+                        go.Scatter(
+                            x=[peak],
+                            y=model.predict([peak]),
+                            mode="markers",
+                            name=f"{framework} predicted peak",
+                            legendgroup=framework,
+                            showlegend=False,
+                            marker=dict(color=color, symbol="star", size=14),
+                        ),
+                        row=1,
+                        col=col,
+                    )
+
+                order = np.argsort(concurrency)
+                fig.add_trace(
+                    go.Scatter(
+                        x=concurrency[order],
+                        y=[levels[j]["latency_ms"]["p99"] for j in order],
+                        mode="lines+markers",
+                        name=framework,
+                        legendgroup=framework,
+                        showlegend=False,
+                        line=dict(color=color),
+                    ),
+                    row=2,
+                    col=col,
+                )
+
+            fig.update_xaxes(title_text="Concurrency (connections)", type="log", row=1, col=col)
+            fig.update_yaxes(title_text="Req/Sec", row=1, col=col)
+            fig.update_xaxes(title_text="Concurrency (connections)", type="log", row=2, col=col)
+            fig.update_yaxes(title_text="p99 latency (ms)", row=2, col=col)
+
+        fig.update_layout(
+            height=900,
+            title_text=(
+                "Throughput vs concurrency with Universal Scalability Law fit"
+                f"<br>(loadgen sweep {records[-1]['command_args']})"
+            ),
+        )
+
+        export_file = output_dir + "sweep-charts.html"
+        write_figure(fig, export_file)
+        print(f"Concurrency sweep charts exported to {export_file}")
+
+
+class PayloadPlotter:
+    def __init__(self, index):
+        self.index = index
+
+    def plot_payload(self):
+        """
+        Plots goodput, p50 latency, transferred MB/s and time per request versus the number of
+        rows returned by the api endpoint, with the fitted fixed + per row cost line.
+        """
+        records = [r for r in self.index.records("payload") if r["metrics"].get("cost")]
+        if len(records) == 0:
+            print("No payload log files found.")
+            return
+        runs = group_trials(records, lambda r: r)
+        benchmark_names = sorted(runs)
+
+        titles = ("Goodput", "p50 latency", "Transfer", "Time per request (1000 / goodput)")
+        fig = make_subplots(
+            rows=len(titles),
+            cols=len(benchmark_names),
+            subplot_titles=[
+                f"{title}: {bench}" for title in titles for bench in benchmark_names
+            ],
+        )
+
+        for col, benchmark_name in enumerate(benchmark_names, start=1):
+            for framework, framework_runs in sorted(runs[benchmark_name].items()):
+                color = framework_color(framework)
+                levels = [level for r in framework_runs for level in r["metrics"]["levels"]]
+                rows = np.array([level["rows"] for level in levels], dtype=float)
+                model = PayloadCostModel(rows, [level["goodput"] for level in levels]).fit()
+
+                # median of the trials per row count
+                row_counts = np.unique(rows)
+                curves = {
+                    "goodput": lambda level: level["goodput"],
+                    "p50": lambda level: level["latency_ms"]["p50"],
+                    "mb_per_sec": lambda level: level["bytes_per_sec"] / 2**20,
+                }
+                medians = {
+                    key: [
+                        float(np.median([value(lv) for lv in levels if lv["rows"] == count]))
+                        for count in row_counts
+                    ]
+                    for key, value in curves.items()
+                }
+                for row, key in enumerate(curves, start=1):
+                    fig.add_trace(
+                        go.Scatter(
+                            x=row_counts,
+                            y=medians[key],
+                            mode="lines+markers",
+                            name=framework,
+                            legendgroup=framework,
+                            showlegend=False,
+                            line=dict(color=color),
+                        ),
+                        row=row,
+                        col=col,
+                    )
+
+                curve = np.geomspace(max(1, row_counts.min()), row_counts.max(), 100)
+                fig.add_trace(
+                    go.Scatter(
+                        x=model.rows,
+                        y=model.cost_ms,
+                        mode="markers",
+                        name=(
+                            f"{framework} (fixed {model.fixed_ms:.3f} ms "
+                            f"+ {model.per_row_us:.2f} us/row)"
+                        ),
+                        legendgroup=framework,
+                        marker=dict(color=color),
+                    ),
+                    row=4,
+                    col=col,
+                )
+                fig.add_trace(
+                    go.Scatter(
+                        x=curve,
+                        y=model.predict(curve),
+                        mode="lines",
+                        name=f"{framework} cost fit",
+                        legendgroup=framework,
+                        showlegend=False,
+                        line=dict(color=color, dash="dot"),
+                    ),
+                    row=4,
+                    col=col,
+                )
+
+            for row, title in enumerate(
+                ("Goodput (successful req/s)", "p50 latency (ms)", "MB/s", "ms per request"),
+                start=1,
+            ):
+                fig.update_xaxes(title_text="Rows (?limit=N)", type="log", row=row, col=col)
+                fig.update_yaxes(title_text=title, row=row, col=col)
+
+        fig.update_layout(
+            height=1400,
+            title_text=(
+                "Payload size scaling: fixed framework overhead vs per row cost"
+                f"<br>(loadgen payload {records[-1]['command_args']})"
+            ),
+        )
+
+        export_file = output_dir + "payload-charts.html"
+        write_figure(fig, export_file)
+        print(f"Payload scaling charts exported to {export_file}")
+
+
+class VariantPlotter:
+    # database access variants of the api endpoint, from the slowest to the fastest path
+    VARIANTS = ("Api", "Api-persistent", "Api-cached")
+    # tools that load one endpoint at a time (h2load: HTTP/1.1 runs only)
+    TOOLS = ("h2load", "wrk", "k6", "loadgen")
+    # time per request breakdown: (label, slower variant, faster variant)
+    SEGMENTS = (
+        ("Framework overhead (cached response)", None, "Api-cached"),
+        ("Query, ORM and serialization", "Api-persistent", "Api-cached"),
+        ("Connection setup", "Api", "Api-persistent"),
+    )
+
+    def __init__(self, index):
+        self.index = index
+
+    def plot_variants(self):
+        """
+        Plots the goodput of the api, api-persistent and api-cached endpoints side by side per
+        tool and framework, and splits the time per request (1000 / goodput, in ms) of the api
+        endpoint into connection setup, query/ORM/serialization and fixed framework overhead.
+        """
+        tools = []
+        for tool in self.TOOLS:
+            records = [
+                r
+                for r in self.index.records(tool)
+                if r["benchmark"] in self.VARIANTS
+                and r["goodput"]
+                and r["metrics"].get("protocol", "h1") == "h1"
+            ]
+            if {r["benchmark"] for r in records} - {"Api"}:
+                tools.append((tool, records))
+        if len(tools) == 0:
+            print("No api variant (api-persistent, api-cached) log files found.")
+            return
+
+        fig = make_subplots(
+            rows=len(tools),
+            cols=2,
+            subplot_titles=[
+                title
+                for tool, _ in tools
+                for title in (f"{tool}: goodput per variant", f"{tool}: time per request")
+            ],
+        )
+        colors = px.colors.qualitative.Plotly
+        for row, (tool, records) in enumerate(tools, start=1):
+            goodputs = group_trials(records, lambda r: r["goodput"])
+            medians = {
+                variant: {
+                    compared["framework"]: compared
+                    for compared in FrameworkComparator(goodputs.get(variant, {})).compare()
+                }
+                for variant in self.VARIANTS
+            }
+            # frameworks ordered by the goodput of the plain api endpoint
+            frameworks = sorted(
+                {framework for variant in medians.values() for framework in variant},
+                key=lambda framework: -medians["Api"].get(framework, {"median": 0})["median"],
+            )
+
+            for i, variant in enumerate(self.VARIANTS):
+                compared = [medians[variant][f] for f in frameworks if f in medians[variant]]
+                fig.add_trace(
+                    go.Bar(
+                        x=[c["framework"] for c in compared],
+                        y=[c["median"] for c in compared],
+                        name=variant,
+                        legendgroup=variant,
+                        showlegend=row == 1,
+                        marker=dict(color=colors[i]),
+                        error_y=error_bars(compared),
+                        text=[f"{c['median']:.0f}" for c in compared],
+                    ),
+                    row=row,
+                    col=1,
+                )
+
+            # the breakdown needs all three variants of a framework
+            complete = [f for f in frameworks if all(f in medians[v] for v in self.VARIANTS)]
+            cost = {
+                variant: {f: 1000 / medians[variant][f]["median"] for f in complete}
+                for variant in self.VARIANTS
+            }
+            base = [0.0] * len(complete)
+            for i, (label, slower, faster) in enumerate(self.SEGMENTS):
+                values = [
+                    max(0.0, cost[slower][f] - cost[faster][f]) if slower else cost[faster][f]
+                    for f in complete
+                ]
+                fig.add_trace(
+                    go.Bar(
+                        x=complete,
+                        y=values,
+                        base=base,
+                        # bars of one offset group are drawn on top of each other (stacked)
+                        offsetgroup="breakdown",
+                        name=label,
+                        legendgroup=label,
+                        showlegend=row == 1,
+                        marker=dict(color=colors[len(self.VARIANTS) + i]),
+                        hovertemplate="%{x}: %{y:.3f} ms<extra>" + label + "</extra>",
+                    ),
+                    row=row,
+                    col=2,
+                )
+                base = [b + v for b, v in zip(base, values)]
+
+            fig.update_yaxes(title_text="Goodput (successful req/s)", row=row, col=1)
+            fig.update_yaxes(title_text="ms per request (1000 / goodput)", row=row, col=2)
+
+        fig.update_layout(
+            height=450 * len(tools),
+            barmode="group",
+            title_text="api endpoint: persistent connections and result caching",
+        )
+
+        export_file = output_dir + "api-variants-charts.html"
+        write_figure(fig, export_file)
+        print(f"api variant charts exported to {export_file}")
+
+
+class ServerTimingPlotter:
+    # phases reported by the endpoints, in request order; unknown phases are appended
+    PHASES = ("bootstrap", "db", "cache", "serialize", "render")
+
+    def __init__(self, index):
+        self.index = index
+
+    def plot_server_timing(self):
+        """
+        Plots where the time of a request goes per benchmark and framework: the Server-Timing
+        phases reported by the application (stacked), the rest of the PHP time (total minus the
+        phases) and the time outside PHP (mean client latency minus the total: nginx, FastCGI,
+        queueing and network). Repeated runs are averaged.
+        """
+        records = [r for r in self.index.records("loadgen") if r["metrics"].get("server_timing")]
+        if len(records) == 0:
+            print(
+                "No loadgen log files with Server-Timing headers found "
+                "(enable loadgen in tests.conf)."
+            )
+            return
+
+        benchmarks = sorted({r["benchmark"] for r in records})
+        fig = make_subplots(
+            rows=len(benchmarks),
+            cols=1,
+            subplot_titles=[f"{benchmark}: time per request" for benchmark in benchmarks],
+        )
+        colors = px.colors.qualitative.Plotly
+        segments = [
+            p
+            for p in dict.fromkeys(
+                self.PHASES
+                + tuple(phase for r in records for phase in r["metrics"]["server_timing"])
+            )
+            if p != "total" and any(p in r["metrics"]["server_timing"] for r in records)
+        ] + ["other PHP", "outside PHP (nginx, queueing, network)"]
+
+        for row, benchmark in enumerate(benchmarks, start=1):
+            runs = {}
+            for r in records:
+                if r["benchmark"] == benchmark:
+                    runs.setdefault(r["framework"], []).append(r)
+            breakdown = {}
+            for framework, framework_runs in runs.items():
+                timing = {}
+                for r in framework_runs:
+                    for phase, duration in r["metrics"]["server_timing"].items():
+                        timing[phase] = timing.get(phase, 0.0) + duration / len(framework_runs)
+                latency = np.mean([r["latency_ms"] for r in framework_runs])
+                phases = sum(timing.get(p, 0.0) for p in segments[:-2])
+                total = timing.get("total", phases)
+                timing["other PHP"] = max(0.0, total - phases)
+                timing[segments[-1]] = max(0.0, latency - total)
+                breakdown[framework] = timing
+            frameworks = sorted(
+                breakdown, key=lambda f: sum(breakdown[f].get(p, 0.0) for p in segments)
+            )
+
+            base = [0.0] * len(frameworks)
+            for i, segment in enumerate(segments):
+                values = [breakdown[f].get(segment, 0.0) for f in frameworks]
+                fig.add_trace(
+                    go.Bar(
+                        x=frameworks,
+                        y=values,
+                        base=base,
+                        # bars of one offset group are drawn on top of each other (stacked)
+                        offsetgroup="timing",
+                        name=segment,
+                        legendgroup=segment,
+                        showlegend=row == 1,
+                        marker=dict(color=colors[i % len(colors)]),
+                        hovertemplate="%{x}: %{y:.3f} ms<extra>" + segment + "</extra>",
+                    ),
+                    row=row,
+                    col=1,
+                )
+                base = [b + v for b, v in zip(base, values)]
+            fig.update_yaxes(title_text="Mean time per request (ms)", row=row, col=1)
+
+        fig.update_layout(
+            height=450 * len(benchmarks),
+            barmode="group",
+            title_text=(
+                "Server-side request timing breakdown (Server-Timing headers)"
+                f"<br>(loadgen {records[-1]['command_args']})"
+            ),
+        )
+
+        export_file = output_dir + "server-timing-charts.html"
+        write_figure(fig, export_file)
+        print(f"Server-Timing charts exported to {export_file}")
+
+
+class WarmupPlotter:
+    def __init__(self, index):
+        self.index = index
+
+    def plot_warmup(self):
+        """
+        Creates bar charts of the warm-up duration detected in every run with a per second
+        series (k6 point output, loadgen), one row per tool. Repeated runs are combined
+        by their median with confidence interval.
+        """
+        records = [r for r in self.index.records() if r["steady_state"]]
+        if len(records) == 0:
+            print("No per second series found for the warm-up detection.")
+            return
+
+        tools = sorted({r["tool"] for r in records})
+        benchmark_names = sorted({r["benchmark"] for r in records})
+        fig = make_subplots(
+            rows=len(tools),
+            cols=len(benchmark_names),
+            subplot_titles=[
+                f"{tool} | Benchmark: {bench_name}"
+                for tool in tools
+                for bench_name in benchmark_names
+            ],
+        )
+
+        for i, tool in enumerate(tools, start=1):
+            warmups = group_trials(
+                [r for r in records if r["tool"] == tool],
+                lambda r: r["steady_state"]["warmup_seconds"],
+            )
+            for col, benchmark_name in enumerate(benchmark_names, start=1):
+                if benchmark_name not in warmups:
+                    continue
+                # Order by warm-up duration in ascending order
+                rows = FrameworkComparator(warmups[benchmark_name], False).compare()
+                best = rows[0]["framework"]
+                fig.add_trace(
+                    comparison_bar(
+                        rows, lambda row: f"{row['median']:.0f} s" + significance_marker(row, best)
+                    ),
+                    row=i,
+                    col=col,
+                )
+                fig.update_yaxes(title_text="Warm-up (s), lower is better", row=i, col=col)
+
+        fig.update_layout(
+            height=400 * len(tools) + 100,
+            title_text="Warm-up duration until steady state (MSER-5)",
+        )
+
+        # Export to HTML
+        export_file = output_dir + "warmup-charts.html"
+        write_figure(fig, export_file)
+        print(f"Warm-up charts exported to {export_file}")
 
-        try:
-            avg_duration = log_data["metrics"][
-                "http_req_duration{expected_response:true}"
-            ]["avg"]
-            req_rate = log_data["metrics"]["http_reqs"]["rate"]
-            checks_perc_value = log_data["metrics"]["checks"]["value"]
-            vus_max = log_data["metrics"]["vus_max"]["value"]
-        except KeyError:
-            print(f"Error: Could not find relevant data in log file: {file_path}")
-            return None, None
 
-        return avg_duration, req_rate, checks_perc_value, vus_max
+class ResourcePlotter:
+    # tools that run at a constant load (saturation/sweep probe several loads in one run)
+    TOOLS = ("h2load", "wrk", "wrk2", "k6", "loadgen")
+
+    def __init__(self, index):
+        self.index = index
+
+    @staticmethod
+    def cpu_per_1000_requests(record, container):
+        """
+        CPU-seconds a container used per 1000 requests over the busy part of the run.
+        """
+        resources = record["resources"]
+        requests = record["rps"] * resources["busy_seconds"]
+        return resources["containers"][container]["cpu_seconds"] * 1000 / requests
+
+    def plot_resources(self):
+        """
+        Creates charts of the server side cost of every framework, one html file per tool:
+        RPS per core, CPU-seconds per 1000 requests and peak RSS (stacked by container).
+        Repeated runs are combined by their median (RPS per core with confidence interval).
+        """
+        records = [
+            r
+            for r in self.index.records()
+            if r["tool"] in self.TOOLS
+            and r["resources"]
+            and r["rps"]
+            and r["resources"]["busy_seconds"] > 0
+            and r["resources"]["cores"] > 0
+        ]
+        if len(records) == 0:
+            print("No server resource samples found.")
+            return
+
+        for tool in sorted({r["tool"] for r in records}):
+            self.plot_tool(tool, [r for r in records if r["tool"] == tool])
+
+    def plot_tool(self, tool, records):
+        # one column per benchmark and h2load protocol
+        rps_per_core = group_trials(
+            records, lambda r: r["rps"] / r["resources"]["cores"], key=benchmark_label
+        )
+        runs = group_trials(records, lambda r: r, key=benchmark_label)
+        containers = sorted({name for r in records for name in r["resources"]["containers"]})
+
+        benchmark_names = sorted(runs)
+        fig = make_subplots(
+            rows=3,
+            cols=len(benchmark_names),
+            subplot_titles=[f"Benchmark: {bench_name}" for bench_name in benchmark_names],
+        )
+
+        col = 1
+        for benchmark_name in benchmark_names:
+            # Order by requests per second per busy core in descending order
+            rows = FrameworkComparator(rps_per_core[benchmark_name]).compare()
+            best = rows[0]["framework"]
+            fig.add_trace(
+                comparison_bar(
+                    rows, lambda row: f"{row['median']:.1f}" + significance_marker(row, best)
+                ),
+                row=1,
+                col=col,
+            )
+
+            # CPU-seconds per 1000 requests and peak RSS, stacked by container
+            frameworks = [row["framework"] for row in rows]
+            for container in containers:
+                cpu, rss = [], []
+                for framework in frameworks:
+                    framework_runs = [
+                        r
+                        for r in runs[benchmark_name][framework]
+                        if container in r["resources"]["containers"]
+                    ]
+                    cpu.append(
+                        float(
+                            np.median(
+                                [self.cpu_per_1000_requests(r, container) for r in framework_runs]
+                            )
+                        )
+                        if framework_runs
+                        else 0.0
+                    )
+                    rss.append(
+                        float(
+                            np.median(
+                                [
+                                    r["resources"]["containers"][container]["peak_rss_mb"]
+                                    for r in framework_runs
+                                ]
+                            )
+                        )
+                        if framework_runs
+                        else 0.0
+                    )
+                fig.add_trace(
+                    go.Bar(
+                        x=frameworks,
+                        y=cpu,
+                        name=container,
+                        legendgroup=container,
+                        showlegend=col == 1,
+                        hovertemplate="%{x}: %{y:.3f} CPU-s",
+                    ),
+                    row=2,
+                    col=col,
+                )
+                fig.add_trace(
+                    go.Bar(
+                        x=frameworks,
+                        y=rss,
+                        name=container,
+                        legendgroup=container,
+                        showlegend=False,
+                        hovertemplate="%{x}: %{y:.1f} MB",
+                    ),
+                    row=3,
+                    col=col,
+                )
+
+            fig.update_xaxes(title_text="Framework", row=3, col=col)
+            fig.update_yaxes(title_text="Req/Sec per core", row=1, col=col)
+            fig.update_yaxes(title_text="CPU-seconds / 1000 requests", row=2, col=col)
+            fig.update_yaxes(title_text="Peak RSS (MB)", row=3, col=col)
+            col += 1
+
+        fig.update_layout(
+            height=1100,
+            title_text=f"Server resources per framework<br>({command_args_text(tool, records)})",
+            barmode="stack",
+        )
+
+        # Export to HTML
+        export_file = output_dir + f"resources-{tool}-charts.html"
+        write_figure(fig, export_file)
+        print(f"{tool} resource charts exported to {export_file}")
+
+
+class ColdStartPlotter:
+    def __init__(self, index):
+        self.index = index
+
+    def plot_coldstart(self):
+        """
+        Creates charts of the time until the first 200 response after a reset (median of all
+        cold starts with confidence interval) and of the latency of the first requests.
+        """
+        records = self.index.records("coldstart")
+        if len(records) == 0:
+            print("No coldstart log files found.")
+            return
+
+        # every run of every trial is one cold start
+        runs = {}
+        for record in records:
+            benchmark = runs.setdefault(record["benchmark"], {})
+            benchmark.setdefault(record["framework"], []).extend(record["metrics"]["runs"])
+
+        benchmark_names = sorted(runs)
+        fig = make_subplots(
+            rows=2,
+            cols=len(benchmark_names),
+            subplot_titles=[f"Benchmark: {bench_name}" for bench_name in benchmark_names],
+        )
+
+        for col, benchmark_name in enumerate(benchmark_names, start=1):
+            time_to_first_ok = {
+                framework: [run["time_to_first_ok_ms"] for run in framework_runs]
+                for framework, framework_runs in runs[benchmark_name].items()
+            }
+            # Order by time to the first 200 in ascending order
+            rows = FrameworkComparator(time_to_first_ok, False).compare()
+            best = rows[0]["framework"]
+            fig.add_trace(
+                comparison_bar(
+                    rows, lambda row: f"{row['median']:.0f} ms" + significance_marker(row, best)
+                ),
+                row=1,
+                col=col,
+            )
+            for row in rows:
+                color = framework_color(row["framework"])
+                # median latency of the n-th request after the cold start
+                latencies = [run["latencies_ms"] for run in runs[benchmark_name][row["framework"]]]
+                length = min(len(values) for values in latencies)
+                medians = np.median([values[:length] for values in latencies], axis=0)
+                fig.add_trace(
+                    go.Scatter(
+                        x=np.arange(1, length + 1),
+                        y=medians,
+                        mode="lines+markers",
+                        name=row["framework"],
+                        legendgroup=row["framework"],
+                        showlegend=col == 1,
+                        line=dict(color=color),
+                    ),
+                    row=2,
+                    col=col,
+                )
+
+            fig.update_yaxes(title_text="Time to first 200 (ms)", row=1, col=col)
+            fig.update_xaxes(title_text="Request after the cold start", row=2, col=col)
+            fig.update_yaxes(title_text="Latency (ms)", type="log", row=2, col=col)
+
+        command_args = records[-1]["command_args"]
+        fig.update_layout(
+            height=900,
+            title_text=f"Cold start: time to first response and first requests latency"
+            f"<br>(coldstart {command_args})",
+        )
+
+        # Export to HTML
+        export_file = output_dir + "coldstart-charts.html"
+        write_figure(fig, export_file)
+        print(f"Cold start charts exported to {export_file}")
+
+
+class MatrixPlotter:
+    # tools that run at a constant load
+    TOOLS = ("h2load", "wrk", "wrk2", "k6", "loadgen")
+
+    def __init__(self, index):
+        self.index = index
+
+    def plot_matrix(self):
+        """
+        Plots, per tool, a goodput heatmap (php-fpm workers x cores) per framework and benchmark,
+        and the per-core scaling efficiency: the goodput of the best worker count at each core
+        count divided by (cores / fewest cores) times the goodput at the fewest cores.
+        """
+        exported = False
+        for tool in self.TOOLS:
+            records = [r for r in self.index.records(tool, matrix=True) if r["goodput"]]
+            if len(records) == 0:
+                continue
+            # median goodput of the trials: {benchmark: {framework: {(workers, cores): goodput}}}
+            points = {}
+            for record in records:
+                point = (record["matrix"]["workers"], record["matrix"]["cores"])
+                # h2load protocols are separate benchmarks
+                benchmark = points.setdefault(benchmark_label(record), {})
+                benchmark.setdefault(record["framework"], {}).setdefault(point, []).append(
+                    record["goodput"]
+                )
+            benchmark_names = sorted(points)
+            frameworks = sorted({f for benchmark in points.values() for f in benchmark})
+
+            fig = make_subplots(
+                rows=len(frameworks) + 1,
+                cols=len(benchmark_names),
+                subplot_titles=[
+                    f"{framework}: {bench}" for framework in frameworks for bench in benchmark_names
+                ]
+                + [f"Scaling efficiency per core: {bench}" for bench in benchmark_names],
+                vertical_spacing=0.2 / (len(frameworks) + 1),
+            )
+            colors = px.colors.qualitative.Plotly
+            for col, benchmark_name in enumerate(benchmark_names, start=1):
+                for row, framework in enumerate(frameworks, start=1):
+                    goodputs = {
+                        point: float(np.median(values))
+                        for point, values in points[benchmark_name].get(framework, {}).items()
+                    }
+                    if not goodputs:
+                        continue
+                    workers = sorted({w for w, _ in goodputs})
+                    cores = sorted({c for _, c in goodputs})
+                    z = [[goodputs.get((w, c)) for c in cores] for w in workers]
+                    fig.add_trace(
+                        go.Heatmap(
+                            x=[str(c) for c in cores],
+                            y=[str(w) for w in workers],
+                            z=z,
+                            text=[[f"{v:.0f}" if v is not None else "" for v in zs] for zs in z],
+                            texttemplate="%{text}",
+                            colorscale="Viridis",
+                            showscale=False,
+                            hovertemplate=(
+                                "%{y} workers, %{x} cores: %{z:.0f} req/s<extra>"
+                                + framework
+                                + "</extra>"
+                            ),
+                        ),
+                        row=row,
+                        col=col,
+                    )
+                    fig.update_xaxes(title_text="Cores", type="category", row=row, col=col)
+                    fig.update_yaxes(
+                        title_text="php-fpm workers", type="category", row=row, col=col
+                    )
+
+                    # best worker count at each core count, relative to linear scaling
+                    best = [max(g for (_, c), g in goodputs.items() if c == core) for core in cores]
+                    efficiency = [
+                        100 * goodput / (best[0] * core / cores[0])
+                        for goodput, core in zip(best, cores)
+                    ]
+                    fig.add_trace(
+                        go.Scatter(
+                            x=cores,
+                            y=efficiency,
+                            mode="lines+markers",
+                            name=framework,
+                            legendgroup=framework,
+                            showlegend=col == 1,
+                            line=dict(color=colors[(row - 1) % len(colors)]),
+                            customdata=[g / core for g, core in zip(best, cores)],
+                            hovertemplate=(
+                                "%{x} cores: %{y:.0f}% (%{customdata:.0f} req/s per core)"
+                            ),
+                        ),
+                        row=len(frameworks) + 1,
+                        col=col,
+                    )
+                fig.update_xaxes(title_text="Cores", row=len(frameworks) + 1, col=col)
+                fig.update_yaxes(
+                    title_text="Efficiency (% of linear)", row=len(frameworks) + 1, col=col
+                )
+
+            fig.update_layout(
+                height=350 * (len(frameworks) + 1),
+                title_text=(
+                    f"{tool}: goodput (successful req/s) per php-fpm workers and cores"
+                    f"<br>({tool} {records[-1]['command_args']})"
+                ),
+            )
+            export_file = output_dir + f"matrix-{tool}-charts.html"
+            write_figure(fig, export_file)
+            print(f"{tool} workers/cores matrix charts exported to {export_file}")
+            exported = True
+
+        if not exported:
+            print("No workers/cores matrix log files found.")
+
+
+class TrendPlotter:
+    def __init__(self, history):
+        self.history = history
+
+    def plot_trends(self):
+        """
+        Plots the goodput (requests/sec for tools without one) and the p99 latency of every
+        framework over the runs of the run history, one row per benchmark and tool. A point is
+        the median of the trials of a run; its hover shows the git commit and the framework
+        package versions of the run. The runs of the workers/cores matrix are left out.
+        """
+        runs = {run["run_id"]: run for run in self.history.runs()}
+        if len(runs) < 2:
+            print("Not enough runs in the run history for trend charts (at least 2).")
+            return
+        rows = [r for r in self.history.metrics() if not r["matrix"] and r["run_id"] in runs]
+        tests = sorted({(r["benchmark"], r["tool"], r["variant"]) for r in rows})
+        frameworks = sorted({r["framework"] for r in rows})
+
+        fig = make_subplots(
+            rows=len(tests),
+            cols=2,
+            subplot_titles=[
+                f"{benchmark} {tool}{' ' + variant if variant else ''}: {metric}"
+                for benchmark, tool, variant in tests
+                for metric in ("goodput", "p99 latency")
+            ],
+        )
+        for row, test in enumerate(tests, start=1):
+            trials = {}
+            for r in rows:
+                if (r["benchmark"], r["tool"], r["variant"]) == test:
+                    trials.setdefault(r["framework"], {}).setdefault(r["run_id"], []).append(r)
+            for framework in frameworks:
+                run_ids = sorted(trials.get(framework, {}), key=lambda i: runs[i]["started"])
+                for col, metric in enumerate(("throughput", "p99_ms"), start=1):
+                    points = [
+                        (run_id, np.median(values))
+                        for run_id in run_ids
+                        if (values := metric_values(trials[framework][run_id], metric))
+                    ]
+                    if not points:
+                        continue
+                    fig.add_trace(
+                        go.Scatter(
+                            x=[pd.Timestamp(runs[run_id]["started"]) for run_id, _ in points],
+                            y=[value for _, value in points],
+                            mode="lines+markers",
+                            name=framework,
+                            legendgroup=framework,
+                            showlegend=row == 1 and col == 1,
+                            line=dict(color=framework_color(framework)),
+                            text=[self.describe(runs[run_id], framework) for run_id, _ in points],
+                            hovertemplate="%{y:.2f}<br>%{text}<extra>" + framework + "</extra>",
+                        ),
+                        row=row,
+                        col=col,
+                    )
+            fig.update_yaxes(title_text="Goodput (req/s)", row=row, col=1)
+            fig.update_yaxes(title_text="p99 latency (ms)", row=row, col=2)
+
+        fig.update_layout(
+            height=400 * len(tests),
+            title_text=f"Benchmark results over time ({len(runs)} runs)",
+        )
+
+        export_file = output_dir + "trend-charts.html"
+        write_figure(fig, export_file)
+        print(f"Trend charts exported to {export_file}")
+
+    @staticmethod
+    def describe(run, framework):
+        versions = run.get("versions") or {}
+        git = versions.get("git") or {}
+        packages = (versions.get("composer") or {}).get(framework, {})
+        lines = [f"run {run['run_id']}", f"git {git.get('describe') or '?'}"]
+        if versions.get("php"):
+            lines.append(f"PHP {versions['php']}")
+        lines += [f"{package} {version}" for package, version in packages.items()]
+        return "<br>".join(lines)
+
+
+class PercentilePlotter:
+    def __init__(self, index):
+        self.index = index
+
+    def plot_percentiles(self):
+        """
+        Creates grouped bar charts of the p50/p90/p99/p99.9 latencies reported by every tool,
+        one row per tool and one column per benchmark.
+        """
+        results = {}
+        for record in self.index.records():
+            if record["latency_percentiles"]:
+                tool_results = results.setdefault(record["tool"], {})
+                tool_results.setdefault(record["benchmark"], []).append(record)
+
+        if len(results) == 0:
+            print("No latency percentiles found.")
+            return
+
+        benchmark_names = sorted({b for tool in results.values() for b in tool})
+        fig = make_subplots(
+            rows=len(results),
+            cols=len(benchmark_names),
+            subplot_titles=[
+                f"{tool} | Benchmark: {bench}" for tool in results for bench in benchmark_names
+            ],
+        )
+
+        for row, (tool, benchmarks) in enumerate(results.items(), start=1):
+            for col, benchmark_name in enumerate(benchmark_names, start=1):
+                # combine repeated runs of the same framework
+                runs = group_trials(benchmarks.get(benchmark_name, []), lambda r: r)
+                combined = sorted(
+                    (
+                        (framework, combined_percentiles(runs[benchmark_name][framework]))
+                        for framework in runs.get(benchmark_name, {})
+                    ),
+                    key=lambda item: item[1].get("p50", 0),
+                )
+                for percentile in LATENCY_PERCENTILES:
+                    values = [percentiles.get(percentile) for _, percentiles in combined]
+                    if all(value is None for value in values):
+                        continue
+                    fig.add_trace(
+                        go.Bar(
+                            x=[framework for framework, _ in combined],
+                            y=values,
+                            name=percentile,
+                            legendgroup=percentile,
+                            showlegend=row == 1 and col == 1,
+                            text=[f"{v:.1f}" if v is not None else "" for v in values],
+                        ),
+                        row=row,
+                        col=col,
+                    )
+                fig.update_yaxes(title_text="Latency (ms)", row=row, col=col)
+
+        fig.update_layout(
+            height=400 * len(results),
+            title_text="Latency percentiles by tool (lower is better)",
+            barmode="group",
+        )
+
+        export_file = output_dir + "latency-percentiles-charts.html"
+        write_figure(fig, export_file)
+        print(f"Latency percentile charts exported to {export_file}")
 
 
 class K6DataGatherer:
-    def __init__(self, results_dir):
-        self.results_dir = results_dir
+    def __init__(self, index):
+        self.index = index
 
     def gather_k6_data(self):
-        """Gathers data from all log files"""
-        data = {}
-        for filename in os.listdir(self.results_dir):
-            if filename.endswith(".k6.log"):
-                extractor = FilenameExtractor(filename)
-                framework_name, benchmark_name = extractor.extract_info_from_filename()
-                if benchmark_name not in data:
-                    data[benchmark_name] = {
-                        "frameworks": [],
-                        "avg_durations": [],
-                        "req_rates": [],
-                        "checks_perc_value": [],
-                        "vus_max": [],
-                    }
+        """Gathers data from all k6 records, grouped by benchmark and framework (all trials)"""
+        records = self.index.records("k6")
+        avg_durations = group_trials(records, lambda r: r["latency_ms"])
+        req_rates = group_trials(records, lambda r: r["goodput"])
+        checks_perc_value = group_trials(records, lambda r: r["metrics"]["checks"])
+        vus_max = group_trials(records, lambda r: r["metrics"]["vus_max"])
+        # runs with point output, without their warm-up
+        steady = [r for r in records if r["steady_state"]]
+        steady_durations = group_trials(steady, lambda r: r["steady_state"]["latency_ms"])
+        steady_rates = group_trials(steady, lambda r: r["steady_state"]["rps"])
 
-                avg_duration, req_rate, checks_perc_value, vus_max = K6DataExtractor(
-                    framework_name, benchmark_name
-                ).extract_k6_data()
-                if avg_duration is None or req_rate is None:
-                    continue
-                data[benchmark_name]["frameworks"].append(framework_name)
-                data[benchmark_name]["avg_durations"].append(avg_duration)
-                data[benchmark_name]["req_rates"].append(req_rate)
-                data[benchmark_name]["checks_perc_value"].append(checks_perc_value)
-                data[benchmark_name]["vus_max"].append(vus_max)
+        data = {}
+        for benchmark_name in sorted(avg_durations):
+            data[benchmark_name] = {
+                "avg_durations": avg_durations[benchmark_name],
+                "req_rates": req_rates[benchmark_name],
+                "checks_perc_value": checks_perc_value[benchmark_name],
+                "vus_max": max(max(v) for v in vus_max[benchmark_name].values()),
+                "steady_avg_durations": steady_durations.get(benchmark_name, {}),
+                "steady_req_rates": steady_rates.get(benchmark_name, {}),
+            }
 
         return data
 
 
 class K6Plotter:
-    def __init__(self, results_dir):
-        self.results_dir = results_dir
+    def __init__(self, index):
+        self.index = index
 
     def plot_k6(self):
         """Creates bar charts using Plotly"""
-        data = K6DataGatherer(self.results_dir).gather_k6_data()
-        if data is None:
-            print("No k6 log files found.")
-            return
-        metrics = ["Avg Duration (ms)", "Req Rate (req/s)"]
+        data = K6DataGatherer(self.index).gather_k6_data()
+        runs = group_trials(self.index.records("k6"), lambda r: r)
+        metrics = ["Avg Duration (ms)", "Goodput (req/s)"]
         num_test_names = len(data)
         if num_test_names == 0:
             print("No k6 log files found.")
@@ -575,34 +3164,30 @@ class K6Plotter:
         for i, test_name in enumerate(data):
             test_data = data[test_name]
 
-            for j, metric in enumerate(metrics):
-                y_data = (
-                    sorted(
-                        zip(
-                            test_data["avg_durations"],
-                            test_data["frameworks"],
-                            test_data["checks_perc_value"],
-                        )
-                    )
-                    if metric == "Avg Duration (ms)"
-                    else sorted(
-                        zip(
-                            test_data["req_rates"],
-                            test_data["frameworks"],
-                            test_data["checks_perc_value"],
-                        ),
-                        reverse=True,
+            for view, prefix in (("whole", ""), ("steady", "steady_")):
+                if not test_data[prefix + "req_rates"]:
+                    continue
+                for j, metric in enumerate(metrics):
+                    rows = (
+                        FrameworkComparator(test_data[prefix + "avg_durations"], False).compare()
+                        if metric == "Avg Duration (ms)"
+                        else FrameworkComparator(test_data[prefix + "req_rates"]).compare()
                     )
-                )
-
-                for value, framework, perc_value in y_data:
+                    best = rows[0]["framework"]
+                    checks = {
+                        framework: float(np.median(values))
+                        for framework, values in test_data["checks_perc_value"].items()
+                    }
                     fig.add_trace(
-                        go.Bar(
-                            x=[framework],
-                            y=[value],
-                            name=framework,
-                            text=f"{value:.1f} | OK: {100*perc_value:.1f}%",
+                        comparison_bar(
+                            rows,
+                            lambda row: f"{row['median']:.1f} | OK: "
+                            f"{100 * checks[row['framework']]:.1f}%"
+                            + significance_marker(row, best)
+                            + noise_marker(runs.get(test_name, {}).get(row["framework"], [])),
                             textposition="auto",
+                            meta=view,
+                            visible=view == "whole",
                         ),
                         row=j + 1,
                         col=i + 1,
@@ -612,49 +3197,400 @@ class K6Plotter:
             fig.update_yaxes(
                 title_text="Avg. Duration / Latency (ms)", row=1, col=i + 1
             )
-            fig.update_yaxes(title_text="Req. Rates (req/s)", row=2, col=i + 1)
+            fig.update_yaxes(title_text="Goodput (successful req/s)", row=2, col=i + 1)
 
         # Customize layout (optional)
         fig.update_layout(
             height=1080,
             title_text="k6 benchmark results (ramping-vus max. = "
-            + str(data[test_name]["vus_max"][0])
+            + str(data[test_name]["vus_max"])
             + ")",  # supposing that all tests have the same vus
         )
+        add_steady_state_toggle(fig)
 
         # Export to a single HTML file
         export_file = output_dir + "k6-charts.html"
-        fig.write_html(export_file)
+        write_figure(fig, export_file)
         print(f"k6 bar charts exported to {export_file}")
 
 
-if __name__ == "__main__":
-    # Dockerfile.python work directory
-    work_dir = "/usr/src/app"
+class K6EndpointPlotter:
+    def __init__(self, index):
+        self.index = index
 
-    # Directory containing the log files
-    output_dir = work_dir + "/results/"
+    def plot_k6_endpoints(self):
+        """
+        Breaks the k6 runs of the mixed scenarios (scenarios.conf) down per endpoint: goodput
+        stacked per framework, p95 latency and error rate per endpoint (medians of the trials).
+        """
+        records = [r for r in self.index.records("k6") if len(r["metrics"]["endpoints"]) > 1]
+        if len(records) == 0:
+            print("No k6 mixed scenario log files found.")
+            return
+        runs = group_trials(records, lambda r: r["metrics"]["endpoints"])
+        scenario_names = sorted(runs)
 
-    # Check if the output directory exists
-    if not os.path.exists(output_dir):
-        print(f"Error: Output directory {output_dir} not found.")
-        exit(1)
+        titles = ("Goodput per endpoint", "p95 latency per endpoint", "Error rate per endpoint")
+        fig = make_subplots(
+            rows=len(titles),
+            cols=len(scenario_names),
+            subplot_titles=[f"{title}: {name}" for title in titles for name in scenario_names],
+        )
 
-    # Exclude the following directories from the count
-    counter = FileCounter(work_dir + "/www/html", ["storage", "var", "logs", "cache", "writable"])
-    total_files = counter.count_files()
+        colors = px.colors.qualitative.Plotly
+        for col, scenario_name in enumerate(scenario_names, start=1):
+            trials = runs[scenario_name]
+            endpoint_names = sorted(
+                {endpoint for t in trials.values() for endpoints in t for endpoint in endpoints}
+            )
 
-    plotter = FilePlotter(total_files)
-    plotter.plot_total_number_of_files()
+            def median(framework, endpoint, key):
+                values = [t[endpoint][key] for t in trials[framework] if endpoint in t]
+                values = [value for value in values if value is not None]
+                return float(np.median(values)) if values else None
 
-    h2load_plotter = H2LoadPlotter(output_dir)
+            # frameworks ordered by total goodput in descending order
+            frameworks = sorted(
+                trials,
+                key=lambda f: -sum(median(f, e, "goodput") or 0 for e in endpoint_names),
+            )
+            base = [0.0] * len(frameworks)
+            for i, endpoint in enumerate(endpoint_names):
+                color = colors[i % len(colors)]
+                goodputs = [median(f, endpoint, "goodput") or 0.0 for f in frameworks]
+                shares = [median(f, endpoint, "share") or 0.0 for f in frameworks]
+                fig.add_trace(
+                    go.Bar(
+                        x=frameworks,
+                        y=goodputs,
+                        base=base,
+                        # bars of one offset group are drawn on top of each other (stacked)
+                        offsetgroup="goodput",
+                        name=endpoint,
+                        legendgroup=endpoint,
+                        showlegend=col == 1,
+                        marker=dict(color=color),
+                        customdata=shares,
+                        hovertemplate="%{x}: %{y:.1f} req/s (%{customdata:.1f}% of the requests)",
+                    ),
+                    row=1,
+                    col=col,
+                )
+                base = [b + g for b, g in zip(base, goodputs)]
+                for row, key in ((2, "p95"), (3, "error_rate")):
+                    fig.add_trace(
+                        go.Bar(
+                            x=frameworks,
+                            y=[median(f, endpoint, key) for f in frameworks],
+                            name=endpoint,
+                            legendgroup=endpoint,
+                            showlegend=False,
+                            marker=dict(color=color),
+                        ),
+                        row=row,
+                        col=col,
+                    )
+
+            fig.update_yaxes(title_text="Goodput (successful req/s)", row=1, col=col)
+            fig.update_yaxes(title_text="p95 latency (ms)", row=2, col=col)
+            fig.update_yaxes(title_text="Errors (%)", row=3, col=col)
+
+        fig.update_layout(
+            height=1100,
+            barmode="group",
+            title_text=f"k6 mixed scenarios per endpoint<br>(k6 {records[-1]['command_args']})",
+        )
+
+        export_file = output_dir + "k6-endpoints-charts.html"
+        write_figure(fig, export_file)
+        print(f"k6 endpoint charts exported to {export_file}")
+
+
+class K6TimeSeriesPlotter:
+    def __init__(self, index):
+        self.index = index
+
+    def plot_k6_timeseries(self):
+        """
+        Creates line charts of throughput and p95 latency over time, against the active VUs of
+        the ramping scenario. Repeated runs are combined by the median of every second.
+        """
+        rows = [
+            dict(benchmark=r["benchmark"], framework=r["framework"], **window)
+            for r in self.index.records("k6")
+            for window in r["metrics"].get("series", [])
+        ]
+        if len(rows) == 0:
+            print("No k6 point output (--out json) found.")
+            return
+
+        df = (
+            pd.DataFrame(rows)
+            .groupby(["benchmark", "framework", "t"], as_index=False)
+            .median(numeric_only=True)
+        )
+        benchmark_names = sorted(df["benchmark"].unique())
+        frameworks = sorted(df["framework"].unique())
+        fig = make_subplots(
+            rows=2,
+            cols=len(benchmark_names),
+            specs=[[{"secondary_y": True}] * len(benchmark_names)] * 2,
+            subplot_titles=[f"Benchmark: {bench_name}" for bench_name in benchmark_names],
+        )
+
+        for col, benchmark_name in enumerate(benchmark_names, start=1):
+            bench = df[df["benchmark"] == benchmark_name]
+            for framework in frameworks:
+                series = bench[bench["framework"] == framework]
+                if series.empty:
+                    continue
+                for row, metric in ((1, "rps"), (2, "p95")):
+                    # WebGL traces: one point per second and framework adds up quickly
+                    fig.add_trace(
+                        go.Scattergl(
+                            x=series["t"],
+                            y=series[metric],
+                            mode="lines",
+                            name=framework,
+                            legendgroup=framework,
+                            showlegend=col == 1 and row == 1,
+                            line=dict(color=framework_color(framework)),
+                            customdata=series[["vus", "error_rate"]],
+                            hovertemplate=f"{framework}: %{{y:.1f}}<br>VUs: %{{customdata[0]:.0f}}"
+                            "<br>Errors: %{customdata[1]:.2f}%",
+                        ),
+                        row=row,
+                        col=col,
+                        secondary_y=False,
+                    )
+
+            # the VU ramp is the same for every framework
+            vus = bench.groupby("t", as_index=False)["vus"].median()
+            for row in (1, 2):
+                fig.add_trace(
+                    go.Scattergl(
+                        x=vus["t"],
+                        y=vus["vus"],
+                        mode="lines",
+                        name="Active VUs",
+                        legendgroup="vus",
+                        showlegend=col == 1 and row == 1,
+                        line=dict(color="grey", dash="dot"),
+                    ),
+                    row=row,
+                    col=col,
+                    secondary_y=True,
+                )
+
+            fig.update_xaxes(title_text="Time (s)", row=2, col=col)
+            fig.update_yaxes(title_text="Req/Sec", row=1, col=col, secondary_y=False)
+            fig.update_yaxes(title_text="p95 latency (ms)", row=2, col=col, secondary_y=False)
+            fig.update_yaxes(title_text="VUs", row=1, col=col, secondary_y=True)
+            fig.update_yaxes(title_text="VUs", row=2, col=col, secondary_y=True)
+
+        fig.update_layout(height=900, title_text="k6 throughput and p95 latency over time")
+
+        # Export to HTML
+        export_file = output_dir + "k6-timeseries-charts.html"
+        write_figure(fig, export_file)
+        print(f"k6 time series charts exported to {export_file}")
+
+
+def open_index(args):
+    """
+    Scans and parses the log files once (all subcommands share the same index) and stores the
+    run of results/manifest.json in the run history, unless the tools were restricted.
+    """
+    index = ResultsIndex(output_dir, tools=args.tools).refresh(jobs=args.jobs)
+    history = RunHistory(output_dir + "history.sqlite3")
+    if args.tools:
+        print("Run history not updated: --tools selects a part of the results only.")
+    else:
+        # Keep the results of the last run (results/manifest.json) in the run history
+        history.add_manifest(
+            output_dir + "manifest.json", index.records() + index.records(matrix=True)
+        )
+    return index, history
+
+
+def parse(args):
+    index, _ = open_index(args)
+    for tool in index.tools:
+        records = index.records(tool) + index.records(tool, matrix=True)
+        if records:
+            noisy = [r for r in records if r["quality"] and r["quality"]["flags"]]
+            print(f"{tool}: {len(records)} results" + (f", {len(noisy)} noisy" if noisy else ""))
+    return 0
+
+
+def summary(args):
+    if args.output in (None, "-"):
+        # the standard output only gets the summary, progress messages go to stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            index, _ = open_index(args)
+    else:
+        index, _ = open_index(args)
+    StatisticsReporter(index).report(args.output or "-", args.format)
+    return 0
+
+
+def plot(args):
+    import_plotting()
+
+    if not args.tools:
+        # Exclude the following directories from the count
+        counter = FileCounter(args.www, ["storage", "var", "logs", "cache", "writable"])
+        total_files = counter.count_files()
+
+        plotter = FilePlotter(total_files)
+        plotter.plot_total_number_of_files()
+
+    index, history = open_index(args)
+
+    h2load_plotter = H2LoadPlotter(index)
     h2load_plotter.plot_h2load()
 
-    wrk_plotter = WrkPlotter(output_dir)
+    wrk_plotter = WrkPlotter(index)
     wrk_plotter.plot_wrk()
 
-    wrk2_plotter = Wrk2Plotter(output_dir)
+    wrk2_plotter = Wrk2Plotter(index)
     wrk2_plotter.plot_wrk2()
 
-    k6_plotter = K6Plotter(output_dir)
+    k6_plotter = K6Plotter(index)
     k6_plotter.plot_k6()
+
+    k6_endpoint_plotter = K6EndpointPlotter(index)
+    k6_endpoint_plotter.plot_k6_endpoints()
+
+    k6_timeseries_plotter = K6TimeSeriesPlotter(index)
+    k6_timeseries_plotter.plot_k6_timeseries()
+
+    loadgen_plotter = LoadgenPlotter(index)
+    loadgen_plotter.plot_loadgen()
+
+    saturation_plotter = SaturationPlotter(index)
+    saturation_plotter.plot_saturation()
+
+    sweep_plotter = SweepPlotter(index)
+    sweep_plotter.plot_sweep()
+
+    payload_plotter = PayloadPlotter(index)
+    payload_plotter.plot_payload()
+
+    variant_plotter = VariantPlotter(index)
+    variant_plotter.plot_variants()
+
+    server_timing_plotter = ServerTimingPlotter(index)
+    server_timing_plotter.plot_server_timing()
+
+    coldstart_plotter = ColdStartPlotter(index)
+    coldstart_plotter.plot_coldstart()
+
+    warmup_plotter = WarmupPlotter(index)
+    warmup_plotter.plot_warmup()
+
+    resource_plotter = ResourcePlotter(index)
+    resource_plotter.plot_resources()
+
+    matrix_plotter = MatrixPlotter(index)
+    matrix_plotter.plot_matrix()
+
+    percentile_plotter = PercentilePlotter(index)
+    percentile_plotter.plot_percentiles()
+
+    statistics_reporter = StatisticsReporter(index)
+    statistics_reporter.report()
+
+    trend_plotter = TrendPlotter(history)
+    trend_plotter.plot_trends()
+
+    # All charts in one page, plotly.js loaded once
+    dashboard.write(output_dir + "dashboard.html")
+    return 0
+
+
+def compare(args):
+    history = RunHistory(output_dir + "history.sqlite3")
+    return compare_runs(
+        history, args.run, args.baseline, args.threshold, args.sigmas, args.window
+    )
+
+
+COMMANDS = {"parse": parse, "summary": summary, "plot": plot, "compare": compare}
+
+
+def main(argv=None):
+    global output_dir
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--results",
+        default=os.path.join(BASE_DIR, "results"),
+        help="directory with the log files, where the charts are written",
+    )
+    common.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of processes used to parse the log files (1 = serial, default: all cores)",
+    )
+    common.add_argument(
+        "--tools",
+        type=lambda value: value.split(","),
+        help=f"comma separated tools to read (default: all of {','.join(ResultsIndex.TOOLS)})",
+    )
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = arg_parser.add_subparsers(dest="command")
+    subparsers.add_parser("parse", parents=[common], help="parse the log files")
+    summary_parser = subparsers.add_parser(
+        "summary", parents=[common], help="export the statistics as CSV or JSON"
+    )
+    summary_parser.add_argument("--format", choices=("csv", "json"), default="csv")
+    summary_parser.add_argument(
+        "-o", "--output", help="output file (default: the standard output)"
+    )
+    plot_parser = subparsers.add_parser("plot", parents=[common], help="write the charts")
+    plot_parser.add_argument(
+        "--www",
+        default=os.path.join(BASE_DIR, "www", "html"),
+        help="framework installations counted for the framework size chart",
+    )
+    compare_parser = subparsers.add_parser(
+        "compare", parents=[common], help="compare a run of the run history with a baseline"
+    )
+    compare_parser.add_argument("--run", help="run id to check (default: the latest run)")
+    compare_parser.add_argument(
+        "--baseline", help="run id to compare with (default: the run before --run)"
+    )
+    compare_parser.add_argument(
+        "--threshold", type=float, default=5.0, help="minimum relative change (%%) to report"
+    )
+    compare_parser.add_argument(
+        "--sigmas", type=float, default=3.0, help="noise multiples a change must exceed"
+    )
+    compare_parser.add_argument(
+        "--window", type=int, default=10, help="previous runs used for the run-to-run noise"
+    )
+
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # without a subcommand (as run by runner.py), plot
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv.insert(0, "plot")
+    args = arg_parser.parse_args(argv)
+    if args.tools and not set(args.tools) <= set(ResultsIndex.TOOLS):
+        arg_parser.error(
+            f"--tools must be a comma separated list of {', '.join(ResultsIndex.TOOLS)}"
+        )
+
+    output_dir = os.path.join(args.results, "")
+    # Check if the output directory exists
+    if not os.path.exists(output_dir):
+        print(f"Error: Output directory {output_dir} not found.")
+        return 1
+    return COMMANDS[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
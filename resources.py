@@ -0,0 +1,216 @@
+"""Server-side resource sampling of the benchmark containers (cgroup v2).
+
+ResourceSampler runs in a background thread while a benchmark tool runs and
+appends one JSON line per interval to a side file of the log
+(<domain>.<test>.<tool>.resources.jsonl) with the cumulative CPU time, the
+memory usage and the anonymous (RSS) memory of every server container, and
+the number of php-fpm worker processes. summarize_resources() turns such a
+file into the CPU-seconds, peak memory and average busy cores of the run.
+
+The cgroup files are read directly from /sys/fs/cgroup, so sampling works on
+a Linux host with cgroup v2 (not inside Docker Desktop's VM).
+"""
+
+import json
+import os
+import subprocess
+import threading
+import time
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+# Containers of the benchmarked stack (see docker-compose.yml)
+SERVER_CONTAINERS = ("php_fpm_bench", "nginx_bench", "mariadb_bench", "redis_bench")
+
+
+def resources_path(log_path):
+    """
+    Side file of a log file: laravel.bench.api.wrk.log -> laravel.bench.api.wrk.resources.jsonl
+    """
+    return log_path[: -len(".log")] + ".resources.jsonl"
+
+
+def container_cgroup(name):
+    """
+    Returns the cgroup v2 directory of a running container, None if it is not accessible.
+    """
+    try:
+        inspect = subprocess.run(
+            ["docker", "inspect", "-f", "{{.State.Pid}}", name], capture_output=True, text=True
+        )
+        pid = int(inspect.stdout.strip() or 0)
+        if pid == 0:
+            return None
+        with open(f"/proc/{pid}/cgroup") as f:
+            for line in f:
+                # cgroup v2 has a single hierarchy: "0::/system.slice/docker-<id>.scope"
+                if line.startswith("0::"):
+                    directory = os.path.join(CGROUP_ROOT, line[3:].strip().lstrip("/"))
+                    if os.path.isfile(os.path.join(directory, "cpu.stat")):
+                        return directory
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def read_keyed_file(path):
+    """
+    Reads a cgroup "key value" file (cpu.stat, memory.stat) into a dict of ints.
+    """
+    values = {}
+    with open(path) as f:
+        for line in f:
+            key, _, value = line.partition(" ")
+            if value.strip().isdigit():
+                values[key] = int(value)
+    return values
+
+
+def count_fpm_workers(directory):
+    """
+    Counts the php-fpm pool worker processes (not the master) of a cgroup.
+    """
+    workers = 0
+    with open(os.path.join(directory, "cgroup.procs")) as f:
+        pids = f.read().split()
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                if f.read().startswith(b"php-fpm: pool"):
+                    workers += 1
+        except OSError:
+            # the worker exited in the meantime (pm = ondemand)
+            continue
+    return workers
+
+
+class ResourceSampler:
+    def __init__(self, path, containers=SERVER_CONTAINERS, interval=0.5):
+        self.path = path
+        self.containers = containers
+        self.interval = interval
+        self.cgroups = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        sample = {"t": time.time(), "containers": {}}
+        for name, directory in self.cgroups.items():
+            try:
+                memory_stat = read_keyed_file(os.path.join(directory, "memory.stat"))
+                with open(os.path.join(directory, "memory.current")) as f:
+                    memory = int(f.read())
+                stats = {
+                    "cpu_usec": read_keyed_file(os.path.join(directory, "cpu.stat"))["usage_usec"],
+                    "memory": memory,
+                    "rss": memory_stat.get("anon", 0),
+                }
+                if name == "php_fpm_bench":
+                    sample["fpm_workers"] = count_fpm_workers(directory)
+            except (OSError, KeyError, ValueError):
+                continue
+            sample["containers"][name] = stats
+        return sample
+
+    def _run(self, f):
+        with f:
+            while True:
+                f.write(json.dumps(self.sample()) + "\n")
+                f.flush()
+                if self._stop.wait(self.interval):
+                    break
+
+    def start(self):
+        """
+        Starts sampling in a background thread. Returns False if no container cgroup is readable.
+        """
+        for name in self.containers:
+            directory = container_cgroup(name)
+            if directory is not None:
+                self.cgroups[name] = directory
+        if not self.cgroups:
+            return False
+        f = open(self.path, "w")
+        self._thread = threading.Thread(target=self._run, args=(f,), daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def summarize_resources(path, busy_threshold=0.1):
+    """
+    Summarizes a resources file over the busy part of the run, i.e. the intervals in which the
+    stack used more than busy_threshold of its peak CPU rate (this leaves out the tool start up
+    and the idle tail). Returns the busy seconds, the CPU-seconds per container and in total,
+    the average busy cores, the peak memory/RSS (MB) per container and in total, and the
+    maximum number of php-fpm workers.
+    """
+    with open(path) as f:
+        samples = [json.loads(line) for line in f if line.strip()]
+    if len(samples) < 2:
+        raise ValueError(f"Not enough resource samples in {path}")
+    names = sorted({name for sample in samples for name in sample["containers"]})
+
+    intervals = []
+    for previous, current in zip(samples, samples[1:]):
+        elapsed = current["t"] - previous["t"]
+        cpu = {
+            name: (
+                current["containers"][name]["cpu_usec"] - previous["containers"][name]["cpu_usec"]
+            )
+            / 1e6
+            for name in names
+            if name in current["containers"] and name in previous["containers"]
+        }
+        if elapsed > 0:
+            intervals.append((elapsed, cpu))
+    if not intervals:
+        raise ValueError(f"Not enough resource samples in {path}")
+
+    peak_rate = max(sum(cpu.values()) / elapsed for elapsed, cpu in intervals)
+    busy = [
+        (elapsed, cpu)
+        for elapsed, cpu in intervals
+        if peak_rate > 0 and sum(cpu.values()) / elapsed >= busy_threshold * peak_rate
+    ]
+    busy_seconds = sum(elapsed for elapsed, _ in busy)
+    cpu_seconds = {name: sum(cpu.get(name, 0.0) for _, cpu in busy) for name in names}
+
+    def peak(key, name=None):
+        return max(
+            sum(
+                stats[key]
+                for container, stats in sample["containers"].items()
+                if name is None or container == name
+            )
+            for sample in samples
+        ) / 2**20
+
+    return {
+        "busy_seconds": busy_seconds,
+        "cpu_seconds": sum(cpu_seconds.values()),
+        "cores": sum(cpu_seconds.values()) / busy_seconds if busy_seconds else 0.0,
+        "peak_memory_mb": peak("memory"),
+        "peak_rss_mb": peak("rss"),
+        "fpm_workers": max(sample.get("fpm_workers", 0) for sample in samples),
+        "containers": {
+            name: {
+                "cpu_seconds": cpu_seconds[name],
+                "peak_memory_mb": peak("memory", name),
+                "peak_rss_mb": peak("rss", name),
+            }
+            for name in names
+        },
+    }
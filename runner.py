@@ -0,0 +1,831 @@
+"""Run the benchmark matrix and log every result for plot.py.
+
+Reads benchmarks.conf, frameworks.conf and tests.conf, runs every
+framework/endpoint/tool combination (optionally repeated, interleaved and
+shuffled per trial) and writes the logs to the results directory, together
+with a machine readable run manifest (results/manifest.json). The weighted
+endpoint mixes of scenarios.conf are run with k6 like an extra endpoint.
+
+Instead of a fixed sleep after each test, the runner waits until the server
+containers are back to their idle CPU usage and a probe request is back to
+its baseline latency (capped by --max-cooldown). Tool containers are started
+once and reused, and an interrupted matrix can be resumed with --resume.
+
+The host is sampled before and during every test (see hostnoise.py): a test
+whose samples show steal time, I/O wait, other load or a CPU frequency drop
+is rerun up to --noise-retries times, its quality score and flags are kept
+in the manifest.
+
+With --matrix, the whole matrix is rerun for every (php-fpm workers, cores)
+point: the php-fpm pool and the cores of the php-fpm container are changed
+between the points and the logs are tagged with w<workers>c<cores>.
+
+Usage:
+    python3 runner.py [-n repetitions] [--resume] [--matrix 4:1,8:2,16:4]
+"""
+
+import argparse
+import configparser
+import json
+import os
+import platform
+import random
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+
+from hostnoise import HostSampler, host_path, quality_text, summarize_host
+from resources import SERVER_CONTAINERS, ResourceSampler, resources_path
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Docker images (and command, if it is not the image entrypoint) of the external tools
+TOOL_IMAGES = {
+    "h2load": ("openquantumsafe/h2load", ["h2load"]),
+    "wrk": ("williamyeh/wrk", []),
+    "wrk2": ("cylab/wrk2", []),
+}
+
+# Python scripts (and subcommand) of the built-in tools, which write their own JSON log
+PYTHON_TOOLS = {
+    "loadgen": ["loadgen.py", "run"],
+    "saturation": ["loadgen.py", "saturate"],
+    "sweep": ["loadgen.py", "sweep"],
+    "payload": ["loadgen.py", "payload"],
+    "coldstart": ["coldstart.py"],
+}
+
+# Tools that only apply to some endpoints (the row limit sweep needs an api endpoint)
+TOOL_ENDPOINTS = {"payload": ("api", "api-persistent", "api-cached")}
+
+# nginx port of each protocol of the h2load protocol mode (h2c: prior knowledge, see nginx.conf)
+PROTOCOL_PORTS = {"h1": 8080, "h2c": 8081}
+
+# k6 ramp stages (duration, target VUs) and think time (s) of the single endpoint tests
+K6_STAGES = [("10s", 100), ("10s", 200), ("10s", 400)]
+K6_THINK_TIME = 1.0
+
+# Framework packages whose installed version (www/html/<framework>/composer.lock) is recorded
+FRAMEWORK_PACKAGES = (
+    "laravel/framework",
+    "laravel/octane",
+    "symfony/framework-bundle",
+    "doctrine/orm",
+    "codeigniter4/framework",
+    "pocketarc/codeigniter",
+)
+
+# Text that only appears in the log of a completed run
+COMPLETE_MARKERS = {"h2load": "finished in", "wrk": "requests in", "wrk2": "requests in"}
+
+
+def read_list(path):
+    """
+    Reads a whitespace separated list from a .conf file, skipping comments.
+    """
+    with open(path) as f:
+        return [
+            item for line in f if not line.lstrip().startswith("#") for item in line.split()
+        ]
+
+
+def read_tests(path):
+    """
+    Reads tests.conf lines like "wrk=-c 100 -t 1 -d 10" into [(tool, options)].
+    """
+    tests = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            tool, options = line.split("=", 1)
+            tests.append((tool.strip(), options.strip()))
+    return tests
+
+
+def read_scenarios(path):
+    """
+    Reads the weighted endpoint mixes of scenarios.conf, one section per scenario:
+
+        [mixed]
+        endpoints = hello:80 api:20
+        think_time = 0.5
+        stages = 10s:100 10s:200 10s:400
+
+    into {name: {"endpoints": [(endpoint, weight)], "think_time": s, "stages": [(duration, vus)]}}.
+    think_time and stages are optional (defaults of the single endpoint k6 test).
+    """
+    config = configparser.ConfigParser()
+    config.read(path)
+    scenarios = {}
+    for name in config.sections():
+        section = config[name]
+        if "." in name:
+            raise ValueError(f"{path}: scenario names cannot contain dots ({name})")
+        try:
+            endpoints = []
+            for item in section["endpoints"].split():
+                endpoint, _, weight = item.partition(":")
+                endpoints.append((endpoint, float(weight or 1)))
+            stages = [
+                (duration, int(target))
+                for duration, _, target in (
+                    stage.partition(":") for stage in section.get("stages", "").split()
+                )
+            ]
+            think_time = section.getfloat("think_time", K6_THINK_TIME)
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"{path}: invalid scenario {name}: {e}") from e
+        if not endpoints or any(weight <= 0 for _, weight in endpoints):
+            raise ValueError(f"{path}: scenario {name} needs endpoints with positive weights")
+        scenarios[name] = {
+            "endpoints": endpoints,
+            "think_time": think_time,
+            "stages": stages or K6_STAGES,
+        }
+    return scenarios
+
+
+def k6_script(endpoints, stages=K6_STAGES, think_time=K6_THINK_TIME):
+    """
+    Renders k6/script.template.js for a list of (endpoint name, URL, weight): every iteration
+    requests one endpoint picked by weight and tags the request with the endpoint name.
+    """
+    with open(os.path.join(BASE_DIR, "k6", "script.template.js")) as f:
+        script = f.read()
+    values = {
+        "ENDPOINTS": [
+            {"name": name, "url": url, "weight": weight} for name, url, weight in endpoints
+        ],
+        "STAGES": [{"duration": duration, "target": target} for duration, target in stages],
+        "THINK_TIME": think_time,
+    }
+    for key, value in values.items():
+        script = script.replace(f"{{{{ {key} }}}}", json.dumps(value))
+    return script
+
+
+def is_complete(path, tool):
+    """
+    Checks whether a log file holds the results of a completed run.
+    """
+    if not os.path.isfile(path) or os.path.getsize(path) == 0:
+        return False
+    with open(path, errors="replace") as f:
+        content = f.read()
+    if tool in COMPLETE_MARKERS:
+        return COMPLETE_MARKERS[tool] in content
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return False
+    return "metrics" in data if tool == "k6" else data.get("tool") == tool
+
+
+class ToolContainer:
+    """
+    Runs an external benchmark tool inside a long-lived container (docker exec), so a new
+    container does not have to boot for every test. Falls back to one container per run
+    when the image cannot be kept alive (e.g. no sleep binary).
+    """
+
+    def __init__(self, tool, image, command, cpuset=None):
+        self.name = f"bench_tool_{tool}"
+        self.image = image
+        self.command = command
+        self.exec_command = command
+        # docker --cpuset-cpus of the tool (runner.py --client-cpus)
+        self.options = ["--cpuset-cpus", cpuset] if cpuset else []
+        self.persistent = False
+
+    def start(self):
+        inspect_argv = ["docker", "image", "inspect", "-f", "{{json .Config.Entrypoint}}", self.image]
+        inspect = subprocess.run(inspect_argv, capture_output=True, text=True)
+        if inspect.returncode != 0:
+            subprocess.run(["docker", "pull", "-q", self.image], capture_output=True)
+            inspect = subprocess.run(inspect_argv, capture_output=True, text=True)
+        entrypoint = json.loads(inspect.stdout or "null") or []
+        self.exec_command = self.command or entrypoint
+        subprocess.run(["docker", "rm", "-f", self.name], capture_output=True)
+        started = subprocess.run(
+            ["docker", "run", "-d", "--rm", "--network=host", "-u", str(os.getuid()),
+             *self.options, "--name", self.name, "--entrypoint", "sleep", self.image, "infinity"],
+            capture_output=True,
+        )
+        self.persistent = started.returncode == 0 and bool(self.exec_command)
+
+    def argv(self, args):
+        if self.persistent:
+            return ["docker", "exec", self.name] + self.exec_command + args
+        # a fresh container runs the image entrypoint itself
+        return ["docker", "run", "--rm", "--network=host", "-u", str(os.getuid()),
+                *self.options, self.image] + self.command + args
+
+    def stop(self):
+        if self.persistent:
+            subprocess.run(["docker", "rm", "-f", self.name], capture_output=True)
+
+
+class ServerMonitor:
+    """
+    Measures the server load (CPU usage of the stack containers) and the latency of
+    a probe request, to decide when the server has cooled down after a test.
+    """
+
+    def __init__(self, cpu_margin=5.0, latency_factor=1.5):
+        self.cpu_margin = cpu_margin
+        self.latency_factor = latency_factor
+        self.baseline_cpu = None
+        self.baseline_latency = {}
+
+    def cpu_usage(self):
+        """
+        Total CPU usage (percent of one core) of the server containers, None if unavailable.
+        """
+        try:
+            stats = subprocess.run(
+                ["docker", "stats", "--no-stream", "--format", "{{.Name}} {{.CPUPerc}}"]
+                + list(SERVER_CONTAINERS),
+                capture_output=True,
+                text=True,
+            )
+        except OSError:
+            return None
+        if stats.returncode != 0:
+            return None
+        total = 0.0
+        for line in stats.stdout.splitlines():
+            try:
+                total += float(line.split()[1].rstrip("%"))
+            except (IndexError, ValueError):
+                continue
+        return total
+
+    @staticmethod
+    def probe_latency(url, timeout=5.0):
+        """
+        Latency (ms) of a single request, None on error.
+        """
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as response:
+                response.read()
+        except (urllib.error.URLError, OSError):
+            return None
+        return (time.perf_counter() - start) * 1000
+
+    def measure_baseline(self, probe_url, samples=5):
+        if self.baseline_cpu is None:
+            self.baseline_cpu = self.cpu_usage()
+        if probe_url not in self.baseline_latency:
+            latencies = [self.probe_latency(probe_url) for _ in range(samples)]
+            latencies = [latency for latency in latencies if latency is not None]
+            self.baseline_latency[probe_url] = statistics.median(latencies) if latencies else None
+
+    def cooldown(self, probe_url, min_wait=1.0, max_wait=30.0):
+        """
+        Waits until CPU usage and probe latency are back to their baseline (at least min_wait,
+        at most max_wait seconds). Returns the time waited.
+        """
+        start = time.monotonic()
+        time.sleep(min_wait)
+        baseline_latency = self.baseline_latency.get(probe_url)
+        while time.monotonic() - start < max_wait:
+            cpu = self.cpu_usage()
+            cpu_ok = cpu is None or self.baseline_cpu is None or (
+                cpu <= self.baseline_cpu + self.cpu_margin
+            )
+            latency = self.probe_latency(probe_url) if baseline_latency else None
+            latency_ok = baseline_latency is None or (
+                latency is not None and latency <= baseline_latency * self.latency_factor + 1.0
+            )
+            if cpu_ok and latency_ok:
+                break
+            time.sleep(0.5)
+        else:
+            print(f"Cooldown capped at {max_wait:.0f}s, the server did not return to its baseline.")
+        return time.monotonic() - start
+
+
+class FpmMatrix:
+    """
+    Applies one (php-fpm workers, cores) point of the matrix mode: a pool override with a static
+    number of workers (conf/php-fpm.d/zz-matrix.conf, read after www.conf and zz-docker.conf)
+    and a compose override pinning the php-fpm service to the last <cores> CPUs of the host
+    (docker-compose.matrix.yml), then recreates the php-fpm container. restore() removes both.
+    """
+
+    POOL_FILE = os.path.join(BASE_DIR, "conf", "php-fpm.d", "zz-matrix.conf")
+    COMPOSE_FILE = os.path.join(BASE_DIR, "docker-compose.matrix.yml")
+
+    def __init__(self, probe_url):
+        self.probe_url = probe_url
+
+    @staticmethod
+    def compose(*files):
+        argv = ["docker", "compose"]
+        for compose_file in ("docker-compose.yml",) + files:
+            argv += ["-f", os.path.join(BASE_DIR, compose_file)]
+        subprocess.run(argv + ["up", "-d", "--force-recreate", "php-fpm"], check=True)
+
+    def wait_ready(self, timeout=120.0):
+        start = time.monotonic()
+        while ServerMonitor.probe_latency(self.probe_url) is None:
+            if time.monotonic() - start > timeout:
+                raise TimeoutError(f"{self.probe_url} is not responding after {timeout:g}s")
+            time.sleep(1)
+
+    def apply(self, workers, cores):
+        cpus = os.cpu_count() or 1
+        if cores > cpus:
+            raise ValueError(f"Cannot pin php-fpm to {cores} cores, the host has {cpus}")
+        with open(self.POOL_FILE, "w") as f:
+            f.write(
+                "; generated by runner.py --matrix, removed at the end of the run\n"
+                "[www]\n"
+                "pm = static\n"
+                f"pm.max_children = {workers}\n"
+            )
+        with open(self.COMPOSE_FILE, "w") as f:
+            f.write(
+                "# generated by runner.py --matrix, removed at the end of the run\n"
+                "services:\n"
+                "  php-fpm:\n"
+                f'    cpuset: "{cpus - cores}-{cpus - 1}"\n'
+                f"    cpus: {cores}\n"
+                "    environment:\n"
+                f"      - OCTANE_WORKERS={workers}\n"
+            )
+        self.compose(os.path.basename(self.COMPOSE_FILE))
+        self.wait_ready()
+
+    def restore(self):
+        for path in (self.POOL_FILE, self.COMPOSE_FILE):
+            if os.path.exists(path):
+                os.remove(path)
+        self.compose()
+        self.wait_ready()
+
+
+def git_info(directory=BASE_DIR):
+    """
+    Commit of the benchmark repository, None if git is not available.
+    """
+
+    def git(*args):
+        result = subprocess.run(["git", "-C", directory, *args], capture_output=True, text=True)
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    try:
+        commit = git("rev-parse", "HEAD")
+    except OSError:
+        return None
+    if commit is None:
+        return None
+    return {"commit": commit, "describe": git("describe", "--always", "--dirty")}
+
+
+def composer_versions(frameworks):
+    """
+    Installed versions of the framework packages, read from the composer.lock of each framework.
+    """
+    versions = {}
+    for framework in frameworks:
+        lock_file = os.path.join(BASE_DIR, "www", "html", framework, "composer.lock")
+        try:
+            with open(lock_file) as f:
+                packages = json.load(f)["packages"]
+        except (OSError, ValueError, KeyError):
+            continue
+        versions[framework] = {
+            package["name"]: package["version"]
+            for package in packages
+            if package.get("name") in FRAMEWORK_PACKAGES
+        }
+    return versions
+
+
+def php_version():
+    try:
+        result = subprocess.run(
+            ["docker", "exec", "php_fpm_bench", "php", "-r", "echo PHP_VERSION;"],
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def host_info():
+    """
+    Host description: name, platform, CPU model and count, memory (GB).
+    """
+    info = {
+        "hostname": platform.node(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "cpu_model": None,
+        "memory_gb": None,
+    }
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    info["cpu_model"] = line.split(":", 1)[1].strip()
+                    break
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    info["memory_gb"] = round(int(line.split()[1]) / 2**20, 1)
+                    break
+    except (OSError, ValueError):
+        pass
+    return info
+
+
+class Manifest:
+    """
+    Machine readable record of a benchmark run, rewritten after every test.
+    The run id (start time) identifies the run in the run history of plot.py.
+    """
+
+    def __init__(self, path, settings, frameworks=()):
+        self.path = path
+        started = datetime.now(timezone.utc)
+        self.data = {
+            "run_id": started.strftime("%Y%m%dT%H%M%SZ"),
+            "started": started.isoformat(),
+            "finished": None,
+            "host": host_info(),
+            "versions": {
+                "git": git_info(),
+                "php": php_version(),
+                "composer": composer_versions(frameworks),
+            },
+            "settings": settings,
+            "runs": [],
+        }
+
+    def add(self, entry):
+        self.data["runs"].append(entry)
+        self.save()
+
+    def finish(self):
+        self.data["finished"] = datetime.now(timezone.utc).isoformat()
+        self.save()
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class BenchmarkRunner:
+    def __init__(self, args):
+        self.args = args
+        self.results_dir = os.path.abspath(args.results)
+        os.makedirs(self.results_dir, exist_ok=True)
+        self.benchmarks = read_list(os.path.join(BASE_DIR, "benchmarks.conf"))
+        self.domains = [f"{f}.bench" for f in read_list(os.path.join(BASE_DIR, "frameworks.conf"))]
+        self.tests = read_tests(os.path.join(BASE_DIR, "tests.conf"))
+        scenarios_file = os.path.join(BASE_DIR, "scenarios.conf")
+        self.scenarios = read_scenarios(scenarios_file) if os.path.exists(scenarios_file) else {}
+        self.monitor = ServerMonitor()
+        self.containers = {}
+        # cleared when the container cgroups turn out to be unreadable
+        self.sample_resources = True
+        self.manifest = Manifest(
+            os.path.join(self.results_dir, "manifest.json"),
+            {
+                "repetitions": args.repetitions,
+                "benchmarks": self.benchmarks,
+                "domains": self.domains,
+                "tests": [f"{tool}={options}" for tool, options in self.tests],
+                "scenarios": self.scenarios,
+                "min_cooldown": args.min_cooldown,
+                "max_cooldown": args.max_cooldown,
+                "resume": args.resume,
+                "sample_interval": args.sample_interval,
+                "protocols": args.protocols,
+                "matrix": args.matrix,
+                "client_cpus": args.client_cpus,
+                "noise_retries": args.noise_retries,
+            },
+            [domain.split(".")[0] for domain in self.domains],
+        )
+
+    def url(self, domain, test, port=8080):
+        return f"http://{domain}:{port}/benchmarking/{test}"
+
+    def container(self, tool):
+        if tool not in self.containers:
+            image, command = TOOL_IMAGES[tool]
+            container = ToolContainer(tool, image, list(command), self.args.client_cpus)
+            container.start()
+            self.containers[tool] = container
+        return self.containers[tool]
+
+    def command(self, tool, options, url, log_file, script=None):
+        """
+        Returns (argv, stdin file, whether stdout is the log) for one test.
+        script is the k6 script of a scenario (default: the single endpoint of url).
+        """
+        if tool in PYTHON_TOOLS:
+            script, *subcommand = PYTHON_TOOLS[tool]
+            argv = [sys.executable, os.path.join(BASE_DIR, script)] + subcommand
+            options = shlex.split(options)
+            if self.args.client_cpus and subcommand and "--cpus" not in options:
+                # loadgen worker processes (-p) are pinned to the client CPUs
+                options += ["--cpus", self.args.client_cpus]
+            return argv + options + ["-o", log_file, url], None, False
+        if tool == "k6":
+            if script is None:
+                script = k6_script([(url.rsplit("/", 1)[-1], url, 1)])
+            script_file = os.path.join(BASE_DIR, "k6", "script.js")
+            with open(script_file, "w") as f:
+                f.write(script)
+            cpuset = ["--cpuset-cpus", self.args.client_cpus] if self.args.client_cpus else []
+            argv = ["docker", "run", "--rm", "--network=host", "-u", str(os.getuid()), "-i",
+                    *cpuset, "-v", f"{self.results_dir}:/results", "grafana/k6", "run",
+                    "--summary-export", f"/results/{os.path.basename(log_file)}",
+                    # per request points, aggregated per second by plot.py (K6StreamAggregator)
+                    "--out", f"json=/results/{os.path.basename(log_file)[:-4]}.points.jsonl.gz",
+                    "-"]
+            return argv + shlex.split(options), script_file, False
+        return self.container(tool).argv(shlex.split(options) + [url]), None, True
+
+    def run_test(self, domain, test, tool, options, tag, port=8080, script=None):
+        log_file = os.path.join(self.results_dir, f"{domain}.{test}{tag}.{tool}.log")
+        url = self.url(domain, test, port)
+        if script is not None:
+            # a scenario mixes several endpoints
+            url = f"{self.url(domain, '', port)} ({test} scenario)"
+        trials = [part for part in tag.split(".") if part.isdigit()]
+        entry = {
+            "domain": domain,
+            "framework": domain.split(".")[0],
+            "benchmark": test,
+            "tool": tool,
+            "options": options,
+            "trial": int(trials[0]) if trials else None,
+            "log": os.path.relpath(log_file, self.results_dir),
+        }
+        if self.args.resume and is_complete(log_file, tool):
+            print(f"Skipping {tool} at {url}{' (trial ' + trials[0] + ')' if trials else ''}: already done")
+            self.manifest.add(dict(entry, status="skipped"))
+            return
+
+        probe_url = self.url(domain, "hello")
+        self.monitor.measure_baseline(probe_url)
+
+        for attempt in range(1, self.args.noise_retries + 2):
+            returncode, started, duration, sampler, host_sampler = self.run_tool(
+                tool, options, url, log_file, script
+            )
+            cooldown = self.monitor.cooldown(
+                probe_url, self.args.min_cooldown, self.args.max_cooldown
+            )
+            print(f"Cooled down in {cooldown:.1f}s")
+            host = self.host_quality(host_sampler)
+            if host is None or not host["flags"] or attempt > self.args.noise_retries:
+                break
+            retries = f"{attempt}/{self.args.noise_retries}"
+            print(f"Noisy host, {quality_text(host)}: retrying ({retries})")
+        if host is not None and host["flags"]:
+            print(f"Warning: noisy host, {quality_text(host)}")
+        self.manifest.add(
+            dict(
+                entry,
+                status="ok" if returncode == 0 and is_complete(log_file, tool) else "failed",
+                returncode=returncode,
+                started=datetime.fromtimestamp(started, timezone.utc).isoformat(),
+                duration=duration,
+                cooldown=cooldown,
+                resources=os.path.basename(sampler.path) if sampler else None,
+                attempts=attempt,
+                quality={"score": host["score"], "flags": host["flags"]} if host else None,
+            )
+        )
+
+    def run_tool(self, tool, options, url, log_file, script=None):
+        """
+        Runs one tool while sampling the server containers and the host.
+        Returns (return code, start time, duration, resource sampler, host sampler), the
+        samplers are None if they could not be started.
+        """
+        print("")
+        print(f"..:: Running {tool} tests at {url} ::..")
+        print("")
+        argv, stdin_file, log_stdout = self.command(tool, options, url, log_file, script)
+        # sample the server containers' CPU and memory while the tool runs
+        sampler = None
+        if self.args.sample_interval > 0 and self.sample_resources:
+            sampler = ResourceSampler(resources_path(log_file), interval=self.args.sample_interval)
+            if not sampler.start():
+                print("Warning: container cgroups are not readable, resources are not sampled.")
+                self.sample_resources = False
+                sampler = None
+        # host noise (steal, iowait, other load, CPU frequency) before and during the run
+        host_sampler = None
+        if self.args.sample_interval > 0:
+            host_sampler = HostSampler(host_path(log_file), interval=self.args.sample_interval)
+            if not host_sampler.start():
+                host_sampler = None
+        started = time.time()
+        stdin = open(stdin_file) if stdin_file else subprocess.DEVNULL
+        try:
+            if log_stdout:
+                with open(log_file, "w") as log:
+                    # First line stores the command line options/args
+                    log.write(options + "\n")
+                    process = subprocess.Popen(argv, stdin=stdin, stdout=subprocess.PIPE, text=True)
+                    for line in process.stdout:
+                        sys.stdout.write(line)
+                        log.write(line)
+                    returncode = process.wait()
+            else:
+                returncode = subprocess.run(argv, stdin=stdin).returncode
+        finally:
+            if stdin_file:
+                stdin.close()
+            if sampler is not None:
+                sampler.stop()
+            if host_sampler is not None:
+                host_sampler.stop()
+        return returncode, started, time.time() - started, sampler, host_sampler
+
+    @staticmethod
+    def host_quality(host_sampler):
+        """
+        Quality score and noise flags of a run, None if the host was not sampled.
+        """
+        if host_sampler is None:
+            return None
+        try:
+            return summarize_host(host_sampler.path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: could not summarize {host_sampler.path}: {e}")
+            return None
+
+    def run_protocols(self, domain, test, options, tag):
+        """
+        Runs h2load once per protocol with the same options (and concurrency), logging each
+        run with the protocol tag: <domain>.<test>.<protocol>[.<trial>].h2load.log
+        """
+        for protocol in self.args.protocols:
+            # without --h1, h2load speaks HTTP/2 with prior knowledge over cleartext (h2c)
+            protocol_options = [option for option in shlex.split(options) if option != "--h1"]
+            if protocol == "h1":
+                protocol_options.insert(0, "--h1")
+            self.run_test(
+                domain,
+                test,
+                "h2load",
+                shlex.join(protocol_options),
+                f".{protocol}{tag}",
+                PROTOCOL_PORTS[protocol],
+            )
+
+    def run_scenario(self, domain, name, options, tag):
+        """
+        Runs the weighted endpoint mix of a scenario with k6, logged like an endpoint:
+        <domain>.<scenario>[.<trial>].k6.log
+        """
+        scenario = self.scenarios[name]
+        endpoints = [
+            (endpoint, self.url(domain, endpoint), weight)
+            for endpoint, weight in scenario["endpoints"]
+        ]
+        script = k6_script(endpoints, scenario["stages"], scenario["think_time"])
+        self.run_test(domain, name, "k6", options, tag, script=script)
+
+    def run_trials(self, prefix=""):
+        """
+        Runs every trial of the matrix, logs are tagged with prefix (and the trial number).
+        """
+        # k6 always runs, even if no test is selected in tests.conf
+        tests = [(tool, options) for tool, options in self.tests if tool != "k6"]
+        tests.append(("k6", dict(self.tests).get("k6", "")))
+        # trials are interleaved (trial 1 of every test, then trial 2...) and the
+        # framework order is shuffled in each trial, so slow drifts spread evenly
+        for trial in range(1, self.args.repetitions + 1):
+            tag = prefix + (f".{trial}" if self.args.repetitions > 1 else "")
+            if self.args.repetitions > 1:
+                print(f"\n..:: Trial {trial} of {self.args.repetitions} ::..")
+            for test in self.benchmarks:
+                for domain in random.sample(self.domains, len(self.domains)):
+                    for tool, options in tests:
+                        if test not in TOOL_ENDPOINTS.get(tool, (test,)):
+                            continue
+                        if tool == "h2load" and self.args.protocols:
+                            self.run_protocols(domain, test, options, tag)
+                        elif tool in TOOL_IMAGES or tool in PYTHON_TOOLS or tool == "k6":
+                            self.run_test(domain, test, tool, options, tag)
+            for name in self.scenarios:
+                for domain in random.sample(self.domains, len(self.domains)):
+                    self.run_scenario(domain, name, dict(tests)["k6"], tag)
+
+    def run(self):
+        try:
+            if self.args.matrix:
+                matrix = FpmMatrix(self.url(self.domains[0], "hello"))
+                try:
+                    for workers, cores in self.args.matrix:
+                        print(f"\n..:: php-fpm matrix: {workers} workers, {cores} cores ::..")
+                        matrix.apply(workers, cores)
+                        # idle CPU and probe latency baselines change with the configuration
+                        self.monitor = ServerMonitor()
+                        self.run_trials(f".w{workers}c{cores}")
+                finally:
+                    matrix.restore()
+            else:
+                self.run_trials()
+        finally:
+            for container in self.containers.values():
+                container.stop()
+            self.manifest.finish()
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument(
+        "-n", "--repetitions", type=int, default=1, help="trials per framework/endpoint/tool"
+    )
+    arg_parser.add_argument(
+        "--resume", action="store_true", help="skip tests whose results are already complete"
+    )
+    arg_parser.add_argument(
+        "--min-cooldown", type=float, default=1.0, help="minimum seconds between tests"
+    )
+    arg_parser.add_argument(
+        "--max-cooldown", type=float, default=30.0, help="maximum seconds between tests"
+    )
+    arg_parser.add_argument(
+        "--sample-interval",
+        type=float,
+        default=0.5,
+        help="seconds between server resource samples (0 disables sampling)",
+    )
+    arg_parser.add_argument(
+        "--protocols",
+        type=lambda value: value.split(","),
+        help="run h2load once per protocol (comma separated: h1,h2c) with the same options",
+    )
+    arg_parser.add_argument(
+        "--matrix",
+        type=lambda value: [tuple(int(n) for n in point.split(":")) for point in value.split(",")],
+        help="rerun everything per php-fpm workers:cores point (comma separated, e.g. 4:1,8:2)",
+    )
+    arg_parser.add_argument(
+        "--client-cpus",
+        help="CPUs of the load generators (docker --cpuset-cpus of wrk/wrk2/h2load/k6, "
+        "loadgen --cpus), e.g. 0-3, to keep them off the CPUs of the server containers",
+    )
+    arg_parser.add_argument(
+        "--noise-retries",
+        type=int,
+        default=1,
+        help="reruns of a test whose host samples are flagged as noisy (steal, iowait, other "
+        "load before the run, CPU frequency drop), 0 only flags them",
+    )
+    arg_parser.add_argument("--results", default=os.path.join(BASE_DIR, "results"))
+    arg_parser.add_argument(
+        "--no-plot", action="store_true", help="do not generate the charts at the end"
+    )
+    args = arg_parser.parse_args(argv)
+    if args.protocols and not set(args.protocols) <= set(PROTOCOL_PORTS):
+        arg_parser.error(f"--protocols must be a comma separated list of {', '.join(PROTOCOL_PORTS)}")
+
+    if args.noise_retries < 0:
+        arg_parser.error("--noise-retries must not be negative")
+
+    if args.matrix and not all(
+        len(point) == 2 and min(point) > 0 for point in args.matrix
+    ):
+        arg_parser.error("--matrix must be a comma separated list of workers:cores points")
+
+    if not os.path.exists(os.path.join(BASE_DIR, "tests.conf")):
+        print("Error: tests.conf not found (see the Customization section of README.md).")
+        return 1
+
+    BenchmarkRunner(args).run()
+
+    if not args.no_plot:
+        # plot the results to html file
+        subprocess.run(
+            ["docker", "run", "-u", str(os.getuid()), "--rm", "-v", f"{BASE_DIR}:/usr/src/app",
+             "bench/python3", "/usr/src/app/plot.py"]
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
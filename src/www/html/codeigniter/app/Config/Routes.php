@@ -9,4 +9,6 @@ $routes->get('/', 'Home::index');
 
 $routes->get('/benchmarking/info', 'BenchController::info', ['namespace' => 'App\Controllers\Benchmarking']);
 $routes->get('/benchmarking/hello', 'BenchController::hello', ['namespace' => 'App\Controllers\Benchmarking']);
-$routes->get('benchmarking/api', 'FilmController::index', ['namespace' => 'App\Controllers\Benchmarking']);
\ No newline at end of file
+$routes->get('benchmarking/api', 'FilmController::index', ['namespace' => 'App\Controllers\Benchmarking']);
+$routes->get('benchmarking/api-persistent', 'FilmController::persistent', ['namespace' => 'App\Controllers\Benchmarking']);
+$routes->get('benchmarking/api-cached', 'FilmController::cached', ['namespace' => 'App\Controllers\Benchmarking']);
\ No newline at end of file
@@ -3,12 +3,18 @@
 namespace App\Controllers\Benchmarking;
 
 use  App\Controllers\BaseController;
+use App\Libraries\ServerTiming;
 
 class BenchController extends BaseController
 {
 	public function hello(): string
 	{
-		return view('benchmarking/hello', ['title' => 'Hello', 'output' => 'Hello, World!!!']);
+		$timing = new ServerTiming();
+		$timing->mark('bootstrap');
+		$html = view('benchmarking/hello', ['title' => 'Hello', 'output' => 'Hello, World!!!']);
+		$timing->mark('render');
+		$this->response->setHeader('Server-Timing', $timing->header());
+		return $html;
 	}
 
 	public function info(): string
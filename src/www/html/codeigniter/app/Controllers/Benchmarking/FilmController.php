@@ -3,7 +3,9 @@
 namespace App\Controllers\Benchmarking;
 
 use CodeIgniter\RESTful\ResourceController;
+use App\Libraries\ServerTiming;
 use App\Models\FilmModel;
+use Config\Database;
 
 class FilmController extends ResourceController
 {
@@ -12,7 +14,51 @@ class FilmController extends ResourceController
 
     public function index()
     {
-        $data = $this->model->findAll();
-        return $this->respond($data);
+        return $this->respondTimed($this->model);
+    }
+
+    public function persistent()
+    {
+        // same query on a persistent (mysqli p:) connection
+        $config = config('Database')->default;
+        $config['pConnect'] = true;
+        return $this->respondTimed(new FilmModel(Database::connect($config)));
+    }
+
+    public function cached()
+    {
+        // the JSON response is served from Redis, the database is only queried on a miss
+        $timing = new ServerTiming();
+        $timing->mark('bootstrap');
+        $key = 'films:codeigniter:' . (int) $this->request->getGet('limit');
+        $redis = new \Redis();
+        $redis->pconnect('redis', 6379);
+        $json = $redis->get($key);
+        if ($json === false) {
+            $json = $this->respond($this->films($this->model))->getBody();
+            $redis->setex($key, 60, $json);
+        }
+        $timing->mark('cache');
+        return $this->response->setContentType('application/json')
+            ->setHeader('Server-Timing', $timing->header())
+            ->setBody($json);
+    }
+
+    private function respondTimed(FilmModel $model)
+    {
+        $timing = new ServerTiming();
+        $timing->mark('bootstrap');
+        $data = $this->films($model);
+        $timing->mark('db');
+        $response = $this->respond($data);
+        $timing->mark('serialize');
+        return $response->setHeader('Server-Timing', $timing->header());
+    }
+
+    private function films(FilmModel $model)
+    {
+        // first ?limit=N films (all films if the limit is missing or not positive)
+        $limit = (int) $this->request->getGet('limit');
+        return $model->orderBy('film_id')->findAll(max($limit, 0));
     }
 }
\ No newline at end of file
@@ -89,3 +89,6 @@ $db['default'] = array(
 	'failover' => array(),
 	'save_queries' => TRUE
 );
+
+// the default group with a persistent connection (api-persistent benchmark)
+$db['persistent'] = array_merge($db['default'], array('pconnect' => TRUE));
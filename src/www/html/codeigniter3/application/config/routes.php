@@ -55,5 +55,7 @@ $route['404_override'] = '';
 $route['benchmarking/hello'] = 'bench/hello';
 $route['benchmarking/info'] = 'bench/info';
 $route['benchmarking/api'] = 'bench/api';
+$route['benchmarking/api-persistent'] = 'bench/api_persistent';
+$route['benchmarking/api-cached'] = 'bench/api_cached';
 
 $route['translate_uri_dashes'] = FALSE;
\ No newline at end of file
@@ -3,18 +3,16 @@ defined('BASEPATH') OR exit('No direct script access allowed');
 
 class Bench extends CI_Controller {
 
-    function __construct()
-    {
-        parent::__construct();
-        $this->load->database();
-    }
-
     public function hello()
     {
+        $this->load->library('server_timing');
+        $this->server_timing->mark('bootstrap');
         $data = ['title' => 'Hello', 'output' => 'Hello, World!!!'];
         $this->load->view('templates/header', $data);
         $this->load->view('hello', $data);
         $this->load->view('templates/footer');
+        $this->server_timing->mark('render');
+        $this->output->set_header('Server-Timing: ' . $this->server_timing->header());
     }
 
     public function info()
@@ -24,9 +22,51 @@ class Bench extends CI_Controller {
 
     public function api()
     {
+        return $this->films('default');
+    }
+
+    public function api_persistent()
+    {
+        // same query on a persistent (mysqli p:) connection
+        return $this->films('persistent');
+    }
+
+    public function api_cached()
+    {
+        // the JSON response is served from Redis, the database is only queried on a miss
+        $this->load->library('server_timing');
+        $this->server_timing->mark('bootstrap');
+        $limit = (int) $this->input->get('limit');
+        $key = 'films:codeigniter3:' . $limit;
+        $redis = new Redis();
+        $redis->pconnect('redis', 6379);
+        $json = $redis->get($key);
+        if ($json === FALSE) {
+            $this->load->database();
+            $this->load->model('film_model');
+            $json = json_encode($this->film_model->findAll($limit));
+            $redis->setex($key, 60, $json);
+        }
+        $this->server_timing->mark('cache');
+        return $this->output->set_status_header(200)
+            ->set_content_type('application/json')
+            ->set_header('Server-Timing: ' . $this->server_timing->header())
+            ->set_output($json);
+    }
+
+    private function films($group)
+    {
+        $this->load->library('server_timing');
+        $this->server_timing->mark('bootstrap');
+        $this->load->database($group);
         $this->load->model('film_model');
+        $films = $this->film_model->findAll((int) $this->input->get('limit'));
+        $this->server_timing->mark('db');
+        $json = json_encode($films);
+        $this->server_timing->mark('serialize');
         return $this->output->set_status_header(200)
             ->set_content_type('application/json')
-            ->set_output(json_encode($this->film_model->findAll()));
+            ->set_header('Server-Timing: ' . $this->server_timing->header())
+            ->set_output($json);
     }
 }
\ No newline at end of file
@@ -4,8 +4,10 @@ defined('BASEPATH') OR exit('No direct script access allowed');
 
 class Film_model extends CI_Model
 {
-    public function findAll(){
-        $query = $this->db->get('films');    
+    public function findAll($limit = 0){
+        // first $limit films (all films if the limit is not positive)
+        $this->db->order_by('film_id');
+        $query = $this->db->get('films', $limit > 0 ? $limit : NULL);
         return $query->result_array();
     }
 }
\ No newline at end of file
@@ -5,6 +5,8 @@ namespace App\Http\Controllers;
 use Illuminate\Foundation\Auth\Access\AuthorizesRequests;
 use Illuminate\Foundation\Validation\ValidatesRequests;
 use Illuminate\Routing\Controller as BaseController;
+use Illuminate\Http\Request;
+use App\Support\ServerTiming;
 
 class BenchController extends BaseController
 {
@@ -13,8 +15,12 @@ class BenchController extends BaseController
 		return view('info');
 	}
 
-	public function hello()
+	public function hello(Request $request)
 	{
-		return view('hello', ['title' => 'Hello', 'body' => 'Hello, World!!!']);
+		$timing = new ServerTiming($request->server('REQUEST_TIME_FLOAT'));
+		$timing->mark('bootstrap');
+		$html = view('hello', ['title' => 'Hello', 'body' => 'Hello, World!!!'])->render();
+		$timing->mark('render');
+		return response($html)->header('Server-Timing', $timing->header());
 	}
 }
@@ -5,12 +5,58 @@ namespace App\Http\Controllers;
 use Illuminate\Http\Request;
 use Illuminate\Routing\Controller as BaseController;
 use App\Models\Film;
+use App\Support\ServerTiming;
 
 class FilmController extends BaseController
 {
-    public function index()
+    public function index(Request $request)
     {
-        $films = Film::all();
-        return response()->json($films);
+        return $this->respond($request, config('database.default'));
+    }
+
+    public function persistent(Request $request)
+    {
+        // same query on a persistent PDO connection (see config/database.php)
+        return $this->respond($request, 'mysql_persistent');
+    }
+
+    public function cached(Request $request)
+    {
+        // the JSON response is served from Redis, the database is only queried on a miss
+        $timing = new ServerTiming($request->server('REQUEST_TIME_FLOAT'));
+        $timing->mark('bootstrap');
+        $key = 'films:octane:' . (int) $request->query('limit', 0);
+        $redis = new \Redis();
+        $redis->pconnect(config('database.redis.default.host'), (int) config('database.redis.default.port'));
+        $json = $redis->get($key);
+        if ($json === false) {
+            $json = response()->json($this->films($request, config('database.default')))->getContent();
+            $redis->setex($key, 60, $json);
+        }
+        $timing->mark('cache');
+        return response($json)
+            ->header('Content-Type', 'application/json')
+            ->header('Server-Timing', $timing->header());
+    }
+
+    private function respond(Request $request, $connection)
+    {
+        $timing = new ServerTiming($request->server('REQUEST_TIME_FLOAT'));
+        $timing->mark('bootstrap');
+        $films = $this->films($request, $connection);
+        $timing->mark('db');
+        $response = response()->json($films);
+        $timing->mark('serialize');
+        return $response->header('Server-Timing', $timing->header());
+    }
+
+    private function films(Request $request, $connection)
+    {
+        // first ?limit=N films (all films if the limit is missing or not positive)
+        $limit = (int) $request->query('limit', 0);
+        return Film::on($connection)
+            ->orderBy('film_id')
+            ->when($limit > 0, fn ($query) => $query->limit($limit))
+            ->get();
     }
 }
@@ -0,0 +1,38 @@
+<?php
+
+namespace App\Support;
+
+/**
+ * Collects the phases of a request (bootstrap, db, serialize...) and formats them as a
+ * Server-Timing header in ms. Each phase lasts from the end of the previous one, the first
+ * one from the request start (REQUEST_TIME_FLOAT, set when the worker accepted the request).
+ */
+class ServerTiming
+{
+    private float $start;
+    private float $last;
+    private array $phases = [];
+
+    public function __construct(?float $start = null)
+    {
+        $this->start = $start ?? $_SERVER['REQUEST_TIME_FLOAT'] ?? microtime(true);
+        $this->last = $this->start;
+    }
+
+    public function mark(string $phase): void
+    {
+        $now = microtime(true);
+        $this->phases[$phase] = ($this->phases[$phase] ?? 0) + ($now - $this->last) * 1000;
+        $this->last = $now;
+    }
+
+    public function header(): string
+    {
+        $phases = $this->phases + ['total' => ($this->last - $this->start) * 1000];
+        $entries = [];
+        foreach ($phases as $phase => $duration) {
+            $entries[] = sprintf('%s;dur=%.3f', $phase, $duration);
+        }
+        return implode(', ', $entries);
+    }
+}
@@ -25,4 +25,6 @@ Route::get('/benchmarking/info', function () {
 
 Route::get('/benchmarking/hello', [BenchController::class, 'hello']);
 
-Route::get('/benchmarking/api', [FilmController::class, 'index']);
\ No newline at end of file
+Route::get('/benchmarking/api', [FilmController::class, 'index']);
+Route::get('/benchmarking/api-persistent', [FilmController::class, 'persistent']);
+Route::get('/benchmarking/api-cached', [FilmController::class, 'cached']);
\ No newline at end of file
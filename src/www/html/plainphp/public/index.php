@@ -5,9 +5,25 @@
 define('ROOT_PATH', dirname(__DIR__) . '/');
 define('PAGE_DIR', ROOT_PATH . 'views/');
 
+// Sends a Server-Timing header from the end times (microtime) of the request phases,
+// the first phase starting with the request (REQUEST_TIME_FLOAT)
+function server_timing(array $marks)
+{
+	$entries = [];
+	$start = $last = $_SERVER['REQUEST_TIME_FLOAT'];
+	foreach ($marks as $phase => $time) {
+		$entries[] = sprintf('%s;dur=%.3f', $phase, ($time - $last) * 1000);
+		$last = $time;
+	}
+	$entries[] = sprintf('total;dur=%.3f', ($last - $start) * 1000);
+	header('Server-Timing: ' . implode(', ', $entries));
+}
+
 // Define available pages
 $pages = [
 	'benchmarking/api',
+	'benchmarking/api-persistent',
+	'benchmarking/api-cached',
 	'benchmarking/info',
 	'benchmarking/hello',
 	'home'
@@ -0,0 +1,46 @@
+<?php 
+
+$bootstrap = microtime(true);
+
+$host = 'mariadb';
+$dbname = 'bench';
+$username = 'bench';
+$password = 'bench';
+
+// Serve the JSON response from Redis, query the database only on a cache miss
+$limit = (int) ($_GET['limit'] ?? 0);
+$key = "films:plainphp:$limit";
+$ttl = 60;
+
+$redis = new Redis();
+$redis->pconnect('redis', 6379);
+$json = $redis->get($key);
+
+if ($json === false) {
+    try {
+        $dsn = "mysql:host=$host;dbname=$dbname;charset=utf8mb4";
+        $options = [
+            PDO::ATTR_ERRMODE => PDO::ERRMODE_EXCEPTION,
+            PDO::ATTR_DEFAULT_FETCH_MODE => PDO::FETCH_ASSOC,
+            PDO::ATTR_EMULATE_PREPARES => false,
+        ];
+        $pdo = new PDO($dsn, $username, $password, $options);
+
+        if ($limit > 0) {
+            $stmt = $pdo->prepare('SELECT * FROM films ORDER BY film_id LIMIT ?');
+            $stmt->bindValue(1, $limit, PDO::PARAM_INT);
+            $stmt->execute();
+        } else {
+            $stmt = $pdo->query('SELECT * FROM films ORDER BY film_id');
+        }
+        $json = json_encode($stmt->fetchAll());
+        $pdo = null;
+        $redis->setex($key, $ttl, $json);
+    } catch (PDOException $e) {
+        die('Connection failed: ' . $e->getMessage());
+    }
+}
+
+server_timing(['bootstrap' => $bootstrap, 'cache' => microtime(true)]);
+header('Content-Type: application/json');
+echo $json;
@@ -0,0 +1,41 @@
+<?php 
+
+$bootstrap = microtime(true);
+
+$host = 'mariadb';
+$dbname = 'bench';
+$username = 'bench';
+$password = 'bench';
+
+try {
+    // Connect to the database
+    $dsn = "mysql:host=$host;dbname=$dbname;charset=utf8mb4";
+    $options = [
+        PDO::ATTR_ERRMODE => PDO::ERRMODE_EXCEPTION,
+        PDO::ATTR_DEFAULT_FETCH_MODE => PDO::FETCH_ASSOC,
+        PDO::ATTR_EMULATE_PREPARES => false,
+        // reuse the worker's connection across requests
+        PDO::ATTR_PERSISTENT => true,
+    ];
+    $pdo = new PDO($dsn, $username, $password, $options);
+
+    // Retrieve the first ?limit=N rows (all rows if the limit is missing or not positive)
+    $limit = (int) ($_GET['limit'] ?? 0);
+    if ($limit > 0) {
+        $stmt = $pdo->prepare('SELECT * FROM films ORDER BY film_id LIMIT ?');
+        $stmt->bindValue(1, $limit, PDO::PARAM_INT);
+        $stmt->execute();
+    } else {
+        $stmt = $pdo->query('SELECT * FROM films ORDER BY film_id');
+    }
+    $rows = $stmt->fetchAll();
+    $db = microtime(true);
+
+    // Echo the rows as application/json
+    $json = json_encode($rows);
+    server_timing(['bootstrap' => $bootstrap, 'db' => $db, 'serialize' => microtime(true)]);
+    header('Content-Type: application/json');
+    echo $json;
+} catch (PDOException $e) {
+    die('Connection failed: ' . $e->getMessage());
+}
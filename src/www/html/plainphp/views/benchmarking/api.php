@@ -1,5 +1,7 @@
 <?php 
 
+$bootstrap = microtime(true);
+
 $host = 'mariadb';
 $dbname = 'bench';
 $username = 'bench';
@@ -15,14 +17,24 @@ try {
     ];
     $pdo = new PDO($dsn, $username, $password, $options);
 
-    // Retrieve all rows from a table
-    $stmt = $pdo->query('SELECT * FROM films');
+    // Retrieve the first ?limit=N rows (all rows if the limit is missing or not positive)
+    $limit = (int) ($_GET['limit'] ?? 0);
+    if ($limit > 0) {
+        $stmt = $pdo->prepare('SELECT * FROM films ORDER BY film_id LIMIT ?');
+        $stmt->bindValue(1, $limit, PDO::PARAM_INT);
+        $stmt->execute();
+    } else {
+        $stmt = $pdo->query('SELECT * FROM films ORDER BY film_id');
+    }
     $rows = $stmt->fetchAll();
+    $db = microtime(true);
     $pdo = null;
 
     // Echo the rows as application/json
+    $json = json_encode($rows);
+    server_timing(['bootstrap' => $bootstrap, 'db' => $db, 'serialize' => microtime(true)]);
     header('Content-Type: application/json');
-    echo json_encode($rows);
+    echo $json;
 } catch (PDOException $e) {
     die('Connection failed: ' . $e->getMessage());
 }
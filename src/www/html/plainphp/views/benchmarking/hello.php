@@ -1,3 +1,4 @@
+<?php server_timing(['bootstrap' => microtime(true)]); ?>
 <!doctype html>
 <html lang="en">
 
@@ -5,15 +5,67 @@ namespace App\Controller;
 use Symfony\Bundle\FrameworkBundle\Controller\AbstractController;
 use Symfony\Component\HttpFoundation\Response;
 use Symfony\Component\Routing\Annotation\Route;
+use App\Repository\FilmsPersistentRepository;
 use App\Repository\FilmsRepository;
+use App\Util\ServerTiming;
 use Symfony\Component\HttpFoundation\JsonResponse;
+use Symfony\Component\HttpFoundation\Request;
 
 class FilmsController extends AbstractController
 {
    #[Route('/benchmarking/api')]
-   public function list(FilmsRepository $filmsRepository): JsonResponse
+   public function list(Request $request, FilmsRepository $filmsRepository): JsonResponse
    {
-       $films = $filmsRepository->findAll();
+       return $this->respond($request, $filmsRepository);
+   }
+
+   #[Route('/benchmarking/api-persistent')]
+   public function listPersistent(Request $request, FilmsPersistentRepository $filmsRepository): JsonResponse
+   {
+       // same mapping and query on the persistent connection (see config/packages/doctrine.yaml)
+       return $this->respond($request, $filmsRepository);
+   }
+
+   #[Route('/benchmarking/api-cached')]
+   public function listCached(Request $request, FilmsRepository $filmsRepository): Response
+   {
+       // the JSON response is served from Redis, the database is only queried on a miss
+       $timing = new ServerTiming($request->server->get('REQUEST_TIME_FLOAT'));
+       $timing->mark('bootstrap');
+       $key = 'films:symfony:' . (int) $request->query->get('limit', 0);
+       $redis = new \Redis();
+       $redis->pconnect('redis', 6379);
+       $json = $redis->get($key);
+       if ($json === false) {
+           $json = (new JsonResponse($this->films($request, $filmsRepository)))->getContent();
+           $redis->setex($key, 60, $json);
+       }
+       $timing->mark('cache');
+
+       return new Response($json, Response::HTTP_OK, [
+           'Content-Type' => 'application/json',
+           'Server-Timing' => $timing->header(),
+       ]);
+   }
+
+   private function respond(Request $request, $filmsRepository): JsonResponse
+   {
+       $timing = new ServerTiming($request->server->get('REQUEST_TIME_FLOAT'));
+       $timing->mark('bootstrap');
+       $data = $this->films($request, $filmsRepository);
+       $timing->mark('db');
+       $response = new JsonResponse($data, Response::HTTP_OK);
+       $timing->mark('serialize');
+       $response->headers->set('Server-Timing', $timing->header());
+
+       return $response;
+   }
+
+   private function films(Request $request, $filmsRepository): array
+   {
+       // first ?limit=N films (all films if the limit is missing or not positive)
+       $limit = (int) $request->query->get('limit', 0);
+       $films = $filmsRepository->findBy([], ['film_id' => 'ASC'], $limit > 0 ? $limit : null);
        $data = [];
 
        foreach ($films as $film) {
@@ -32,6 +84,6 @@ class FilmsController extends AbstractController
            ];
        }
 
-       return new JsonResponse($data, Response::HTTP_OK);
+       return $data;
    }
 }
\ No newline at end of file
@@ -6,6 +6,8 @@ use Symfony\Component\HttpFoundation\Response;
 use Symfony\Component\Routing\Annotation\Route;
 use Symfony\Bundle\FrameworkBundle\Controller\AbstractController;
 use Symfony\Component\HttpKernel\Kernel;
+use Symfony\Component\HttpFoundation\Request;
+use App\Util\ServerTiming;
 
 
 class HelloController extends AbstractController
@@ -18,9 +20,14 @@ class HelloController extends AbstractController
 	}
 
     #[Route('/benchmarking/hello')]
-    public function hello(): Response
+    public function hello(Request $request): Response
     {
+        $timing = new ServerTiming($request->server->get('REQUEST_TIME_FLOAT'));
+        $timing->mark('bootstrap');
         $data = ['output'=>'Hello, World!!!'];
-        return $this->render('benchmarking/hello.html.twig', $data);
+        $response = $this->render('benchmarking/hello.html.twig', $data);
+        $timing->mark('render');
+        $response->headers->set('Server-Timing', $timing->header());
+        return $response;
     }
 }
@@ -0,0 +1,24 @@
+<?php
+
+namespace App\Repository;
+
+use App\Entity\Films;
+use Doctrine\ORM\EntityManagerInterface;
+use Doctrine\ORM\EntityRepository;
+
+/**
+ * Films repository of the "persistent" entity manager (persistent PDO connection,
+ * see config/packages/doctrine.yaml).
+ *
+ * @extends EntityRepository<Films>
+ */
+class FilmsPersistentRepository extends EntityRepository
+{
+    public function __construct(EntityManagerInterface $persistentEntityManager)
+    {
+        parent::__construct(
+            $persistentEntityManager,
+            $persistentEntityManager->getClassMetadata(Films::class)
+        );
+    }
+}
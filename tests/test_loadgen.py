@@ -0,0 +1,35 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loadgen import LoadGenerator, StandInServer  # noqa: E402
+
+
+class OpenLoopDurationTest(unittest.TestCase):
+    def test_overloaded_server_stops_at_duration(self):
+        async def run():
+            # 4 connections at 50 ms per response serve ~80 req/s, far below the offered rate
+            server = await StandInServer(port=0, delay=0.05).start()
+            try:
+                url = f"http://127.0.0.1:{server.port}/benchmarking/hello"
+                generator = LoadGenerator(url, connections=4, duration=2.0, rate=400)
+                return await generator.run()
+            finally:
+                server.server.close()
+                await server.server.wait_closed()
+
+        result = asyncio.run(run())
+        self.assertLess(result["elapsed"], 2.0 + 0.5)
+        self.assertGreater(result["unsent"], 0)
+        # every scheduled request was either sent or reported as unsent
+        self.assertLessEqual(result["requests"], 2.0 * 400)
+        self.assertGreater(result["requests"] + result["unsent"], 0.9 * 2.0 * 400)
+        # no burst of late responses piled up in the last second
+        self.assertLess(result["series"]["requests"][-1], 2 * result["series"]["requests"][0])
+
+
+if __name__ == "__main__":
+    unittest.main()